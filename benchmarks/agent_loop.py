@@ -0,0 +1,389 @@
+"""Benchmark suite for the agent loop, run entirely locally using `TestModel`, `FunctionModel` and a fake HTTP provider.
+
+Run with:
+
+    uv run python benchmarks/agent_loop.py [--output results.json] [--filter NAME]
+
+Results are written as JSON, to stdout or `--output`, so they can be compared between commits to catch regressions in
+`_agent_graph`, `_parts_manager` and `pydantic_graph`. Each result records the benchmark name, its parameters, a value
+and the unit of that value.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import httpx
+from pydantic import BaseModel
+from typing_extensions import TypedDict
+
+from pydantic_ai import Agent, __version__
+from pydantic_ai._utils import group_by_temporal
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.usage import UsageLimits
+
+
+@dataclass
+class Result:
+    benchmark: str
+    params: dict[str, Any]
+    value: float
+    unit: str
+
+
+@dataclass
+class Suite:
+    filter: str | None = None
+    results: list[Result] = field(default_factory=list)
+
+    def enabled(self, benchmark: str) -> bool:
+        return self.filter is None or self.filter in benchmark
+
+    def record(self, benchmark: str, params: dict[str, Any], value: float, unit: str) -> None:
+        print(f'{benchmark} {params}: {value:.2f} {unit}', file=sys.stderr)
+        self.results.append(Result(benchmark, params, round(value, 3), unit))
+
+
+async def mean_seconds(func: Callable[[], Awaitable[Any]], iterations: int) -> float:
+    """Call `func` once to warm up, then return the mean time per call over `iterations` calls."""
+    await func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - start) / iterations
+
+
+class CityInfo(BaseModel):
+    city: str
+    country: str
+
+
+class Tokens(BaseModel):
+    items: list[str]
+
+
+# partial validation works best with TypedDicts, see the docs on streaming structured responses
+class CatalogItem(TypedDict, total=False):
+    name: str
+    tags: list[str]
+    scores: dict[str, float]
+
+
+class Catalog(TypedDict, total=False):
+    items: list[CatalogItem]
+
+
+def tool_calls_model(steps: int, parallel_calls: int = 1) -> FunctionModel:
+    """A model that makes `parallel_calls` calls to the `noop` tool on each of `steps - 1` steps, then returns text."""
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) < steps * 2 - 1:
+            return ModelResponse(parts=[ToolCallPart('noop', {'x': i}) for i in range(parallel_calls)])
+        else:
+            return ModelResponse(parts=[TextPart('done')])
+
+    return FunctionModel(respond)
+
+
+def tool_calls_agent(steps: int, parallel_calls: int = 1) -> Agent[None, str]:
+    agent = Agent(tool_calls_model(steps, parallel_calls), name='tool_calls_agent')
+
+    @agent.tool_plain
+    async def noop(x: int) -> int:
+        return x
+
+    return agent
+
+
+async def bench_run_overhead(suite: Suite) -> None:
+    text_agent = Agent(TestModel(), name='text_agent')
+    structured_agent = Agent(TestModel(), result_type=CityInfo, name='structured_agent')
+
+    @text_agent.tool_plain
+    def get_weather(city: str) -> str:
+        return f'sunny in {city}'
+
+    for case, agent, result_type in (
+        ('text result, one tool call', text_agent, None),
+        ('structured result', structured_agent, None),
+        ('result_type set on the run', text_agent, CityInfo),
+    ):
+        seconds = await mean_seconds(lambda: agent.run('What is the capital of France?', result_type=result_type), 300)
+        suite.record('run_overhead', {'model': 'test', 'case': case}, seconds * 1_000_000, 'µs/run')
+
+    for steps in 1, 5, 20:
+        agent = tool_calls_agent(steps)
+        seconds = await mean_seconds(lambda: agent.run('Hello'), max(20, 300 // steps))
+        suite.record('run_overhead', {'model': 'function', 'steps': steps}, seconds / steps * 1_000_000, 'µs/step')
+
+
+async def bench_tool_dispatch(suite: Suite) -> None:
+    for parallel_calls in 1, 10, 100:
+        agent = tool_calls_agent(2, parallel_calls)
+        seconds = await mean_seconds(lambda: agent.run('Hello'), max(20, 1000 // parallel_calls))
+        suite.record('tool_dispatch', {'parallel_calls': parallel_calls}, parallel_calls / seconds, 'calls/s')
+
+
+async def count_events(stream: AsyncIterator[Any]) -> int:
+    events = 0
+    async for _ in stream:
+        events += 1
+    return events
+
+
+async def bench_streaming(suite: Suite, tokens: int = 2000) -> None:
+    async def stream_text(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        for i in range(tokens):
+            yield f'tok{i} '
+
+    async def stream_tool_call(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        yield {0: DeltaToolCall(name=info.result_tools[0].name, json_args='{"items": [')}
+        for i in range(tokens):
+            yield {0: DeltaToolCall(json_args=f'"tok{i}", ')}
+        yield {0: DeltaToolCall(json_args='"end"]}')}
+
+    text_agent = Agent(FunctionModel(stream_function=stream_text))
+    structured_agent = Agent(FunctionModel(stream_function=stream_tool_call), result_type=Tokens)
+    openai_agent = Agent(OpenAIModel('gpt-4o', api_key='fake', http_client=fake_openai_endpoint(tokens)))
+
+    async def run_text(agent: Agent[None, str]) -> int:
+        async with agent.run_stream('Hello') as result:
+            return await count_events(result.stream_text(delta=True, debounce_by=None))
+
+    async def run_structured() -> int:
+        async with structured_agent.run_stream('Hello') as result:
+            return await count_events(result.stream_structured(debounce_by=None))
+
+    for case, func in (
+        ('stream_text', lambda: run_text(text_agent)),
+        ('stream_structured', run_structured),
+        ('stream_text, fake openai endpoint', lambda: run_text(openai_agent)),
+    ):
+        await func()
+        start = time.perf_counter()
+        events = await func()
+        suite.record('streaming', {'case': case, 'tokens': tokens}, events / (time.perf_counter() - start), 'events/s')
+
+
+def fake_openai_endpoint(tokens: int) -> httpx.AsyncClient:
+    """An HTTP client whose transport streams `tokens` chat completion chunks as server-sent events."""
+    events = [
+        {
+            'id': 'chatcmpl-123',
+            'object': 'chat.completion.chunk',
+            'created': 1704067200,
+            'model': 'gpt-4o',
+            'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': f'tok{i} '}, 'finish_reason': None}],
+        }
+        for i in range(tokens)
+    ]
+    body = b''.join(b'data: ' + json.dumps(event).encode() + b'\n\n' for event in events) + b'data: [DONE]\n\n'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={'Content-Type': 'text/event-stream'})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def bench_partial_validation(suite: Suite, items: int = 100, chunk_size: int = 20) -> None:
+    catalog = Catalog(
+        items=[
+            CatalogItem(name=f'item {i}', tags=[f'tag{j}' for j in range(5)], scores={'a': i / 3, 'b': i * 2.5})
+            for i in range(items)
+        ]
+    )
+    args = json.dumps(catalog)
+    chunks = [args[i : i + chunk_size] for i in range(0, len(args), chunk_size)]
+
+    async def stream_catalog(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        yield {0: DeltaToolCall(name=info.result_tools[0].name)}
+        for chunk in chunks:
+            yield {0: DeltaToolCall(json_args=chunk)}
+            # a delta which doesn't grow the arguments, like chunks which only carry usage
+            yield {0: DeltaToolCall(json_args='')}
+
+    agent = Agent(FunctionModel(stream_function=stream_catalog), result_type=Catalog)
+
+    async def run(case: str) -> int:
+        async with agent.run_stream('Hello') as result:
+            if case == 'stream_patches':
+                return await count_events(result.stream_patches(debounce_by=None))
+            else:
+                return await count_events(result.stream(debounce_by=None, skip_unchanged=case == 'skip_unchanged'))
+
+    for case in 'stream', 'skip_unchanged', 'stream_patches':
+        seconds = await mean_seconds(lambda: run(case), 3)
+        params = {'case': case, 'args_bytes': len(args), 'chunks': len(chunks)}
+        suite.record('partial_validation', params, len(chunks) / seconds, 'chunks/s')
+
+
+@asynccontextmanager
+async def task_per_item_group_by_temporal(
+    aiterable: AsyncIterable[Any], soft_max_interval: float
+) -> AsyncIterator[AsyncIterator[list[Any]]]:
+    """The previous implementation of `_utils.group_by_temporal`, which creates a task to read each item."""
+    task: asyncio.Task[Any] | None = None
+
+    async def async_iter_groups() -> AsyncIterator[list[Any]]:
+        nonlocal task
+        buffer: list[Any] = []
+        group_start_time: float | None = time.monotonic()
+        aiterator = aiterable.__aiter__()
+        while True:
+            if group_start_time is None:
+                wait_time = soft_max_interval
+            else:
+                wait_time = soft_max_interval - (time.monotonic() - group_start_time)
+            if task is None:
+                task = asyncio.create_task(aiterator.__anext__())  # pyright: ignore[reportArgumentType]
+            done, _ = await asyncio.wait((task,), timeout=wait_time)
+            if done:
+                try:
+                    item = done.pop().result()
+                except StopAsyncIteration:
+                    if buffer:
+                        yield buffer
+                    task = None
+                    break
+                else:
+                    buffer.append(item)
+                    task = None
+                    if group_start_time is None:
+                        group_start_time = time.monotonic()
+            elif buffer:
+                yield buffer
+                buffer = []
+                group_start_time = None
+
+    try:
+        yield async_iter_groups()
+    finally:
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+async def bench_debounce(suite: Suite, items: int = 5000, interval: float = 0.01) -> None:
+    async def produce() -> AsyncIterator[int]:
+        for i in range(items):
+            # like reading from a network stream, each item may need to wait for the event loop
+            await asyncio.sleep(0)
+            yield i
+
+    async def consume(debouncer: Callable[[AsyncIterable[int], float], Any]) -> None:
+        async with debouncer(produce(), interval) as groups:
+            async for _ in groups:
+                pass
+
+    for case, debouncer in ('task per item', task_per_item_group_by_temporal), ('single reader', group_by_temporal):
+        for streams in 1, 100:
+            await consume(debouncer)
+            start = time.perf_counter()
+            await asyncio.gather(*(consume(debouncer) for _ in range(streams)))
+            params = {'case': case, 'streams': streams, 'items': items}
+            suite.record('debounce', params, items * streams / (time.perf_counter() - start), 'items/s')
+
+
+def message_history(exchanges: int) -> list[ModelMessage]:
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('What is the weather like?')])]
+    for i in range(exchanges):
+        messages.append(ModelResponse(parts=[ToolCallPart('get_weather', {'city': f'city {i}'}, f'call_{i}')]))
+        messages.append(ModelRequest(parts=[ToolReturnPart('get_weather', f'sunny in city {i}', f'call_{i}')]))
+    messages.append(ModelResponse(parts=[TextPart('It is sunny everywhere.')]))
+    return messages
+
+
+async def bench_messages_serialization(suite: Suite) -> None:
+    for exchanges in 10, 100, 1000:
+        messages = message_history(exchanges)
+        dumped = ModelMessagesTypeAdapter.dump_json(messages)
+
+        async def dump() -> None:
+            ModelMessagesTypeAdapter.dump_json(messages)
+
+        async def load() -> None:
+            ModelMessagesTypeAdapter.validate_json(dumped)
+
+        iterations = max(10, 10_000 // exchanges)
+        for case, func in ('dump_json', dump), ('validate_json', load):
+            seconds = await mean_seconds(func, iterations)
+            params = {'case': case, 'messages': len(messages)}
+            suite.record('messages_serialization', params, seconds / len(messages) * 1_000_000, 'µs/message')
+
+
+async def bench_peak_memory(suite: Suite, steps: int = 100) -> None:
+    agent = tool_calls_agent(steps)
+    usage_limits = UsageLimits(request_limit=None)
+    await agent.run('Hello', usage_limits=usage_limits)
+    tracemalloc.start()
+    try:
+        await agent.run('Hello', usage_limits=usage_limits)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    suite.record('peak_memory', {'steps': steps}, peak / 1024, 'KiB')
+
+
+BENCHMARKS: dict[str, Callable[[Suite], Awaitable[None]]] = {
+    'run_overhead': bench_run_overhead,
+    'tool_dispatch': bench_tool_dispatch,
+    'streaming': bench_streaming,
+    'partial_validation': bench_partial_validation,
+    'debounce': bench_debounce,
+    'messages_serialization': bench_messages_serialization,
+    'peak_memory': bench_peak_memory,
+}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', help='file to write JSON results to, defaults to stdout')
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this string')
+    args = parser.parse_args()
+
+    suite = Suite(filter=args.filter)
+    for name, benchmark in BENCHMARKS.items():
+        if suite.enabled(name):
+            await benchmark(suite)
+
+    report = {
+        'timestamp': datetime.now(tz=timezone.utc).isoformat(),
+        'pydantic_ai_version': __version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [asdict(r) for r in suite.results],
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Benchmark streaming throughput of `GeminiModel` against a local fake `streamGenerateContent` endpoint.
+
+Run with:
+
+    uv run python benchmarks/gemini_streaming.py
+
+The fake endpoint streams a JSON array of responses, each holding one text token, split into network-sized chunks.
+If parsing each chunk is proportional to the size of the chunk, the time per token stays flat as the response grows.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import httpx
+
+from pydantic_ai import Agent
+from pydantic_ai.models.gemini import (
+    GeminiModel,
+    _gemini_streamed_response_ta,
+    _GeminiCandidates,
+    _GeminiContent,
+    _GeminiResponse,
+    _GeminiTextPart,
+)
+
+CHUNK_SIZE = 256
+
+
+class FakeStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for i in range(0, len(self.body), CHUNK_SIZE):
+            yield self.body[i : i + CHUNK_SIZE]
+
+
+def fake_endpoint(tokens: int) -> httpx.AsyncClient:
+    responses = [
+        _GeminiResponse(
+            candidates=[
+                _GeminiCandidates(content=_GeminiContent(role='model', parts=[_GeminiTextPart(text=f'tok{i} ')]))
+            ]
+        )
+        for i in range(tokens)
+    ]
+    body = _gemini_streamed_response_ta.dump_json(responses, by_alias=True)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=FakeStream(body), headers={'Content-Type': 'application/json'})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def stream_tokens(tokens: int) -> float:
+    agent = Agent(GeminiModel('gemini-1.5-flash', api_key='fake', http_client=fake_endpoint(tokens)))
+    start = time.perf_counter()
+    async with agent.run_stream('Hello') as result:
+        async for _ in result.stream_text(delta=True, debounce_by=None):
+            pass
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    print(f'{"tokens":>7} {"total (ms)":>11} {"per token (µs)":>15}')
+    for tokens in 250, 500, 1000, 2000, 4000:
+        duration = await stream_tokens(tokens)
+        print(f'{tokens:>7} {duration * 1000:>11.1f} {duration / tokens * 1_000_000:>15.1f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""Benchmark the cost of snapshotting agent graph state into the run history.
+
+Run with:
+
+    uv run python benchmarks/graph_state.py
+
+Each step appends a tool call and a tool return to the message history and then snapshots the state, as
+`Graph.next` does when it records a `NodeStep`. With `deep_copy_state` every snapshot copies every message, so time
+and retained memory grow quadratically with the number of steps. With `structural_copy_state` messages are shared
+between snapshots, so only one pointer per message is copied on each step.
+"""
+
+from __future__ import annotations as _annotations
+
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from pydantic_ai._agent_graph import GraphAgentState
+from pydantic_ai.messages import ModelRequest, ModelResponse, ToolCallPart, ToolReturnPart, UserPromptPart
+from pydantic_ai.usage import Usage
+from pydantic_graph.state import deep_copy_state, structural_copy_state
+
+SnapshotFunc = Callable[[GraphAgentState], GraphAgentState]
+
+
+def run_steps(steps: int, snapshot_state: SnapshotFunc) -> tuple[float, int]:
+    """Simulate `steps` agent steps, returning the time spent snapshotting and the memory retained by the history."""
+    state = GraphAgentState(
+        message_history=[ModelRequest(parts=[UserPromptPart('hello ' * 100)])],
+        usage=Usage(),
+        retries=0,
+        run_step=0,
+    )
+    history: list[Any] = []
+    snapshot_time = 0.0
+
+    tracemalloc.start()
+    for step in range(steps):
+        state.message_history.append(
+            ModelResponse(parts=[ToolCallPart('lookup', {'query': f'step {step}', 'limit': 10}, f'call-{step}')])
+        )
+        state.message_history.append(
+            ModelRequest(parts=[ToolReturnPart('lookup', {'results': ['x' * 200] * 5}, f'call-{step}')])
+        )
+        state.usage.incr(Usage(request_tokens=100, response_tokens=20, total_tokens=120), requests=1)
+        state.run_step += 1
+
+        start = time.perf_counter()
+        history.append(snapshot_state(state))
+        snapshot_time += time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return snapshot_time, retained
+
+
+def main() -> None:
+    print(f'{"steps":>6} {"snapshot":>22} {"time (ms)":>10} {"retained (KiB)":>15}')
+    for steps in 10, 20, 40, 80:
+        for name, func in ('deep_copy_state', deep_copy_state), ('structural_copy_state', structural_copy_state):
+            snapshot_time, retained = run_steps(steps, func)
+            print(f'{steps:>6} {name:>22} {snapshot_time * 1000:>10.2f} {retained / 1024:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,7 @@ from typing_extensions import TypeGuard, TypeVar, assert_never
 
 from pydantic_graph import BaseNode, Graph, GraphRunContext
 from pydantic_graph.nodes import End, NodeRunEndT
+from pydantic_graph.state import structural_copy_state
 
 from . import (
     _result,
@@ -65,6 +66,8 @@ class GraphAgentState:
     usage: _usage.Usage
     retries: int
     run_step: int
+    tool_retries: dict[str, int] = field(default_factory=dict[str, int])
+    """Number of consecutive failed calls of each function tool in this run, by tool name."""
 
     def increment_retries(self, max_result_retries: int) -> None:
         self.retries += 1
@@ -143,11 +146,6 @@ class UserPromptNode(AgentNode[DepsT, NodeRunEndT]):
         history, next_message = await self._prepare_messages(self.user_prompt, ctx.state.message_history, run_context)
         ctx.state.message_history = history
         run_context.messages = history
-
-        # TODO: We need to make it so that function_tools are not shared between runs
-        #   See comment on the current_retry field of `Tool` for more details.
-        for tool in ctx.deps.function_tools.values():
-            tool.current_retry = 0
         return next_message
 
     async def _prepare_messages(
@@ -214,9 +212,10 @@ async def _prepare_request_parameters(
     function_tool_defs: list[ToolDefinition] = []
 
     run_context = build_run_context(ctx)
+    tool_retries = ctx.state.tool_retries
 
     async def add_tool(tool: Tool[DepsT]) -> None:
-        ctx = run_context.replace_with(retry=tool.current_retry, tool_name=tool.name)
+        ctx = run_context.replace_with(retry=tool_retries.get(tool.name, 0), tool_name=tool.name)
         if tool_def := await tool.prepare_tool_def(ctx):
             function_tool_defs.append(tool_def)
 
@@ -633,7 +632,13 @@ async def process_function_tools(
         'running tools', attributes={'tools': tool_names, 'logfire.msg': f'running tools: {", ".join(tool_names)}'}
     ):
         # TODO: Should we wrap each individual tool call in a dedicated span?
-        tasks = [asyncio.create_task(tool.run(call, run_context), name=call.tool_name) for tool, call in calls_to_run]
+        tool_retries = ctx.state.tool_retries
+        tasks = [
+            asyncio.create_task(
+                tool.run(call, run_context.replace_with(retry=tool_retries.get(tool.name, 0))), name=call.tool_name
+            )
+            for tool, call in calls_to_run
+        ]
         pending = tasks
         while pending:
             done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
@@ -641,10 +646,15 @@ async def process_function_tools(
                 index = tasks.index(task)
                 result = task.result()
                 yield _messages.FunctionToolResultEvent(result, tool_call_id=call_index_to_event_id[index])
-                if isinstance(result, (_messages.ToolReturnPart, _messages.RetryPromptPart)):
-                    results_by_index[index] = result
+                # retries are counted per run rather than on the tool, so concurrent runs can share an agent's tools
+                tool_name = calls_to_run[index][0].name
+                if isinstance(result, _messages.ToolReturnPart):
+                    tool_retries.pop(tool_name, None)
+                elif isinstance(result, _messages.RetryPromptPart):
+                    tool_retries[tool_name] = tool_retries.get(tool_name, 0) + 1
                 else:
                     assert_never(result)
+                results_by_index[index] = result
 
     # We append the results at the end, rather than as they are received, to retain a consistent ordering
     # This is mostly just to simplify testing
@@ -747,6 +757,8 @@ def build_agent_graph(
         name=name or 'Agent',
         state_type=GraphAgentState,
         run_end_type=result.FinalResult[result_type],
+        # messages are only ever appended to the history, so snapshots can share them rather than deep copying
+        snapshot_state=structural_copy_state,
         auto_instrument=False,
     )
     return graph
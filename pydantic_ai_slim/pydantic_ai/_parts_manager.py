@@ -14,7 +14,7 @@ event-emitting logic.
 from __future__ import annotations as _annotations
 
 from collections.abc import Hashable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any, Union
 
 from pydantic_ai.exceptions import UnexpectedModelBehavior
@@ -53,6 +53,12 @@ class ModelResponsePartsManager:
     """A list of parts (text or tool calls) that make up the current state of the model's response."""
     _vendor_id_to_part_index: dict[VendorId, int] = field(default_factory=dict, init=False)
     """Maps a vendor's "part" ID (if provided) to the index in `_parts` where that part resides."""
+    _pending_chunks: dict[int, list[str]] = field(default_factory=dict, init=False)
+    """Maps the index of a part in `_parts` to string deltas which have not yet been applied to it.
+
+    Applying each delta as it arrives would copy the whole text content (or JSON arguments) of the part every time,
+    so text deltas and JSON argument deltas are collected here and only joined when the part is needed.
+    """
 
     def get_parts(self) -> list[ModelResponsePart]:
         """Return only model response parts that are complete (i.e., not ToolCallPartDelta's).
@@ -60,8 +66,20 @@ class ModelResponsePartsManager:
         Returns:
             A list of ModelResponsePart objects. ToolCallPartDelta objects are excluded.
         """
+        self._apply_pending_chunks()
         return [p for p in self._parts if not isinstance(p, ToolCallPartDelta)]
 
+    def _apply_pending_chunks(self) -> None:
+        """Apply any pending string deltas to their parts, the parts are then kept until the next delta arrives."""
+        for part_index, chunks in self._pending_chunks.items():
+            part = self._parts[part_index]
+            if isinstance(part, TextPart):
+                self._parts[part_index] = replace(part, content=part.content + ''.join(chunks))
+            else:
+                assert isinstance(part, ToolCallPart) and isinstance(part.args, str), f'Unexpected {part=}'
+                self._parts[part_index] = replace(part, args=part.args + ''.join(chunks))
+        self._pending_chunks.clear()
+
     def handle_text_delta(
         self,
         *,
@@ -114,11 +132,10 @@ class ModelResponsePartsManager:
             self._parts.append(part)
             return PartStartEvent(index=new_part_index, part=part)
         else:
-            # Update the existing TextPart with the new content delta
-            existing_text_part, part_index = existing_text_part_and_index
-            part_delta = TextPartDelta(content_delta=content)
-            self._parts[part_index] = part_delta.apply(existing_text_part)
-            return PartDeltaEvent(index=part_index, delta=part_delta)
+            # Record the content delta, it's applied to the existing TextPart when the parts are next requested
+            _, part_index = existing_text_part_and_index
+            self._pending_chunks.setdefault(part_index, []).append(content)
+            return PartDeltaEvent(index=part_index, delta=TextPartDelta(content_delta=content))
 
     def handle_tool_call_delta(
         self,
@@ -188,7 +205,19 @@ class ModelResponsePartsManager:
             # Update the existing part or delta with the new information
             existing_part, part_index = existing_matching_part_and_index
             delta = ToolCallPartDelta(tool_name_delta=tool_name, args_delta=args, tool_call_id=tool_call_id)
-            updated_part = delta.apply(existing_part)
+            if (
+                isinstance(existing_part, ToolCallPart)
+                and isinstance(existing_part.args, str)
+                and isinstance(args, str)
+            ):
+                # Record the JSON arguments delta, it's applied when the parts are next requested
+                updated_part = replace(delta, args_delta=None).apply(existing_part)
+                self._pending_chunks.setdefault(part_index, []).append(args)
+            else:
+                if part_index in self._pending_chunks:
+                    self._apply_pending_chunks()
+                    existing_part = self._parts[part_index]
+                updated_part = delta.apply(existing_part)
             self._parts[part_index] = updated_part
             if isinstance(updated_part, ToolCallPart):
                 if isinstance(existing_part, ToolCallPartDelta):
@@ -232,6 +261,7 @@ class ModelResponsePartsManager:
             if maybe_part_index is not None:
                 new_part_index = maybe_part_index
                 self._parts[new_part_index] = new_part
+                self._pending_chunks.pop(new_part_index, None)
             else:
                 new_part_index = len(self._parts)
                 self._parts.append(new_part)
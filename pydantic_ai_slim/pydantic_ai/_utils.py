@@ -2,6 +2,7 @@ from __future__ import annotations as _annotations
 
 import asyncio
 import time
+from collections import deque
 from collections.abc import AsyncIterable, AsyncIterator, Iterator
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, is_dataclass
@@ -118,66 +119,82 @@ async def group_by_temporal(
         yield async_iter_groups_noop()
         return
 
-    # we might wait for the next item more than once, so we store the task to await next time
-    task: asyncio.Task[T] | None = None
+    # A single task reads items into groups for the whole stream, and the consumer waits once per group rather than
+    # once per item, so handling an item is just appending it to a list, with no task or timer created per item.
+    # The reader only starts reading the next item while the consumer is waiting for a group, so a slow consumer
+    # holds back the iterable, with at most one item read ahead, rather than the whole iterable being buffered.
+    reader: asyncio.Task[None] | None = None
+    # groups of items with the time each group should be yielded at
+    groups: deque[tuple[float, list[T]]] = deque()
+    items_ready = asyncio.Event()
+    consumer_waiting = asyncio.Event()
+
+    async def read_items() -> None:
+        try:
+            async for item in aiterable:
+                if _add_to_groups(groups, item, soft_max_interval):
+                    items_ready.set()
+                await consumer_waiting.wait()
+        finally:
+            items_ready.set()
 
     async def async_iter_groups() -> AsyncIterator[list[T]]:
-        nonlocal task
+        nonlocal reader
 
         assert soft_max_interval is not None and soft_max_interval >= 0, 'soft_max_interval must be a positive number'
-        buffer: list[T] = []
-        group_start_time = time.monotonic()
-
-        aiterator = aiterable.__aiter__()
+        reader = asyncio.create_task(read_items())
         while True:
-            if group_start_time is None:
-                # group hasn't started, we just wait for the maximum interval
-                wait_time = soft_max_interval
-            else:
-                # wait for the time remaining in the group
-                wait_time = soft_max_interval - (time.monotonic() - group_start_time)
-
-            # if there's no current task, we get the next one
-            if task is None:
-                # aiter.__anext__() returns an Awaitable[T], not a Coroutine which asyncio.create_task expects
-                # so far, this doesn't seem to be a problem
-                task = asyncio.create_task(aiterator.__anext__())  # pyright: ignore[reportArgumentType]
-
-            # we use asyncio.wait to avoid cancelling the coroutine if it's not done
-            done, _ = await asyncio.wait((task,), timeout=wait_time)
-
-            if done:
-                # the one task we waited for completed
-                try:
-                    item = done.pop().result()
-                except StopAsyncIteration:
-                    # if the task raised StopAsyncIteration, we're done iterating
-                    if buffer:
-                        yield buffer
-                    task = None
+            consumer_waiting.set()
+            if not groups and not reader.done():
+                # wait for the first item in the next group
+                items_ready.clear()
+                await items_ready.wait()
+
+            if groups and not reader.done():
+                # wait for the time remaining in the group, or for the iterable to be exhausted
+                wait_time = groups[0][0] - time.monotonic()
+                if wait_time > 0:
+                    await asyncio.wait((reader,), timeout=wait_time)
+
+            if reader.done():
+                # raise any error from the iterable, otherwise yield all the remaining items
+                reader.result()
+                if not groups:
                     break
-                else:
-                    # we got an item, add it to the buffer and set task to None to get the next item
-                    buffer.append(item)
-                    task = None
-                    # if this is the first item in the group, set the group start time
-                    if group_start_time is None:
-                        group_start_time = time.monotonic()
-            elif buffer:
-                # otherwise if the task timeout expired and we have items in the buffer, yield the buffer
-                yield buffer
-                # clear the buffer and reset the group start time ready for the next group
-                buffer = []
-                group_start_time = None
+                buffer = [item for _, items in groups for item in items]
+                groups.clear()
+            else:
+                buffer = _pop_due_groups(groups)
+            consumer_waiting.clear()
+            yield buffer
 
     try:
         yield async_iter_groups()
-    finally:  # pragma: no cover
-        # after iteration if a tasks still exists, cancel it, this will only happen if an error occurred
-        if task:
-            task.cancel('Cancelling due to error in iterator')
+    finally:
+        # if iteration stopped early, stop reading
+        if reader is not None and not reader.done():
+            reader.cancel('Cancelling due to error in iterator')
             with suppress(asyncio.CancelledError):
-                await task
+                await reader
+
+
+def _add_to_groups(groups: deque[tuple[float, list[T]]], item: T, soft_max_interval: float) -> bool:
+    """Add an item to the last group, or to a new group if the last one's time is up, returns `True` for a new group."""
+    now = time.monotonic()
+    if groups and now < groups[-1][0]:
+        groups[-1][1].append(item)
+        return False
+    groups.append((now + soft_max_interval, [item]))
+    return True
+
+
+def _pop_due_groups(groups: deque[tuple[float, list[T]]]) -> list[T]:
+    """Pop the first group, merged with every other group whose time is up if the consumer has fallen behind."""
+    _, buffer = groups.popleft()
+    now = time.monotonic()
+    while groups and groups[0][0] <= now:
+        buffer.extend(groups.popleft()[1])
+    return buffer
 
 
 def sync_anext(iterator: Iterator[T]) -> T:
@@ -1,8 +1,11 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import dataclasses
 import inspect
-from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
+import math
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterable, Iterator, Sequence
 from contextlib import AbstractAsyncContextManager, asynccontextmanager, contextmanager
 from copy import deepcopy
 from types import FrameType
@@ -49,8 +52,11 @@ UserPromptNode = _agent_graph.UserPromptNode
 
 __all__ = (
     'Agent',
+    'AgentBatchRun',
     'AgentRun',
     'AgentRunResult',
+    'BatchRunItem',
+    'BatchRunSummary',
     'capture_run_messages',
     'EndStrategy',
     'CallToolsNode',
@@ -65,6 +71,9 @@ NoneType = type(None)
 RunResultDataT = TypeVar('RunResultDataT')
 """Type variable for the result data of a run where `result_type` was customized on the run call."""
 
+_RESULT_SCHEMA_CACHE_SIZE = 128
+"""Maximum number of `result_type` schemas and graphs each agent keeps, the least recently used is evicted first."""
+
 
 @final
 @dataclasses.dataclass(init=False)
@@ -131,6 +140,16 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
     _max_result_retries: int = dataclasses.field(repr=False)
     _override_deps: _utils.Option[AgentDepsT] = dataclasses.field(default=None, repr=False)
     _override_model: _utils.Option[models.Model] = dataclasses.field(default=None, repr=False)
+    _graphs: dict[
+        tuple[type[Any], type[Any]],
+        tuple[
+            str | None,
+            Graph[_agent_graph.GraphAgentState, _agent_graph.GraphAgentDeps[AgentDepsT, Any], FinalResult[Any]],
+        ],
+    ] = dataclasses.field(repr=False)
+    _result_schemas: dict[tuple[type[Any], str, str | None], _result.ResultSchema[Any] | None] = dataclasses.field(
+        repr=False
+    )
 
     def __init__(
         self,
@@ -213,6 +232,8 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
         self._default_retries = retries
         self._max_result_retries = result_retries if result_retries is not None else retries
         self._reflect_on_tool_call = reflect_on_tool_call
+        self._graphs = {}
+        self._result_schemas = {}
         for tool in tools:
             if isinstance(tool, Tool):
                 self._register_tool(tool)
@@ -419,11 +440,6 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
         # typecast reasonable, even though it is possible to violate it with otherwise-type-checked code.
         result_validators = cast(list[_result.ResultValidator[AgentDepsT, RunResultDataT]], self._result_validators)
 
-        # TODO: Instead of this, copy the function tools to ensure they don't share current_retry state between agent
-        #  runs. Requires some changes to `Tool` to make them copyable though.
-        for v in self._function_tools.values():
-            v.current_retry = 0
-
         model_settings = merge_model_settings(self.model_settings, model_settings)
         usage_limits = usage_limits or _usage.UsageLimits()
 
@@ -557,6 +573,128 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
             )
         )
 
+    @overload
+    def run_many(
+        self,
+        user_prompts: Iterable[str | Sequence[_messages.UserContent]],
+        *,
+        concurrency: int = 10,
+        result_type: None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDepsT = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AgentBatchRun[ResultDataT]]: ...
+
+    @overload
+    def run_many(
+        self,
+        user_prompts: Iterable[str | Sequence[_messages.UserContent]],
+        *,
+        concurrency: int = 10,
+        result_type: type[RunResultDataT],
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDepsT = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        infer_name: bool = True,
+    ) -> AbstractAsyncContextManager[AgentBatchRun[RunResultDataT]]: ...
+
+    @asynccontextmanager
+    async def run_many(
+        self,
+        user_prompts: Iterable[str | Sequence[_messages.UserContent]],
+        *,
+        concurrency: int = 10,
+        result_type: type[RunResultDataT] | None = None,
+        model: models.Model | models.KnownModelName | None = None,
+        deps: AgentDepsT = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        usage: _usage.Usage | None = None,
+        infer_name: bool = True,
+    ) -> AsyncIterator[AgentBatchRun[Any]]:
+        """Run the agent with each of a batch of user prompts, limiting how many runs are in progress at once.
+
+        This returns a context manager yielding an [`AgentBatchRun`][pydantic_ai.agent.AgentBatchRun]. Iterating
+        over it yields a [`BatchRunItem`][pydantic_ai.agent.BatchRunItem] for each prompt as its run completes, so
+        items aren't necessarily in the order of the prompts. A failed run doesn't stop the batch, the error is
+        recorded on its item instead. Leaving the context manager cancels any runs which haven't finished.
+
+        The model is resolved once and shared by every run. Each run tracks its own usage, which is added to the
+        batch's [`Usage`][pydantic_ai.usage.Usage] when the run finishes. `usage_limits` apply to the batch as a
+        whole: before each request and after each response of any run, they're checked against the usage of the
+        whole batch, including runs still in progress. Once a limit is exceeded, no more runs are started, and after
+        the runs in progress have finished, iterating over the batch raises
+        [`UsageLimitExceeded`][pydantic_ai.exceptions.UsageLimitExceeded].
+
+        Example:
+        ```python
+        from pydantic_ai import Agent
+
+        agent = Agent('openai:gpt-4o')
+
+        async def main():
+            prompts = ['What is the capital of France?', 'What is the capital of Italy?']
+            async with agent.run_many(prompts, concurrency=1) as batch_run:
+                async for item in batch_run:
+                    print(item.index, item.result.data if item.result else item.error)
+                    #> 0 Paris
+                    #> 1 Rome
+            print(batch_run.summary().runs)
+            #> 2
+        ```
+
+        Args:
+            user_prompts: The user prompts to run the agent with. This may be a lazy iterable, prompts are only
+                taken from it as runs are started.
+            concurrency: Maximum number of runs in progress at once.
+            result_type: Custom result type to use for these runs, `result_type` may only be used if the agent has no
+                result validators since result validators would expect an argument that matches the agent's result type.
+            model: Optional model to use for these runs, required if `model` was not set when creating the agent.
+            deps: Optional dependencies to use for every run.
+            model_settings: Optional settings to use for this model's request.
+            usage_limits: Optional limits on model request count or token usage, across the whole batch. If not set,
+                each run still has the default per-run limits, but there's no limit on the batch.
+            usage: Optional usage to start with, the usage of every run is added to it.
+            infer_name: Whether to try to infer the agent name from the call frame if it's not set.
+
+        Returns:
+            A context manager yielding the batch run.
+        """
+        if concurrency < 1:
+            raise exceptions.UserError('`concurrency` must be at least 1')
+        if infer_name and self.name is None:
+            self._infer_name(inspect.currentframe())
+
+        model_used = self._get_model(model)
+        batch_usage = usage or _usage.Usage()
+
+        async def run(
+            user_prompt: str | Sequence[_messages.UserContent],
+            run_usage: _usage.Usage,
+            run_usage_limits: _usage.UsageLimits | None,
+        ) -> AgentRunResult[Any]:
+            return await self.run(
+                user_prompt,
+                result_type=result_type,
+                model=model_used,
+                deps=deps,
+                model_settings=model_settings,
+                usage_limits=run_usage_limits,
+                usage=run_usage,
+                infer_name=False,
+            )
+
+        batch_run = AgentBatchRun[Any](run, enumerate(user_prompts), concurrency, batch_usage, usage_limits)
+        try:
+            yield batch_run
+        finally:
+            await batch_run._cancel()  # pyright: ignore[reportPrivateUsage]
+
     @overload
     def run_stream(
         self,
@@ -1203,7 +1341,25 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
     def _build_graph(
         self, result_type: type[RunResultDataT] | None
     ) -> Graph[_agent_graph.GraphAgentState, _agent_graph.GraphAgentDeps[AgentDepsT, Any], FinalResult[Any]]:
-        return _agent_graph.build_agent_graph(self.name, self._deps_type, result_type or self.result_type)
+        """Get the graph for a run, graphs don't hold any run state, so they're built once and reused across runs."""
+        result_type_ = result_type or self.result_type
+        key = self._deps_type, result_type_
+        try:
+            cached = self._graphs.pop(key)
+        except KeyError:
+            cached = None
+        except TypeError:
+            # `result_type` isn't hashable, so we can't cache the graph
+            return _agent_graph.build_agent_graph(self.name, self._deps_type, result_type_)
+        # the name isn't part of the key as it may be inferred after the graph is first built, the graph is rebuilt
+        # instead of keeping one per name
+        if cached is None or cached[0] != self.name:
+            cached = self.name, _agent_graph.build_agent_graph(self.name, self._deps_type, result_type_)
+        # (re)insert the graph at the end of the dict so the least recently used is evicted first
+        self._graphs[key] = cached
+        if len(self._graphs) > _RESULT_SCHEMA_CACHE_SIZE:
+            del self._graphs[next(iter(self._graphs))]
+        return cached[1]
 
     def _prepare_result_schema(
         self, result_type: type[RunResultDataT] | None
@@ -1211,9 +1367,18 @@ class Agent(Generic[AgentDepsT, ResultDataT]):
         if result_type is not None:
             if self._result_validators:
                 raise exceptions.UserError('Cannot set a custom run `result_type` when the agent has result validators')
-            return _result.ResultSchema[result_type].build(
-                result_type, self._result_tool_name, self._result_tool_description
-            )
+            key = result_type, self._result_tool_name, self._result_tool_description
+            try:
+                # move the schema to the end of the dict so the least recently used is evicted first
+                result_schema = self._result_schemas[key] = self._result_schemas.pop(key)
+            except KeyError:
+                result_schema = self._result_schemas[key] = _result.ResultSchema[result_type].build(*key)
+                if len(self._result_schemas) > _RESULT_SCHEMA_CACHE_SIZE:
+                    del self._result_schemas[next(iter(self._result_schemas))]
+            except TypeError:
+                # `result_type` isn't hashable, so we can't cache the schema
+                return _result.ResultSchema[result_type].build(*key)
+            return result_schema
         else:
             return self._result_schema  # pyright: ignore[reportReturnType]
 
@@ -1459,6 +1624,210 @@ class AgentRun(Generic[AgentDepsT, ResultDataT]):
         return f'<{type(self).__name__} result={result_repr} usage={self.usage()}>'
 
 
+@dataclasses.dataclass
+class BatchRunItem(Generic[ResultDataT]):
+    """The outcome of the run for one prompt in an [`AgentBatchRun`][pydantic_ai.agent.AgentBatchRun]."""
+
+    index: int
+    """The index of the prompt in the prompts passed to `run_many`."""
+    user_prompt: str | Sequence[_messages.UserContent]
+    """The user prompt the agent was run with."""
+    result: AgentRunResult[ResultDataT] | None
+    """The result of the run, or `None` if the run failed."""
+    error: Exception | None
+    """The error raised by the run, or `None` if the run succeeded."""
+    duration: float
+    """How long the run took, in seconds."""
+
+
+@dataclasses.dataclass
+class BatchRunSummary:
+    """Throughput and latency of the runs in an [`AgentBatchRun`][pydantic_ai.agent.AgentBatchRun]."""
+
+    runs: int
+    """Number of runs completed, including failed runs."""
+    failures: int
+    """Number of runs which failed."""
+    duration: float
+    """Time in seconds from the start of the batch until it finished, or until now if it's still running."""
+    usage: _usage.Usage
+    """Combined usage of the runs in the batch."""
+    latency_mean: float
+    """Mean duration of a run, in seconds."""
+    latency_p50: float
+    """Median duration of a run, in seconds."""
+    latency_p95: float
+    """95th percentile duration of a run, in seconds."""
+    latency_max: float
+    """Longest duration of a run, in seconds."""
+
+    @property
+    def throughput(self) -> float:
+        """Runs completed per second."""
+        return self.runs / self.duration if self.duration else 0.0
+
+
+@dataclasses.dataclass(repr=False)
+class AgentBatchRun(Generic[ResultDataT]):
+    """A batch of agent runs, created by [`Agent.run_many`][pydantic_ai.agent.Agent.run_many].
+
+    Iterate over it to get a [`BatchRunItem`][pydantic_ai.agent.BatchRunItem] for each prompt as its run completes.
+    Runs are only started while the batch is being iterated over, so a slow consumer holds back the batch rather
+    than results piling up.
+    """
+
+    _run: Callable[
+        [str | Sequence[_messages.UserContent], _usage.Usage, _usage.UsageLimits | None],
+        Awaitable[AgentRunResult[ResultDataT]],
+    ]
+    _prompts: Iterator[tuple[int, str | Sequence[_messages.UserContent]]]
+    _concurrency: int
+    _usage: _usage.Usage
+    _usage_limits: _usage.UsageLimits | None
+    _pending: set[asyncio.Task[BatchRunItem[ResultDataT]]] = dataclasses.field(
+        default_factory=set[asyncio.Task[BatchRunItem[ResultDataT]]]
+    )
+    _running: list[_BatchRunUsageLimits] = dataclasses.field(default_factory=list['_BatchRunUsageLimits'])
+    _limit_exceeded: exceptions.UsageLimitExceeded | None = None
+    _durations: list[float] = dataclasses.field(default_factory=list[float])
+    _failures: int = 0
+    _start: float | None = None
+    _end: float | None = None
+
+    def __aiter__(self) -> AsyncIterator[BatchRunItem[ResultDataT]]:
+        return self._iter_items()
+
+    async def _iter_items(self) -> AsyncIterator[BatchRunItem[ResultDataT]]:
+        if self._start is None:
+            self._start = time.perf_counter()
+        while len(self._pending) < self._concurrency and self._start_next():
+            pass
+        while self._pending:
+            done, self._pending = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = task.result()
+                # start the next run before handing this item over, to keep the batch at full concurrency
+                self._start_next()
+                self._durations.append(item.duration)
+                if item.error is not None:
+                    self._failures += 1
+                yield item
+        self._end = time.perf_counter()
+        if self._limit_exceeded is not None:
+            raise self._limit_exceeded
+
+    def _start_next(self) -> bool:
+        """Start the run for the next prompt, returns `False` if there are no prompts left or a limit was exceeded."""
+        if self._usage_limits is not None and self._limit_exceeded is None:
+            live_usage = self._live_usage()
+            try:
+                self._usage_limits.check_before_request(live_usage)
+                self._usage_limits.check_tokens(live_usage)
+            except exceptions.UsageLimitExceeded as e:
+                self._limit_exceeded = e
+        if self._limit_exceeded is not None:
+            return False
+        for index, user_prompt in self._prompts:
+            self._pending.add(asyncio.create_task(self._run_item(index, user_prompt)))
+            return True
+        return False
+
+    async def _run_item(
+        self, index: int, user_prompt: str | Sequence[_messages.UserContent]
+    ) -> BatchRunItem[ResultDataT]:
+        start = time.perf_counter()
+        # runs track their own usage, so a run's result reports only its usage, not the batch's
+        run_usage = _usage.Usage()
+        run_usage_limits = None
+        if self._usage_limits is not None:
+            run_usage_limits = _BatchRunUsageLimits(self._usage_limits, self._live_usage, run_usage)
+            self._running.append(run_usage_limits)
+        try:
+            result = await self._run(user_prompt, run_usage, run_usage_limits)
+        except Exception as e:
+            if isinstance(e, exceptions.UsageLimitExceeded) and self._limit_exceeded is None:
+                self._limit_exceeded = e
+            return BatchRunItem(index, user_prompt, None, e, time.perf_counter() - start)
+        else:
+            return BatchRunItem(index, user_prompt, result, None, time.perf_counter() - start)
+        finally:
+            self._usage.incr(run_usage)
+            if run_usage_limits is not None:
+                self._running.remove(run_usage_limits)
+
+    def _live_usage(self) -> _usage.Usage:
+        """Get the usage of the batch including the runs still in progress, and the requests they've started."""
+        usage = _usage.Usage()
+        usage.incr(self._usage)
+        for run_usage_limits in self._running:
+            run_usage = run_usage_limits.run_usage
+            usage.incr(run_usage, requests=max(run_usage_limits.requests_started - run_usage.requests, 0))
+        return usage
+
+    async def _cancel(self) -> None:
+        for task in self._pending:
+            task.cancel()
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+
+    def usage(self) -> _usage.Usage:
+        """Get the combined usage of the runs in the batch so far."""
+        return self._usage
+
+    def summary(self) -> BatchRunSummary:
+        """Get a summary of the throughput and latency of the runs completed so far."""
+        durations = sorted(self._durations)
+        if self._start is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._end or time.perf_counter()) - self._start
+        return BatchRunSummary(
+            runs=len(durations),
+            failures=self._failures,
+            duration=elapsed,
+            usage=self._usage,
+            latency_mean=sum(durations) / len(durations) if durations else 0.0,
+            latency_p50=_percentile(durations, 0.5),
+            latency_p95=_percentile(durations, 0.95),
+            latency_max=durations[-1] if durations else 0.0,
+        )
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} completed={len(self._durations)} pending={len(self._pending)}>'
+
+
+class _BatchRunUsageLimits(_usage.UsageLimits):
+    """Limits for one run in a batch, checked against the live usage of the whole batch rather than of the run."""
+
+    def __init__(
+        self, limits: _usage.UsageLimits, batch_usage: Callable[[], _usage.Usage], run_usage: _usage.Usage
+    ) -> None:
+        super().__init__(
+            request_limit=limits.request_limit,
+            request_tokens_limit=limits.request_tokens_limit,
+            response_tokens_limit=limits.response_tokens_limit,
+            total_tokens_limit=limits.total_tokens_limit,
+        )
+        self.batch_usage = batch_usage
+        self.run_usage = run_usage
+        # requests are only added to the run's usage once they've finished, so count those in progress separately
+        self.requests_started = 0
+
+    def check_before_request(self, usage: _usage.Usage) -> None:
+        super().check_before_request(self.batch_usage())
+        self.requests_started += 1
+
+    def check_tokens(self, usage: _usage.Usage) -> None:
+        super().check_tokens(self.batch_usage())
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of values which are already sorted."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)) - 1, 0)]
+
+
 @dataclasses.dataclass
 class AgentRunResult(Generic[ResultDataT]):
     """The final result of an agent run."""
@@ -100,13 +100,19 @@ class ModelHTTPError(AgentRunError):
     body: object | None
     """The body of the response, if available."""
 
+    headers: dict[str, str] | None
+    """The headers of the response with lowercase names, if available, e.g. to read `retry-after`."""
+
     message: str
     """The error message with the status code and response body, if available."""
 
-    def __init__(self, status_code: int, model_name: str, body: object | None = None):
+    def __init__(
+        self, status_code: int, model_name: str, body: object | None = None, headers: dict[str, str] | None = None
+    ):
         self.status_code = status_code
         self.model_name = model_name
         self.body = body
+        self.headers = headers
         message = f'status_code: {status_code}, model_name: {model_name}, body: {body}'
         super().__init__(message)
 
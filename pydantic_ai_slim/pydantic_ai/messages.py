@@ -1,6 +1,7 @@
 from __future__ import annotations as _annotations
 
 import uuid
+from base64 import b64encode
 from collections.abc import Sequence
 from dataclasses import dataclass, field, replace
 from datetime import datetime
@@ -111,6 +112,30 @@ class BinaryContent:
         """Return `True` if the media type is an image type."""
         return self.media_type.startswith('image/')
 
+    @property
+    def base64(self) -> str:
+        """The binary data encoded as base64.
+
+        This is computed on first access and reused until `data` is replaced, so the same content isn't re-encoded
+        for every request it's sent in.
+        """
+        cached: tuple[bytes, str] | None = self.__dict__.get('_base64')
+        if cached is None or cached[0] is not self.data:
+            cached = self.__dict__['_base64'] = self.data, b64encode(self.data).decode('ascii')
+        return cached[1]
+
+    @property
+    def data_uri(self) -> str:
+        """The binary data as a `data:` URI, e.g. `data:image/png;base64,...`.
+
+        Like [`base64`][pydantic_ai.messages.BinaryContent.base64], this is computed on first access and reused.
+        """
+        cached: tuple[str, str, str] | None = self.__dict__.get('_data_uri')
+        base64 = self.base64
+        if cached is None or cached[0] is not base64 or cached[1] != self.media_type:
+            cached = self.__dict__['_data_uri'] = base64, self.media_type, f'data:{self.media_type};base64,{base64}'
+        return cached[2]
+
     @property
     def audio_format(self) -> Literal['mp3', 'wav']:
         """Return the audio format given the media type."""
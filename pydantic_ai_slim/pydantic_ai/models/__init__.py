@@ -6,20 +6,35 @@ specific LLM being used.
 
 from __future__ import annotations as _annotations
 
+import asyncio
+import hashlib
+import time
+import weakref
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator, Iterator
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import cache
-from typing import TYPE_CHECKING
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Generic
 
 import httpx
-from typing_extensions import Literal
+from pydantic_core import to_json
+from typing_extensions import Literal, TypeVar
 
 from .._parts_manager import ModelResponsePartsManager
 from ..exceptions import UserError
-from ..messages import ModelMessage, ModelResponse, ModelResponseStreamEvent
+from ..messages import (
+    AudioUrl,
+    ImageUrl,
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    UserPromptPart,
+)
 from ..settings import ModelSettings
 from ..usage import Usage
 
@@ -272,6 +287,83 @@ class StreamedResponse(ABC):
         raise NotImplementedError()
 
 
+MappedMessageT = TypeVar('MappedMessageT')
+"""Type of a message once it's been mapped to the format used by a model's API."""
+
+
+class MessageMappingCache(Generic[MappedMessageT]):
+    """Cache of messages already mapped to the format used by a model's API.
+
+    Message history only grows during a run, so keeping the mapped form of each message means a request only needs
+    to map the messages added since the previous request, rather than the whole history.
+
+    Entries are checked against the identity of the message's parts and their attributes, so replacing a message,
+    one of its parts, or an attribute of a part means the message is mapped again. Mutating an attribute value in
+    place, e.g. appending to the list of content in a `UserPromptPart`, is not detected.
+
+    Entries are dropped when their message is garbage collected.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[ModelMessage], tuple[Any, ...], MappedMessageT]] = {}
+
+    def get(self, message: ModelMessage) -> MappedMessageT | None:
+        """Get the mapped form of `message`, or `None` if it hasn't been mapped or has changed since it was."""
+        entry = self._entries.get(id(message))
+        if entry is not None:
+            message_ref, values, mapped = entry
+            current_values = _message_values(message)
+            if (
+                message_ref() is message
+                and len(values) == len(current_values)
+                and all(a is b for a, b in zip(values, current_values))
+            ):
+                return mapped
+
+    def set(self, message: ModelMessage, mapped: MappedMessageT) -> MappedMessageT:
+        """Store the mapped form of `message`, and return it."""
+        key = id(message)
+        message_ref = weakref.ref(message, lambda _: self._entries.pop(key, None))
+        # values are held, not just their ids, so an id can't be reused by a new value while the entry exists
+        self._entries[key] = message_ref, _message_values(message), mapped
+        return mapped
+
+
+def _message_values(message: ModelMessage) -> tuple[Any, ...]:
+    return tuple(chain.from_iterable((part, *vars(part).values()) for part in message.parts))
+
+
+MappedToolT = TypeVar('MappedToolT')
+"""Type of a tool definition once it's been mapped to the format used by a model's API."""
+
+
+class ToolMappingCache(Generic[MappedToolT]):
+    """Size-bounded LRU cache of tool definitions already mapped to the format used by a model's API.
+
+    Tool definitions are built afresh for each step of a run, so entries are keyed by a hash of the definition's
+    content rather than its identity. Mapping a tool can be costly, e.g. simplifying its JSON schema for Gemini, and
+    with this a run only maps each distinct tool once, rather than once per step.
+
+    Mapped tools are shared between requests, so they must not be mutated.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._entries: dict[bytes, MappedToolT] = {}
+
+    def map(self, tool_def: ToolDefinition, map_tool: Callable[[ToolDefinition], MappedToolT]) -> MappedToolT:
+        """Get the mapped form of `tool_def`, calling `map_tool` to map it if an equal definition hasn't been."""
+        key = hashlib.sha256(to_json(tool_def)).digest()
+        mapped = self._entries.pop(key, None)
+        if mapped is None:
+            mapped = map_tool(tool_def)
+            if len(self._entries) >= self.max_size:
+                # evict the least recently used entry, entries are moved to the end when used
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = mapped
+        return mapped
+
+
 ALLOW_MODEL_REQUESTS = True
 """Whether to allow requests to models.
 
@@ -372,7 +464,71 @@ def infer_model(model: Model | KnownModelName) -> Model:
         raise UserError(f'Unknown model: {model}')
 
 
-def cached_async_http_client(timeout: int = 600, connect: int = 5) -> httpx.AsyncClient:
+@dataclass
+class HTTPClientSettings:
+    """Settings for the clients created by [`cached_async_http_client`][pydantic_ai.models.cached_async_http_client].
+
+    Set them with [`configure_http_clients`][pydantic_ai.models.configure_http_clients].
+    """
+
+    max_connections: int | None = 100
+    """Maximum number of connections open at once in each pool, `None` for no limit."""
+    max_keepalive_connections: int | None = 20
+    """Maximum number of idle connections kept open in each pool, `None` for no limit."""
+    keepalive_expiry: float | None = 5.0
+    """How long in seconds an idle connection is kept open, `None` to keep it open indefinitely."""
+    http2: bool = False
+    """Whether to use HTTP/2 where the server supports it, which requires the `h2` package (`httpx[http2]`).
+
+    HTTP/2 sends concurrent requests to the same host over a single connection, rather than each request waiting
+    for a connection of its own.
+    """
+    per_provider: bool = False
+    """Whether each provider gets its own client and connection pool, rather than all providers sharing one.
+
+    This stops a burst of requests to one provider from using up the connections needed by the others.
+    """
+
+
+@dataclass
+class HTTPPoolStats:
+    """How saturated the connection pool of a client created by `cached_async_http_client` is."""
+
+    waiting_requests: int
+    """Number of requests waiting for a connection."""
+    active_connections: int
+    """Number of connections handling a request."""
+    idle_connections: int
+    """Number of open connections not handling a request."""
+    max_connections: int | None
+    """Maximum number of connections in the pool, `None` for no limit."""
+
+
+_http_client_settings = HTTPClientSettings()
+_cached_http_clients: dict[tuple[int, int, str | None], httpx.AsyncClient] = {}
+_retired_http_clients: list[httpx.AsyncClient] = []
+"""Clients replaced by `configure_http_clients`, which are closed by `close_cached_async_http_clients`."""
+
+
+def configure_http_clients(settings: HTTPClientSettings) -> None:
+    """Set the settings used by [`cached_async_http_client`][pydantic_ai.models.cached_async_http_client].
+
+    This only applies to clients created afterwards, so should be called before any models are created. Clients
+    already created are left open, since models may still be using them, until
+    [`close_cached_async_http_clients`][pydantic_ai.models.close_cached_async_http_clients] is called.
+    """
+    global _http_client_settings
+    if settings.http2:
+        try:
+            import h2  # noqa: F401  # pyright: ignore[reportMissingImports,reportUnusedImport]
+        except ImportError as e:
+            raise UserError('HTTP/2 requires the `h2` package, install it with `pip install "httpx[http2]"`') from e
+    _http_client_settings = settings
+    _retired_http_clients.extend(_cached_http_clients.values())
+    _cached_http_clients.clear()
+
+
+def cached_async_http_client(timeout: int = 600, connect: int = 5, provider: str | None = None) -> httpx.AsyncClient:
     """Cached HTTPX async client so multiple agents and calls can share the same client.
 
     There are good reasons why in production you should use a `httpx.AsyncClient` as an async context manager as
@@ -381,23 +537,319 @@ def cached_async_http_client(timeout: int = 600, connect: int = 5) -> httpx.Asyn
 
     The default timeouts match those of OpenAI,
     see <https://github.com/openai/openai-python/blob/v1.54.4/src/openai/_constants.py#L9>.
+
+    Connection pooling and HTTP/2 are set with [`configure_http_clients`][pydantic_ai.models.configure_http_clients],
+    use [`close_cached_async_http_clients`][pydantic_ai.models.close_cached_async_http_clients] to close the clients
+    on shutdown.
+
+    Args:
+        timeout: The timeout for requests in seconds.
+        connect: The timeout for connecting in seconds.
+        provider: The provider the client is for, e.g. `'openai'`, used to give each provider its own client when
+            [`HTTPClientSettings.per_provider`][pydantic_ai.models.HTTPClientSettings.per_provider] is set.
     """
-    client = _cached_async_http_client(timeout=timeout, connect=connect)
-    if client.is_closed:
-        # This happens if the context manager is used, so we need to create a new client.
-        _cached_async_http_client.cache_clear()
-        client = _cached_async_http_client(timeout=timeout, connect=connect)
+    key = (timeout, connect, provider if _http_client_settings.per_provider else None)
+    client = _cached_http_clients.get(key)
+    if client is None or client.is_closed:
+        # the client may have been closed outside of `close_cached_async_http_clients`, e.g. if a model's client was
+        # used as a context manager, and handing a closed client to a new model would make all its requests fail
+        client = _cached_http_clients[key] = _create_async_http_client(timeout, connect, _http_client_settings)
     return client
 
 
-@cache
-def _cached_async_http_client(timeout: int = 600, connect: int = 5) -> httpx.AsyncClient:
+async def close_cached_async_http_clients() -> None:
+    """Close all the clients created by [`cached_async_http_client`][pydantic_ai.models.cached_async_http_client].
+
+    Call this on shutdown to close their connections cleanly. This includes clients replaced by
+    [`configure_http_clients`][pydantic_ai.models.configure_http_clients].
+    """
+    clients = [*_cached_http_clients.values(), *_retired_http_clients]
+    _cached_http_clients.clear()
+    _retired_http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def http_client_pool_stats() -> dict[str | None, HTTPPoolStats]:
+    """Get the saturation of the connection pools of the clients created by `cached_async_http_client`.
+
+    Returns:
+        The stats of each open client's pool, keyed by provider, or `None` for a client shared by all providers.
+        Stats for clients with the same provider but different timeouts are combined.
+    """
+    stats: dict[str | None, HTTPPoolStats] = {}
+    for (_, _, provider), client in _cached_http_clients.items():
+        transport = client._transport  # pyright: ignore[reportPrivateUsage]
+        if client.is_closed or not isinstance(transport, _PoolMetricsTransport):
+            continue
+        client_stats = transport.stats()
+        if existing := stats.get(provider):
+            existing.waiting_requests += client_stats.waiting_requests
+            existing.active_connections += client_stats.active_connections
+            existing.idle_connections += client_stats.idle_connections
+        else:
+            stats[provider] = client_stats
+    return stats
+
+
+def _create_async_http_client(timeout: int, connect: int, settings: HTTPClientSettings) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=settings.http2)
     return httpx.AsyncClient(
         timeout=httpx.Timeout(timeout=timeout, connect=connect),
         headers={'User-Agent': get_user_agent()},
+        transport=_PoolMetricsTransport(transport, settings.max_connections),
     )
 
 
+class _PoolMetricsTransport(httpx.AsyncBaseTransport):
+    """Transport counting the requests waiting for a connection from the pool of the transport it wraps.
+
+    A request is waiting from when it's sent to the pool until its headers start being sent on a connection, which
+    is detected with the [`trace` request extension](https://www.encode.io/httpcore/extensions/#trace).
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, max_connections: int | None):
+        self._transport = transport
+        self._max_connections = max_connections
+        self._waiting = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        waiting = True
+        self._waiting += 1
+        parent_trace = request.extensions.get('trace')
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal waiting
+            if waiting and event_name.endswith('.send_request_headers.started'):
+                waiting = False
+                self._waiting -= 1
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, 'trace': trace}
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            if waiting:
+                self._waiting -= 1
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def stats(self) -> HTTPPoolStats:
+        connections = self._transport._pool.connections  # pyright: ignore[reportPrivateUsage]
+        idle_connections = sum(connection.is_idle() for connection in connections)
+        return HTTPPoolStats(
+            waiting_requests=self._waiting,
+            active_connections=len(connections) - idle_connections,
+            idle_connections=idle_connections,
+            max_connections=self._max_connections,
+        )
+
+
+@dataclass
+class DownloadedMedia:
+    """A file downloaded from a URL in a user prompt, e.g. an [`ImageUrl`][pydantic_ai.messages.ImageUrl]."""
+
+    data: bytes
+    """The content of the file."""
+    media_type: str
+    """The media type of the file, from the `Content-Type` response header."""
+
+
+@dataclass
+class _DownloadCacheEntry:
+    media: DownloadedMedia
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+
+class MediaDownloadCache:
+    """Size-bounded LRU cache of files downloaded from URLs in user prompts.
+
+    Freshness follows the response's caching headers: `no-store` responses aren't cached, `max-age` or else
+    `Expires` sets how long a download is fresh for, and `no-cache` means it must be revalidated before each use.
+    Responses with none of these are only treated as fresh if they have a `Last-Modified` header. Stale entries with
+    an `ETag` or `Last-Modified` header are revalidated with a conditional request rather than downloaded again.
+
+    Concurrent requests for the same URL share a single download.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 300,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """Create a download cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached files, the least recently used are evicted beyond this.
+            default_ttl: How long in seconds a download is fresh for when the response sets neither `max-age` nor
+                `Expires`, but has a `Last-Modified` header. Other responses without these aren't fresh at all.
+            http_client: The client to download with, defaults to
+                [`cached_async_http_client`][pydantic_ai.models.cached_async_http_client].
+        """
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.http_client = http_client
+        self.hits = 0
+        """Number of downloads served from the cache, including those revalidated with a conditional request, or
+        shared with a download already in progress."""
+        self.misses = 0
+        """Number of downloads which fetched the file from the URL."""
+        self.revalidations = 0
+        """Number of stale entries confirmed to be unchanged by a conditional request."""
+        self._entries: dict[str, _DownloadCacheEntry] = {}
+        self._size = 0
+        self._downloads: dict[tuple[str, bool], asyncio.Future[DownloadedMedia]] = {}
+
+    async def get(self, url: str, *, follow_redirects: bool = True) -> DownloadedMedia:
+        """Download `url`, or return it from the cache if it's still fresh."""
+        entry = self._entries.get(url)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self.hits += 1
+            # move the entry to the end so the least recently used is evicted first
+            self._entries[url] = self._entries.pop(url)
+            return entry.media
+
+        key = url, follow_redirects
+        download = self._downloads.get(key)
+        if download is None:
+            download = self._downloads[key] = asyncio.ensure_future(self._download(url, follow_redirects))
+
+            def download_done(future: asyncio.Future[DownloadedMedia]) -> None:
+                del self._downloads[key]
+                # mark any error as retrieved, in case every caller waiting for the download was cancelled
+                if not future.cancelled():
+                    future.exception()
+
+            download.add_done_callback(download_done)
+        else:
+            self.hits += 1
+        # shielded so a caller being cancelled doesn't cancel the download for any others waiting for it
+        return await asyncio.shield(download)
+
+    async def _download(self, url: str, follow_redirects: bool) -> DownloadedMedia:
+        now = time.monotonic()
+        entry = self._entries.get(url)
+        headers: dict[str, str] = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        http_client = self.http_client or cached_async_http_client()
+        response = await http_client.get(url, headers=headers, follow_redirects=follow_redirects)
+        if entry is not None and response.status_code == 304:
+            self.hits += 1
+            self.revalidations += 1
+            media = entry.media
+        else:
+            response.raise_for_status()
+            self.misses += 1
+            media_type = response.headers.get('Content-Type', 'application/octet-stream')
+            media = DownloadedMedia(data=response.content, media_type=media_type)
+
+        ttl = self._freshness(response.headers)
+        if ttl is not None:
+            etag = response.headers.get('ETag') or (entry.etag if entry is not None else None)
+            last_modified = response.headers.get('Last-Modified') or (
+                entry.last_modified if entry is not None else None
+            )
+            if ttl > 0 or etag or last_modified:
+                self._store(url, _DownloadCacheEntry(media, etag, last_modified, expires_at=now + ttl))
+                return media
+        self._discard(url)
+        return media
+
+    def _freshness(self, headers: httpx.Headers) -> float | None:
+        """Get how long in seconds a response is fresh for, or `None` if it mustn't be stored at all."""
+        cache_control = {d.strip().lower() for d in headers.get('Cache-Control', '').split(',')}
+        if 'no-store' in cache_control:
+            return None
+        if 'no-cache' in cache_control:
+            return 0.0
+        if max_age := next((d[8:] for d in cache_control if d.startswith('max-age=') and d[8:].isdigit()), None):
+            return float(max_age)
+        if expires := headers.get('Expires'):
+            # an invalid date, commonly `0`, means the response has already expired
+            expires_at = _parse_http_date(expires)
+            if expires_at is None:
+                return 0.0
+            response_date = _parse_http_date(headers.get('Date', '')) or datetime.now(tz=timezone.utc)
+            return max((expires_at - response_date).total_seconds(), 0.0)
+        if 'Last-Modified' in headers:
+            return self.default_ttl
+        return 0.0
+
+    async def get_many(
+        self, urls: Sequence[str], *, follow_redirects: bool = True, max_concurrency: int = 8
+    ) -> dict[str, DownloadedMedia]:
+        """Download several URLs concurrently, with at most `max_concurrency` downloads in flight at once."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def get(url: str) -> DownloadedMedia:
+            async with semaphore:
+                return await self.get(url, follow_redirects=follow_redirects)
+
+        unique_urls = list(dict.fromkeys(urls))
+        return dict(zip(unique_urls, await asyncio.gather(*map(get, unique_urls))))
+
+    def clear(self) -> None:
+        """Remove all entries from the cache, and reset the counters."""
+        self._entries.clear()
+        self._size = 0
+        self.hits = self.misses = self.revalidations = 0
+
+    def _store(self, url: str, entry: _DownloadCacheEntry) -> None:
+        self._discard(url)
+        size = len(entry.media.data)
+        if size <= self.max_bytes:
+            self._entries[url] = entry
+            self._size += size
+            while self._size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, url: str) -> None:
+        if (entry := self._entries.pop(url, None)) is not None:
+            self._size -= len(entry.media.data)
+
+
+def _parse_http_date(value: str) -> datetime | None:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+@cache
+def cached_media_downloads() -> MediaDownloadCache:
+    """The download cache shared by all models for files referenced by URL in user prompts."""
+    return MediaDownloadCache()
+
+
+def user_prompt_urls(messages: Iterable[ModelMessage]) -> Iterator[AudioUrl | ImageUrl]:
+    """Iterate over the files referenced by URL in the user prompts of `messages`.
+
+    Models use this to download the files needed by all the messages of a request at once, before mapping them.
+    """
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, UserPromptPart) and not isinstance(part.content, str):
+                    for item in part.content:
+                        if isinstance(item, (AudioUrl, ImageUrl)):
+                            yield item
+
+
 @cache
 def get_user_agent() -> str:
     """Get the user agent string for the HTTP client."""
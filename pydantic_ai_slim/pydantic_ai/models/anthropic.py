@@ -1,12 +1,11 @@
 from __future__ import annotations as _annotations
 
 import base64
-import io
 from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from json import JSONDecodeError, loads as json_loads
+from json import loads as json_loads
 from typing import Any, Literal, Union, cast, overload
 
 from httpx import AsyncClient as AsyncHTTPClient
@@ -32,16 +31,22 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    DownloadedMedia,
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
+    ToolMappingCache,
     cached_async_http_client,
+    cached_media_downloads,
     check_allow_model_requests,
+    user_prompt_urls,
 )
 
 try:
     from anthropic import NOT_GIVEN, APIStatusError, AsyncAnthropic, AsyncStream
     from anthropic.types import (
+        CacheControlEphemeralParam,
         ContentBlock,
         ImageBlockParam,
         Message as AnthropicMessage,
@@ -86,7 +91,7 @@ See [the Anthropic docs](https://docs.anthropic.com/en/docs/about-claude/models)
 """
 
 
-class AnthropicModelSettings(ModelSettings):
+class AnthropicModelSettings(ModelSettings, total=False):
     """Settings used for an Anthropic model request."""
 
     anthropic_metadata: MetadataParam
@@ -94,6 +99,18 @@ class AnthropicModelSettings(ModelSettings):
 
     Contains `user_id`, an external identifier for the user who is associated with the request."""
 
+    anthropic_cache_system_prompt: bool
+    """Whether to add a [prompt caching](https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching)
+    breakpoint after the system prompt, so it's cached across requests."""
+
+    anthropic_cache_tools: bool
+    """Whether to add a prompt caching breakpoint after the last tool definition, so the tool definitions are cached
+    across requests, along with the system prompt which precedes them."""
+
+    anthropic_cache_messages: bool
+    """Whether to add a prompt caching breakpoint after the last message, so the message history sent in this
+    request is cached and can be read from the cache by the next request in the run."""
+
 
 @dataclass(init=False)
 class AnthropicModel(Model):
@@ -112,6 +129,8 @@ class AnthropicModel(Model):
 
     _model_name: AnthropicModelName = field(repr=False)
     _system: str | None = field(default='anthropic', repr=False)
+    _message_cache: MessageMappingCache[tuple[str, MessageParam]] = field(repr=False)
+    _tool_cache: ToolMappingCache[ToolParam] = field(repr=False)
 
     def __init__(
         self,
@@ -141,7 +160,9 @@ class AnthropicModel(Model):
         elif http_client is not None:
             self.client = AsyncAnthropic(api_key=api_key, http_client=http_client)
         else:
-            self.client = AsyncAnthropic(api_key=api_key, http_client=cached_async_http_client())
+            self.client = AsyncAnthropic(api_key=api_key, http_client=cached_async_http_client(provider='anthropic'))
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     async def request(
         self,
@@ -221,12 +242,20 @@ class AnthropicModel(Model):
             if (allow_parallel_tool_calls := model_settings.get('parallel_tool_calls')) is not None:
                 tool_choice['disable_parallel_tool_use'] = not allow_parallel_tool_calls
 
-        system_prompt, anthropic_messages = await self._map_message(messages)
+        system_prompt, anthropic_messages = await self._map_messages(messages)
+
+        system: str | list[TextBlockParam] = system_prompt
+        if system_prompt and model_settings.get('anthropic_cache_system_prompt'):
+            system = [TextBlockParam(type='text', text=system_prompt, cache_control=_CACHE_CONTROL)]
+        if tools and model_settings.get('anthropic_cache_tools'):
+            tools[-1] = {**tools[-1], 'cache_control': _CACHE_CONTROL}
+        if anthropic_messages and model_settings.get('anthropic_cache_messages'):
+            anthropic_messages[-1] = _cache_message(anthropic_messages[-1])
 
         try:
             return await self.client.messages.create(
                 max_tokens=model_settings.get('max_tokens', 1024),
-                system=system_prompt or NOT_GIVEN,
+                system=system or NOT_GIVEN,
                 messages=anthropic_messages,
                 model=self._model_name,
                 tools=tools or NOT_GIVEN,
@@ -239,7 +268,9 @@ class AnthropicModel(Model):
             )
         except APIStatusError as e:
             if (status_code := e.status_code) >= 400:
-                raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
+                raise ModelHTTPError(
+                    status_code=status_code, model_name=self.model_name, body=e.body, headers=dict(e.response.headers)
+                ) from e
             raise
 
     def _process_response(self, response: AnthropicMessage) -> ModelResponse:
@@ -273,64 +304,81 @@ class AnthropicModel(Model):
         )
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> list[ToolParam]:
-        tools = [self._map_tool_definition(r) for r in model_request_parameters.function_tools]
+        tools = [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.function_tools]
         if model_request_parameters.result_tools:
-            tools += [self._map_tool_definition(r) for r in model_request_parameters.result_tools]
+            tools += [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.result_tools]
         return tools
 
-    async def _map_message(self, messages: list[ModelMessage]) -> tuple[str, list[MessageParam]]:
-        """Just maps a `pydantic_ai.Message` to a `anthropic.types.MessageParam`."""
+    async def _map_messages(self, messages: list[ModelMessage]) -> tuple[str, list[MessageParam]]:
+        """Map messages to `anthropic.types.MessageParam`s, reusing the mapping of messages sent in a previous request."""
         system_prompt: str = ''
         anthropic_messages: list[MessageParam] = []
-        for m in messages:
-            if isinstance(m, ModelRequest):
-                user_content_params: list[ToolResultBlockParam | TextBlockParam | ImageBlockParam] = []
-                for request_part in m.parts:
-                    if isinstance(request_part, SystemPromptPart):
-                        system_prompt += request_part.content
-                    elif isinstance(request_part, UserPromptPart):
-                        async for content in self._map_user_prompt(request_part):
-                            user_content_params.append(content)
-                    elif isinstance(request_part, ToolReturnPart):
-                        tool_result_block_param = ToolResultBlockParam(
+        # reuse the mapping of any messages already sent in a previous request
+        mapped_messages = [self._message_cache.get(m) for m in messages]
+        # image URLs in all the messages to map are downloaded concurrently up front, rather than one prompt at a time
+        unmapped = [m for m, mapped in zip(messages, mapped_messages) if mapped is None]
+        downloads = await cached_media_downloads().get_many(
+            [item.url for item in user_prompt_urls(unmapped) if isinstance(item, ImageUrl)]
+        )
+        for m, mapped in zip(messages, mapped_messages):
+            if mapped is None:
+                mapped = self._message_cache.set(m, await self._map_message(m, downloads))
+            message_system_prompt, message_param = mapped
+            system_prompt += message_system_prompt
+            anthropic_messages.append(message_param)
+        return system_prompt, anthropic_messages
+
+    async def _map_message(self, m: ModelMessage, downloads: dict[str, DownloadedMedia]) -> tuple[str, MessageParam]:
+        system_prompt: str = ''
+        if isinstance(m, ModelRequest):
+            user_content_params: list[ToolResultBlockParam | TextBlockParam | ImageBlockParam] = []
+            for request_part in m.parts:
+                if isinstance(request_part, SystemPromptPart):
+                    system_prompt += request_part.content
+                elif isinstance(request_part, UserPromptPart):
+                    async for content in self._map_user_prompt(request_part, downloads):
+                        user_content_params.append(content)
+                elif isinstance(request_part, ToolReturnPart):
+                    tool_result_block_param = ToolResultBlockParam(
+                        tool_use_id=_guard_tool_call_id(t=request_part, model_source='Anthropic'),
+                        type='tool_result',
+                        content=request_part.model_response_str(),
+                        is_error=False,
+                    )
+                    user_content_params.append(tool_result_block_param)
+                elif isinstance(request_part, RetryPromptPart):
+                    if request_part.tool_name is None:
+                        retry_param = TextBlockParam(type='text', text=request_part.model_response())
+                    else:
+                        retry_param = ToolResultBlockParam(
                             tool_use_id=_guard_tool_call_id(t=request_part, model_source='Anthropic'),
                             type='tool_result',
-                            content=request_part.model_response_str(),
-                            is_error=False,
+                            content=request_part.model_response(),
+                            is_error=True,
                         )
-                        user_content_params.append(tool_result_block_param)
-                    elif isinstance(request_part, RetryPromptPart):
-                        if request_part.tool_name is None:
-                            retry_param = TextBlockParam(type='text', text=request_part.model_response())
-                        else:
-                            retry_param = ToolResultBlockParam(
-                                tool_use_id=_guard_tool_call_id(t=request_part, model_source='Anthropic'),
-                                type='tool_result',
-                                content=request_part.model_response(),
-                                is_error=True,
-                            )
-                        user_content_params.append(retry_param)
-                anthropic_messages.append(MessageParam(role='user', content=user_content_params))
-            elif isinstance(m, ModelResponse):
-                assistant_content_params: list[TextBlockParam | ToolUseBlockParam] = []
-                for response_part in m.parts:
-                    if isinstance(response_part, TextPart):
-                        assistant_content_params.append(TextBlockParam(text=response_part.content, type='text'))
-                    else:
-                        tool_use_block_param = ToolUseBlockParam(
-                            id=_guard_tool_call_id(t=response_part, model_source='Anthropic'),
-                            type='tool_use',
-                            name=response_part.tool_name,
-                            input=response_part.args_as_dict(),
-                        )
-                        assistant_content_params.append(tool_use_block_param)
-                anthropic_messages.append(MessageParam(role='assistant', content=assistant_content_params))
-            else:
-                assert_never(m)
-        return system_prompt, anthropic_messages
+                    user_content_params.append(retry_param)
+            return system_prompt, MessageParam(role='user', content=user_content_params)
+        elif isinstance(m, ModelResponse):
+            assistant_content_params: list[TextBlockParam | ToolUseBlockParam] = []
+            for response_part in m.parts:
+                if isinstance(response_part, TextPart):
+                    assistant_content_params.append(TextBlockParam(text=response_part.content, type='text'))
+                else:
+                    tool_use_block_param = ToolUseBlockParam(
+                        id=_guard_tool_call_id(t=response_part, model_source='Anthropic'),
+                        type='tool_use',
+                        name=response_part.tool_name,
+                        input=response_part.args_as_dict(),
+                    )
+                    assistant_content_params.append(tool_use_block_param)
+            return system_prompt, MessageParam(role='assistant', content=assistant_content_params)
+        else:
+            assert_never(m)
 
     @staticmethod
-    async def _map_user_prompt(part: UserPromptPart) -> AsyncGenerator[ImageBlockParam | TextBlockParam]:
+    async def _map_user_prompt(
+        part: UserPromptPart, downloads: dict[str, DownloadedMedia]
+    ) -> AsyncGenerator[ImageBlockParam | TextBlockParam]:
         if isinstance(part.content, str):
             yield TextBlockParam(text=part.content, type='text')
         else:
@@ -340,41 +388,28 @@ class AnthropicModel(Model):
                 elif isinstance(item, BinaryContent):
                     if item.is_image:
                         yield ImageBlockParam(
-                            source={'data': io.BytesIO(item.data), 'media_type': item.media_type, 'type': 'base64'},  # type: ignore
+                            source={'data': item.base64, 'media_type': item.media_type, 'type': 'base64'},  # type: ignore
                             type='image',
                         )
                     else:
                         raise RuntimeError('Only images are supported for binary content')
                 elif isinstance(item, ImageUrl):
+                    download = downloads[item.url]
                     try:
-                        response = await cached_async_http_client().get(item.url)
-                        response.raise_for_status()
-                        yield ImageBlockParam(
-                            source={
-                                'data': io.BytesIO(response.content),
-                                'media_type': item.media_type,
-                                'type': 'base64',
-                            },
-                            type='image',
-                        )
+                        media_type = item.media_type
                     except ValueError:
-                        # Download the file if can't find the mime type.
-                        client = cached_async_http_client()
-                        response = await client.get(item.url, follow_redirects=True)
-                        response.raise_for_status()
-                        base64_encoded = base64.b64encode(response.content).decode('utf-8')
-                        if (mime_type := response.headers['Content-Type']) in (
-                            'image/jpeg',
-                            'image/png',
-                            'image/gif',
-                            'image/webp',
-                        ):
-                            yield ImageBlockParam(
-                                source={'data': base64_encoded, 'media_type': mime_type, 'type': 'base64'},
-                                type='image',
-                            )
-                        else:  # pragma: no cover
-                            raise RuntimeError(f'Unsupported image type: {mime_type}')
+                        # Use the downloaded file's mime type if it can't be inferred from the URL.
+                        media_type = download.media_type
+                        if media_type not in ('image/jpeg', 'image/png', 'image/gif', 'image/webp'):  # pragma: no cover
+                            raise RuntimeError(f'Unsupported image type: {media_type}')
+                    yield ImageBlockParam(
+                        source={
+                            'data': base64.b64encode(download.data).decode('utf-8'),
+                            'media_type': media_type,
+                            'type': 'base64',
+                        },
+                        type='image',
+                    )
                 else:
                     raise RuntimeError(f'Unsupported content type: {type(item)}')
 
@@ -387,6 +422,21 @@ class AnthropicModel(Model):
         }
 
 
+_CACHE_CONTROL: CacheControlEphemeralParam = {'type': 'ephemeral'}
+
+
+def _cache_message(message: MessageParam) -> MessageParam:
+    """Return a copy of a message with a cache breakpoint on its last content block.
+
+    Mapped messages are shared between requests by the message cache, so they're copied rather than modified.
+    """
+    content = message['content']
+    blocks: list[Any] = [TextBlockParam(type='text', text=content)] if isinstance(content, str) else list(content)
+    if blocks:
+        blocks[-1] = {**blocks[-1], 'cache_control': _CACHE_CONTROL}
+    return MessageParam(role=message['role'], content=blocks)
+
+
 def _map_usage(message: AnthropicMessage | RawMessageStreamEvent) -> usage.Usage:
     if isinstance(message, AnthropicMessage):
         response_usage = message.usage
@@ -408,11 +458,19 @@ def _map_usage(message: AnthropicMessage | RawMessageStreamEvent) -> usage.Usage
 
     request_tokens = getattr(response_usage, 'input_tokens', None)
 
+    # tokens written to or read from the prompt cache are counted separately from `input_tokens`
+    details: dict[str, int] = {}
+    if cache_creation_tokens := getattr(response_usage, 'cache_creation_input_tokens', None):
+        details['cache_creation_input_tokens'] = cache_creation_tokens
+    if cache_read_tokens := getattr(response_usage, 'cache_read_input_tokens', None):
+        details['cache_read_input_tokens'] = cache_read_tokens
+
     return usage.Usage(
         # Usage coming from the RawMessageDeltaEvent doesn't have input token data, hence this getattr
         request_tokens=request_tokens,
         response_tokens=response_usage.output_tokens,
         total_tokens=(request_tokens or 0) + response_usage.output_tokens,
+        details=details or None,
     )
 
 
@@ -426,7 +484,10 @@ class AnthropicStreamedResponse(StreamedResponse):
 
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
         current_block: ContentBlock | None = None
-        current_json: str = ''
+        # JSON deltas are forwarded as they arrive, unless the tool call started with arguments, in which case they
+        # can't be appended to those, so they're buffered and merged into the arguments once the block stops
+        buffered_json: str | None = None
+        received_json = False
 
         async for event in self._response:
             self._usage += _map_usage(event)
@@ -436,10 +497,13 @@ class AnthropicStreamedResponse(StreamedResponse):
                 if isinstance(current_block, TextBlock) and current_block.text:
                     yield self._parts_manager.handle_text_delta(vendor_part_id='content', content=current_block.text)
                 elif isinstance(current_block, ToolUseBlock):
+                    start_args = cast(dict[str, Any], current_block.input)
+                    buffered_json = '' if start_args else None
+                    received_json = False
                     maybe_event = self._parts_manager.handle_tool_call_delta(
                         vendor_part_id=current_block.id,
                         tool_name=current_block.name,
-                        args=cast(dict[str, Any], current_block.input),
+                        args=start_args or '',
                         tool_call_id=current_block.id,
                     )
                     if maybe_event is not None:
@@ -451,28 +515,40 @@ class AnthropicStreamedResponse(StreamedResponse):
                 elif (
                     current_block and event.delta.type == 'input_json_delta' and isinstance(current_block, ToolUseBlock)
                 ):
-                    # Try to parse the JSON immediately, otherwise cache the value for later. This handles
-                    # cases where the JSON is not currently valid but will be valid once we stream more tokens.
-                    try:
-                        parsed_args = json_loads(current_json + event.delta.partial_json)
-                        current_json = ''
-                    except JSONDecodeError:
-                        current_json += event.delta.partial_json
-                        continue
+                    if buffered_json is not None:
+                        buffered_json += event.delta.partial_json
+                    elif event.delta.partial_json:
+                        received_json = True
+                        maybe_event = self._parts_manager.handle_tool_call_delta(
+                            vendor_part_id=current_block.id,
+                            tool_name=None,
+                            args=event.delta.partial_json,
+                            tool_call_id=current_block.id,
+                        )
+                        if maybe_event is not None:
+                            yield maybe_event
 
-                    # For tool calls, we need to handle partial JSON updates
-                    maybe_event = self._parts_manager.handle_tool_call_delta(
-                        vendor_part_id=current_block.id,
-                        tool_name='',
-                        args=parsed_args,
-                        tool_call_id=current_block.id,
-                    )
+            elif isinstance(event, (RawContentBlockStopEvent, RawMessageStopEvent)):
+                if isinstance(current_block, ToolUseBlock):
+                    maybe_event = self._finish_tool_call(current_block, buffered_json, received_json)
                     if maybe_event is not None:
                         yield maybe_event
-
-            elif isinstance(event, (RawContentBlockStopEvent, RawMessageStopEvent)):
                 current_block = None
 
+    def _finish_tool_call(
+        self, block: ToolUseBlock, buffered_json: str | None, received_json: bool
+    ) -> ModelResponseStreamEvent | None:
+        if buffered_json:
+            args: str | dict[str, Any] = json_loads(buffered_json)
+        elif buffered_json is None and not received_json:
+            # tools without arguments may not get any JSON deltas
+            args = '{}'
+        else:
+            return None
+        return self._parts_manager.handle_tool_call_delta(
+            vendor_part_id=block.id, tool_name=None, args=args, tool_call_id=block.id
+        )
+
     @property
     def model_name(self) -> AnthropicModelName:
         """Get the model name of the response."""
@@ -0,0 +1,416 @@
+from __future__ import annotations as _annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pydantic
+import pydantic_core
+
+from .. import _utils
+from ..exceptions import UserError
+from ..messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    TextPart,
+    ToolCallPart,
+)
+from ..settings import ModelSettings
+from ..usage import Usage
+from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from .wrapper import WrapperModel
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(init=False)
+class CachedModel(WrapperModel):
+    """Model which caches the responses of the wrapped model.
+
+    Requests are keyed on a hash of the model name, messages, model settings and request parameters, ignoring
+    message timestamps, so repeating an identical request returns the cached response without calling the
+    wrapped model. This is useful for evals, tests and repeated prompts.
+
+    A cached response is returned with the [`Usage`][pydantic_ai.usage.Usage] of the original request, so runs behave
+    the same whether or not they hit the cache; use [`stats`][pydantic_ai.models.cached.CachedModel.stats] to see
+    how many requests were served from the cache.
+
+    Streamed requests share the cache with non-streamed requests, a cached response is replayed as a stream. A
+    streamed response is only cached if the stream is read to the end.
+    """
+
+    backend: CacheBackend
+    """Where responses are stored."""
+    ttl: float | None
+    """How long, in seconds, responses are cached for, or `None` to cache them until they're evicted."""
+    stats: CacheStats
+    """Statistics on how effective the cache has been."""
+
+    def __init__(
+        self,
+        wrapped: Model | KnownModelName,
+        backend: CacheBackend | None = None,
+        *,
+        ttl: float | None = None,
+    ):
+        """Initialize a cached model.
+
+        Args:
+            wrapped: The name or instance of the model to cache responses from.
+            backend: Where to store responses, defaults to a [`MemoryCacheBackend`][pydantic_ai.models.cached.MemoryCacheBackend].
+            ttl: How long, in seconds, responses are cached for, or `None` to cache them until they're evicted.
+        """
+        super().__init__(wrapped)
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[ModelResponse, Usage]:
+        key = self.cache_key(messages, model_settings, model_request_parameters)
+        entry = await self._get(key)
+        if entry is not None:
+            return entry.response, entry.usage
+
+        start = time.perf_counter()
+        response, usage = await super().request(messages, model_settings, model_request_parameters)
+        await self._set(key, _CacheEntry(response, usage, time.perf_counter() - start))
+        return response, usage
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        key = self.cache_key(messages, model_settings, model_request_parameters)
+        entry = await self._get(key)
+        if entry is not None:
+            yield CachedStreamedResponse(entry.response, entry.usage, self.model_name)
+            return
+
+        start = time.perf_counter()
+        async with super().request_stream(messages, model_settings, model_request_parameters) as response_stream:
+            recording_stream = _RecordingStreamedResponse(response_stream)
+            yield recording_stream
+        if recording_stream.complete:
+            entry = _CacheEntry(recording_stream.get(), recording_stream.usage(), time.perf_counter() - start)
+            await self._set(key, entry)
+
+    def cache_key(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> str:
+        """Build the key a request is cached under.
+
+        Raises:
+            UserError: If the model settings or request parameters hold values which can't be serialized.
+        """
+        data = {
+            'model_name': self.model_name,
+            'system': self.system,
+            'messages': _without_timestamps(ModelMessagesTypeAdapter.dump_python(messages, mode='json')),
+            'model_settings': model_settings,
+            'model_request_parameters': model_request_parameters,
+        }
+        try:
+            serialized = pydantic_core.to_json(data, fallback=_key_fallback)
+        except pydantic_core.PydanticSerializationError as e:
+            raise UserError(f'Unable to build a cache key for the request: {e}') from e
+        return hashlib.sha256(serialized).hexdigest()
+
+    async def _get(self, key: str) -> _CacheEntry | None:
+        value = await self.backend.get(key)
+        if value is None:
+            self.stats.misses += 1
+            return None
+        try:
+            entry = _cache_entry_ta.validate_json(value)
+        except pydantic.ValidationError:
+            # e.g. the value was written by a version of pydantic-ai with a different message format, it's treated as
+            # a miss so it's overwritten by the wrapped model's response
+            _logger.warning('Ignoring cached response for key %s which could not be decoded', key, exc_info=True)
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.stats.saved_latency += entry.duration
+        return entry
+
+    async def _set(self, key: str, entry: _CacheEntry) -> None:
+        await self.backend.set(key, _cache_entry_ta.dump_json(entry), self.ttl)
+
+
+@dataclass
+class CacheStats:
+    """Statistics on the requests made to a [`CachedModel`][pydantic_ai.models.cached.CachedModel]."""
+
+    hits: int = 0
+    """Number of requests served from the cache."""
+    misses: int = 0
+    """Number of requests sent to the wrapped model."""
+    saved_latency: float = 0.0
+    """Total time in seconds the original requests took for the responses served from the cache."""
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of requests served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _CacheEntry:
+    response: ModelResponse
+    usage: Usage
+    duration: float
+    """How long the original request took, in seconds."""
+
+    __pydantic_config__ = pydantic.ConfigDict(defer_build=True)
+
+
+_cache_entry_ta = pydantic.TypeAdapter(_CacheEntry)
+
+
+def _key_fallback(value: Any) -> Any:
+    """Serialize values in model settings which pydantic can't, e.g. an `httpx.Timeout` set as the `timeout`."""
+    if isinstance(value, httpx.Timeout):
+        return value.as_dict()
+    # `repr` isn't used as it can differ between processes, e.g. by including the object's address
+    raise TypeError(f'`{type(value).__name__}` values are not supported in cached requests')
+
+
+def _without_timestamps(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Remove timestamps from serialized messages and their parts, so they don't change the cache key.
+
+    Only the `timestamp` fields of messages and parts are removed, not keys of the same name in tool call arguments
+    or tool return content.
+    """
+    for message in messages:
+        message.pop('timestamp', None)
+        for part in message['parts']:
+            part.pop('timestamp', None)
+    return messages
+
+
+@dataclass
+class CachedStreamedResponse(StreamedResponse):
+    """Streamed response replaying a cached [`ModelResponse`][pydantic_ai.messages.ModelResponse]."""
+
+    _response: ModelResponse
+    _response_usage: Usage
+    _model_name: str
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        self._usage = self._response_usage
+        for index, part in enumerate(self._response.parts):
+            if isinstance(part, TextPart):
+                yield self._parts_manager.handle_text_delta(vendor_part_id=index, content=part.content)
+            elif isinstance(part, ToolCallPart):
+                yield self._parts_manager.handle_tool_call_part(
+                    vendor_part_id=index, tool_name=part.tool_name, args=part.args, tool_call_id=part.tool_call_id
+                )
+
+    @property
+    def model_name(self) -> str:
+        return self._response.model_name or self._model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._response.timestamp
+
+
+@dataclass
+class _RecordingStreamedResponse(StreamedResponse):
+    """Streamed response passing through the events of another, recording whether it was read to the end."""
+
+    _wrapped: StreamedResponse
+    complete: bool = field(default=False, init=False)
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for event in self._wrapped:
+            yield event
+        self.complete = True
+
+    def get(self) -> ModelResponse:
+        return self._wrapped.get()
+
+    def usage(self) -> Usage:
+        return self._wrapped.usage()
+
+    @property
+    def model_name(self) -> str:
+        return self._wrapped.model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._wrapped.timestamp
+
+
+class CacheBackend(ABC):
+    """Abstract storage for the responses cached by a [`CachedModel`][pydantic_ai.models.cached.CachedModel]."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get the value stored under `key`, or `None` if there isn't one or it has expired."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        """Store `value` under `key`, expiring after `ttl` seconds if `ttl` is not `None`."""
+        raise NotImplementedError()
+
+
+def _expires_at(ttl: float | None) -> float | None:
+    return None if ttl is None else time.time() + ttl
+
+
+def _expired(expires_at: float | None) -> bool:
+    return expires_at is not None and expires_at <= time.time()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Cache backend holding values in memory, evicting the least recently used values beyond `max_size`."""
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize an in-memory cache backend.
+
+        Args:
+            max_size: Maximum number of values to hold.
+        """
+        self.max_size = max_size
+        self._values: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if _expired(expires_at):
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        self._values[key] = (_expires_at(ttl), value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache backend storing values in a SQLite database, so they can be shared between processes and runs."""
+
+    def __init__(self, path: str | Path):
+        """Initialize a SQLite cache backend.
+
+        Args:
+            path: Path to the database file, it's created if it doesn't exist.
+        """
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return await _utils.run_in_executor(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        await _utils.run_in_executor(self._set, key, value, ttl)
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if _expired(expires_at):
+                with connection:
+                    connection.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            return value
+
+    def _set(self, key: str, value: bytes, ttl: float | None) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, value, _expires_at(ttl)),
+                )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+                )
+        return self._connection
+
+
+class DiskCacheBackend(CacheBackend):
+    """Cache backend storing each value in a file in a directory."""
+
+    def __init__(self, directory: str | Path):
+        """Initialize a disk cache backend.
+
+        Args:
+            directory: Directory to store values in, it's created if it doesn't exist.
+        """
+        self.directory = Path(directory)
+
+    async def get(self, key: str) -> bytes | None:
+        return await _utils.run_in_executor(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float | None) -> None:
+        await _utils.run_in_executor(self._set, key, value, ttl)
+
+    def _get(self, key: str) -> bytes | None:
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # the first line holds the expiry time, empty if the value doesn't expire
+        expires_at, _, value = data.partition(b'\n')
+        if _expired(float(expires_at) if expires_at else None):
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def _set(self, key: str, value: bytes, ttl: float | None) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        expires_at = _expires_at(ttl)
+        header = b'' if expires_at is None else repr(expires_at).encode()
+        # write to a temporary file then move it into place, so readers never see a partially written value
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + b'\n' + value)
+            os.replace(tmp_path, self.directory / key)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -1,21 +1,23 @@
 from __future__ import annotations as _annotations
 
-from collections.abc import Iterable
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from itertools import chain
-from typing import Literal, Union, cast
+from datetime import datetime, timezone
+from typing import Literal, NoReturn, Union, cast
 
 from cohere import TextAssistantMessageContentItem
 from httpx import AsyncClient as AsyncHTTPClient
 from typing_extensions import assert_never
 
-from .. import ModelHTTPError, result
+from .. import ModelHTTPError, UnexpectedModelBehavior, _utils, result
 from .._utils import guard_tool_call_id as _guard_tool_call_id
 from ..messages import (
     ModelMessage,
     ModelRequest,
     ModelResponse,
     ModelResponsePart,
+    ModelResponseStreamEvent,
     RetryPromptPart,
     SystemPromptPart,
     TextPart,
@@ -26,8 +28,11 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
+    StreamedResponse,
+    ToolMappingCache,
     check_allow_model_requests,
 )
 
@@ -37,7 +42,12 @@ try:
         AsyncClientV2,
         ChatMessageV2,
         ChatResponse,
+        ContentDeltaStreamedChatResponseV2,
+        MessageEndStreamedChatResponseV2,
+        StreamedChatResponseV2,
         SystemChatMessageV2,
+        ToolCallDeltaStreamedChatResponseV2,
+        ToolCallStartStreamedChatResponseV2,
         ToolCallV2,
         ToolCallV2Function,
         ToolChatMessageV2,
@@ -99,6 +109,8 @@ class CohereModel(Model):
 
     _model_name: CohereModelName = field(repr=False)
     _system: str | None = field(default='cohere', repr=False)
+    _message_cache: MessageMappingCache[list[ChatMessageV2]] = field(repr=False)
+    _tool_cache: ToolMappingCache[ToolV2] = field(repr=False)
 
     def __init__(
         self,
@@ -126,6 +138,8 @@ class CohereModel(Model):
             self.client = cohere_client
         else:
             self.client = AsyncClientV2(api_key=api_key, httpx_client=http_client)
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     async def request(
         self,
@@ -137,6 +151,19 @@ class CohereModel(Model):
         response = await self._chat(messages, cast(CohereModelSettings, model_settings or {}), model_request_parameters)
         return self._process_response(response), _map_usage(response)
 
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        check_allow_model_requests()
+        response = self._chat_stream(
+            messages, cast(CohereModelSettings, model_settings or {}), model_request_parameters
+        )
+        yield await self._process_streamed_response(response)
+
     @property
     def model_name(self) -> CohereModelName:
         """The model name."""
@@ -154,7 +181,7 @@ class CohereModel(Model):
         model_request_parameters: ModelRequestParameters,
     ) -> ChatResponse:
         tools = self._get_tools(model_request_parameters)
-        cohere_messages = list(chain(*(self._map_message(m) for m in messages)))
+        cohere_messages = self._map_messages(messages)
         try:
             return await self.client.chat(
                 model=self._model_name,
@@ -168,9 +195,32 @@ class CohereModel(Model):
                 frequency_penalty=model_settings.get('frequency_penalty', OMIT),
             )
         except ApiError as e:
-            if (status_code := e.status_code) and status_code >= 400:
-                raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
-            raise
+            self._raise_api_error(e)
+
+    def _chat_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: CohereModelSettings,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedChatResponseV2]:
+        tools = self._get_tools(model_request_parameters)
+        cohere_messages = self._map_messages(messages)
+        return self.client.chat_stream(
+            model=self._model_name,
+            messages=cohere_messages,
+            tools=tools or OMIT,
+            max_tokens=model_settings.get('max_tokens', OMIT),
+            temperature=model_settings.get('temperature', OMIT),
+            p=model_settings.get('top_p', OMIT),
+            seed=model_settings.get('seed', OMIT),
+            presence_penalty=model_settings.get('presence_penalty', OMIT),
+            frequency_penalty=model_settings.get('frequency_penalty', OMIT),
+        )
+
+    def _raise_api_error(self, e: ApiError) -> NoReturn:
+        if (status_code := e.status_code) and status_code >= 400:
+            raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
+        raise e
 
     def _process_response(self, response: ChatResponse) -> ModelResponse:
         """Process a non-streamed response, and prepare a message to return."""
@@ -191,6 +241,33 @@ class CohereModel(Model):
                 )
         return ModelResponse(parts=parts, model_name=self._model_name)
 
+    async def _process_streamed_response(self, response: AsyncIterator[StreamedChatResponseV2]) -> StreamedResponse:
+        """Process a streamed response, and prepare a streaming response to return."""
+        peekable_response = _utils.PeekableAsyncStream(response)
+        # the request is only sent when the stream is first iterated, so this is where HTTP errors are raised
+        try:
+            first_chunk = await peekable_response.peek()
+        except ApiError as e:
+            self._raise_api_error(e)
+        if isinstance(first_chunk, _utils.Unset):
+            raise UnexpectedModelBehavior('Streamed response ended without content or tool calls')
+
+        return CohereStreamedResponse(
+            _model_name=self._model_name,
+            _response=peekable_response,
+            _timestamp=datetime.now(tz=timezone.utc),
+        )
+
+    def _map_messages(self, messages: list[ModelMessage]) -> list[ChatMessageV2]:
+        """Map messages, reusing the mapping of any messages already sent in a previous request."""
+        cohere_messages: list[ChatMessageV2] = []
+        for m in messages:
+            mapped = self._message_cache.get(m)
+            if mapped is None:
+                mapped = self._message_cache.set(m, list(self._map_message(m)))
+            cohere_messages.extend(mapped)
+        return cohere_messages
+
     def _map_message(self, message: ModelMessage) -> Iterable[ChatMessageV2]:
         """Just maps a `pydantic_ai.Message` to a `cohere.ChatMessageV2`."""
         if isinstance(message, ModelRequest):
@@ -215,9 +292,9 @@ class CohereModel(Model):
             assert_never(message)
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> list[ToolV2]:
-        tools = [self._map_tool_definition(r) for r in model_request_parameters.function_tools]
+        tools = [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.function_tools]
         if model_request_parameters.result_tools:
-            tools += [self._map_tool_definition(r) for r in model_request_parameters.result_tools]
+            tools += [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.result_tools]
         return tools
 
     @staticmethod
@@ -271,8 +348,65 @@ class CohereModel(Model):
                 assert_never(part)
 
 
-def _map_usage(response: ChatResponse) -> result.Usage:
-    usage = response.usage
+@dataclass
+class CohereStreamedResponse(StreamedResponse):
+    """Implementation of `StreamedResponse` for Cohere models."""
+
+    _model_name: CohereModelName
+    _response: AsyncIterable[StreamedChatResponseV2]
+    _timestamp: datetime
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for chunk in self._response:
+            if isinstance(chunk, ContentDeltaStreamedChatResponseV2):
+                content = chunk.delta and chunk.delta.message and chunk.delta.message.content
+                if content is not None and content.text:
+                    yield self._parts_manager.handle_text_delta(vendor_part_id='content', content=content.text)
+
+            elif isinstance(chunk, ToolCallStartStreamedChatResponseV2):
+                tool_call = chunk.delta and chunk.delta.message and chunk.delta.message.tool_calls
+                if tool_call is not None:
+                    maybe_event = self._parts_manager.handle_tool_call_delta(
+                        vendor_part_id=chunk.index,
+                        tool_name=tool_call.function and tool_call.function.name,
+                        args=(tool_call.function and tool_call.function.arguments) or None,
+                        tool_call_id=tool_call.id,
+                    )
+                    if maybe_event is not None:
+                        yield maybe_event
+
+            elif isinstance(chunk, ToolCallDeltaStreamedChatResponseV2):
+                tool_call_delta = chunk.delta and chunk.delta.message and chunk.delta.message.tool_calls
+                arguments = tool_call_delta and tool_call_delta.function and tool_call_delta.function.arguments
+                if arguments:
+                    maybe_event = self._parts_manager.handle_tool_call_delta(
+                        vendor_part_id=chunk.index,
+                        tool_name=None,
+                        args=arguments,
+                        tool_call_id=None,
+                    )
+                    if maybe_event is not None:
+                        yield maybe_event
+
+            elif isinstance(chunk, MessageEndStreamedChatResponseV2):
+                self._usage += _map_usage(chunk)
+
+    @property
+    def model_name(self) -> CohereModelName:
+        """Get the model name of the response."""
+        return self._model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        """Get the timestamp of the response."""
+        return self._timestamp
+
+
+def _map_usage(response: ChatResponse | MessageEndStreamedChatResponseV2) -> result.Usage:
+    if isinstance(response, ChatResponse):
+        usage = response.usage
+    else:
+        usage = response.delta and response.delta.usage
     if usage is None:
         return result.Usage()
     else:
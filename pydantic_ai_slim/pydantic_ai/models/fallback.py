@@ -1,36 +1,73 @@
 from __future__ import annotations as _annotations
 
-from collections.abc import AsyncIterator
-from contextlib import AsyncExitStack, asynccontextmanager
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypeVar
 
-from ..exceptions import FallbackExceptionGroup, ModelHTTPError
+from ..exceptions import FallbackExceptionGroup, ModelHTTPError, UserError
 from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse, infer_model
+from .wrapper import peek_stream
 
 if TYPE_CHECKING:
     from ..messages import ModelMessage, ModelResponse
     from ..settings import ModelSettings
     from ..usage import Usage
 
+T = TypeVar('T')
+
+_LATENCY_WINDOW = 100
+"""Number of recent request latencies kept to learn the hedging delay from."""
+_MIN_LATENCY_SAMPLES = 10
+"""Number of latencies needed before the hedging delay is learned rather than taken from `hedge_after`."""
+_HEALTH_SMOOTHING = 0.1
+"""Weight of the latest request in the moving averages of a model's latency and error rate."""
+
+CircuitState = Literal['closed', 'open', 'half-open']
+"""State of a [`CircuitBreaker`][pydantic_ai.models.fallback.CircuitBreaker]."""
+
 
 @dataclass(init=False)
 class FallbackModel(Model):
     """A model that uses one or more fallback models upon failure.
 
+    Optionally, requests can also be hedged: if a model hasn't responded after a delay, the same request is sent to
+    the next model as well, and whichever responds first is used while the others are cancelled.
+
+    The health of each model is tracked by a [`CircuitBreaker`][pydantic_ai.models.fallback.CircuitBreaker] in
+    [`circuit_breakers`][pydantic_ai.models.fallback.FallbackModel.circuit_breakers]. With
+    `circuit_breaker_threshold` set, a model which keeps failing is skipped until a cooldown has passed, and with
+    `order_by_health` set, models are tried in order of their observed latency and error rate.
+
     Apart from `__init__`, all methods are private or match those of the base class.
     """
 
     models: list[Model]
+    circuit_breakers: list[CircuitBreaker]
+    """The circuit breaker tracking the health of each model, in the same order as `models`."""
+    order_by_health: bool
 
     _model_name: str = field(repr=False)
     _fallback_on: Callable[[Exception], bool]
+    _hedge_after: float | None = field(repr=False)
+    _hedge_percentile: float | None = field(repr=False)
+    _request_latencies: deque[float] = field(repr=False)
+    _stream_latencies: deque[float] = field(repr=False)
 
     def __init__(
         self,
         default_model: Model | KnownModelName,
         *fallback_models: Model | KnownModelName,
         fallback_on: Callable[[Exception], bool] | tuple[type[Exception], ...] = (ModelHTTPError,),
+        hedge_after: float | None = None,
+        hedge_percentile: float | None = None,
+        circuit_breaker_threshold: int | None = None,
+        circuit_breaker_cooldown: float = 30.0,
+        order_by_health: bool = False,
+        on_circuit_state_change: Callable[[CircuitBreaker, CircuitState, CircuitState], None] | None = None,
     ):
         """Initialize a fallback model instance.
 
@@ -38,6 +75,22 @@ class FallbackModel(Model):
             default_model: The name or instance of the default model to use.
             fallback_models: The names or instances of the fallback models to use upon failure.
             fallback_on: A callable or tuple of exceptions that should trigger a fallback.
+            hedge_after: Enables hedged requests: if a model hasn't responded after this many seconds, the request is
+                also sent to the next model. For streamed requests this is the time until the first event.
+            hedge_percentile: Enables hedged requests with a delay learned from recent requests: the request is also
+                sent to the next model once it's taken longer than this percentile, between 0 and 1, of the latency
+                of the first model tried in recent requests. Streamed and non-streamed requests are tracked
+                separately, using the time until the first event for streamed requests. `hedge_after` is used
+                until enough requests have been made, if it's set.
+            circuit_breaker_threshold: Enables circuit breakers: after this many consecutive failures matching
+                `fallback_on`, a model is skipped until `circuit_breaker_cooldown` has passed.
+            circuit_breaker_cooldown: How long in seconds a model is skipped for once its circuit breaker opens,
+                after which a single request is let through to check whether it has recovered.
+            order_by_health: Whether to try models in order of their expected latency, based on the observed
+                latency and error rate of recent requests, rather than the order they were given in. Models which
+                haven't been used yet come after the others, in the order they were given in.
+            on_circuit_state_change: Function called with the circuit breaker, its old state and its new state
+                whenever a circuit breaker changes state, e.g. for logging or monitoring.
         """
         self.models = [infer_model(default_model), *[infer_model(m) for m in fallback_models]]
         self._model_name = f'FallBackModel[{", ".join(model.model_name for model in self.models)}]'
@@ -47,6 +100,24 @@ class FallbackModel(Model):
         else:
             self._fallback_on = fallback_on
 
+        if hedge_percentile is not None and not 0 < hedge_percentile < 1:
+            raise UserError('`hedge_percentile` must be between 0 and 1')
+        self._hedge_after = hedge_after
+        self._hedge_percentile = hedge_percentile
+        self._request_latencies = deque(maxlen=_LATENCY_WINDOW)
+        self._stream_latencies = deque(maxlen=_LATENCY_WINDOW)
+
+        self.circuit_breakers = [
+            CircuitBreaker(
+                model,
+                failure_threshold=circuit_breaker_threshold,
+                cooldown=circuit_breaker_cooldown,
+                on_state_change=on_circuit_state_change,
+            )
+            for model in self.models
+        ]
+        self.order_by_health = order_by_health
+
     async def request(
         self,
         messages: list[ModelMessage],
@@ -57,16 +128,38 @@ class FallbackModel(Model):
 
         In case of failure, raise a FallbackExceptionGroup with all exceptions.
         """
+        start = time.perf_counter()
+        hedge_delay = self._hedge_delay(self._request_latencies)
+        if hedge_delay is not None:
+
+            async def tracked_request(breaker: CircuitBreaker) -> tuple[ModelResponse, Usage]:
+                with breaker.track(self._fallback_on):
+                    return await breaker.model.request(messages, model_settings, model_request_parameters)
+
+            def start_request(
+                breaker: CircuitBreaker,
+            ) -> tuple[asyncio.Future[tuple[ModelResponse, Usage]], asyncio.Task[Any]]:
+                task = asyncio.create_task(tracked_request(breaker))
+                return task, task
+
+            result, _ = await self._hedged(start_request, hedge_delay, self._request_latencies)
+            return result
+
         exceptions: list[Exception] = []
 
-        for model in self.models:
+        for breaker in self._breakers_to_try():
             try:
-                return await model.request(messages, model_settings, model_request_parameters)
+                with breaker.track(self._fallback_on):
+                    result = await breaker.model.request(messages, model_settings, model_request_parameters)
             except Exception as exc:
                 if self._fallback_on(exc):
                     exceptions.append(exc)
                     continue
                 raise exc
+            if not exceptions:
+                # only the latency of the first model tried is used to learn the hedge delay
+                self._request_latencies.append(time.perf_counter() - start)
+            return result
 
         raise FallbackExceptionGroup('All models from FallbackModel failed', exceptions)
 
@@ -78,24 +171,158 @@ class FallbackModel(Model):
         model_request_parameters: ModelRequestParameters,
     ) -> AsyncIterator[StreamedResponse]:
         """Try each model in sequence until one succeeds."""
+        start = time.perf_counter()
+        hedge_delay = self._hedge_delay(self._stream_latencies)
+        if hedge_delay is not None:
+            async with self._hedged_stream(messages, model_settings, model_request_parameters, hedge_delay) as response:
+                yield response
+            return
+
         exceptions: list[Exception] = []
 
-        for model in self.models:
+        for breaker in self._breakers_to_try():
             async with AsyncExitStack() as stack:
                 try:
-                    response = await stack.enter_async_context(
-                        model.request_stream(messages, model_settings, model_request_parameters)
-                    )
+                    with breaker.track(self._fallback_on):
+                        response = await stack.enter_async_context(
+                            breaker.model.request_stream(messages, model_settings, model_request_parameters)
+                        )
+                        if self._hedge_percentile is not None:
+                            # learn the time until the first event, as used to hedge streamed requests
+                            response = await peek_stream(response)
                 except Exception as exc:
                     if self._fallback_on(exc):
                         exceptions.append(exc)
                         continue
                     raise exc
+                if self._hedge_percentile is not None and not exceptions:
+                    self._stream_latencies.append(time.perf_counter() - start)
                 yield response
                 return
 
         raise FallbackExceptionGroup('All models from FallbackModel failed', exceptions)
 
+    @asynccontextmanager
+    async def _hedged_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        hedge_delay: float,
+    ) -> AsyncIterator[StreamedResponse]:
+        """Hedge a streamed request on the time until the first event.
+
+        Each stream is opened in its own task, so the stream's context is entered and exited in the same task
+        whether it wins or is cancelled.
+        """
+        release = asyncio.Event()
+
+        async def open_stream(breaker: CircuitBreaker, ready: asyncio.Future[StreamedResponse]) -> None:
+            try:
+                async with AsyncExitStack() as stack:
+                    with breaker.track(self._fallback_on):
+                        response = await stack.enter_async_context(
+                            breaker.model.request_stream(messages, model_settings, model_request_parameters)
+                        )
+                        response = await peek_stream(response)
+                    ready.set_result(response)
+                    await release.wait()
+            except Exception as exc:
+                if ready.done():
+                    raise
+                ready.set_exception(exc)
+
+        def start_stream(breaker: CircuitBreaker) -> tuple[asyncio.Future[StreamedResponse], asyncio.Task[Any]]:
+            ready = asyncio.get_running_loop().create_future()
+            return ready, asyncio.create_task(open_stream(breaker, ready))
+
+        response, task = await self._hedged(start_stream, hedge_delay, self._stream_latencies)
+        try:
+            yield response
+        finally:
+            release.set()
+            await task
+
+    async def _hedged(
+        self,
+        start: Callable[[CircuitBreaker], tuple[asyncio.Future[T], asyncio.Task[Any]]],
+        hedge_delay: float,
+        latencies: deque[float],
+    ) -> tuple[T, asyncio.Task[Any]]:
+        """Race the models, starting the next one each time `hedge_delay` passes without a result or a model fails.
+
+        The latency of the first model is added to `latencies`, unless it fails. If another model wins the race,
+        the time the first model had taken so far is added. That's less than its actual latency, but at least
+        `hedge_delay`, so it's still above the percentile the hedge delay is learned from.
+
+        Returns:
+            The first successful result and the task that produced it, the other tasks are cancelled.
+        """
+        exceptions: list[Exception] = []
+        attempts: dict[asyncio.Future[T], asyncio.Task[Any]] = {}
+        breakers = iter(self._breakers_to_try())
+        start_time = time.perf_counter()
+
+        def start_next() -> bool:
+            for breaker in breakers:
+                future, task = start(breaker)
+                attempts[future] = task
+                return True
+            return False
+
+        more_models = start_next()
+        first_attempt = next(iter(attempts), None)
+        try:
+            while attempts:
+                done, _ = await asyncio.wait(
+                    attempts, timeout=hedge_delay if more_models else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    more_models = start_next()
+                    continue
+
+                failed = False
+                for future in done:
+                    task = attempts.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        if future is first_attempt or first_attempt in attempts:
+                            latencies.append(time.perf_counter() - start_time)
+                        return future.result(), task
+                    elif isinstance(exc, Exception) and self._fallback_on(exc):
+                        exceptions.append(exc)
+                        failed = True
+                    else:
+                        raise exc
+                if failed and more_models:
+                    more_models = start_next()
+        finally:
+            for future, task in attempts.items():
+                if future.done() and not future.cancelled():
+                    # mark the exception as retrieved, the attempt lost the race so its outcome doesn't matter
+                    future.exception()
+                task.cancel()
+            await asyncio.gather(*attempts.values(), return_exceptions=True)
+
+        raise FallbackExceptionGroup('All models from FallbackModel failed', exceptions)
+
+    def _breakers_to_try(self) -> list[CircuitBreaker]:
+        """Get the circuit breakers of the models to try for a request, in the order to try them.
+
+        Models whose circuit breaker is open are skipped, unless every model's is, in which case they're all tried.
+        """
+        breakers = [breaker for breaker in self.circuit_breakers if breaker.available()] or self.circuit_breakers
+        if self.order_by_health:
+            breakers = sorted(breakers, key=lambda breaker: breaker.expected_latency())
+        return breakers
+
+    def _hedge_delay(self, latencies: deque[float]) -> float | None:
+        """Get how long to wait for a model before also trying the next one, `None` if hedging is disabled."""
+        if self._hedge_percentile is not None and len(latencies) >= _MIN_LATENCY_SAMPLES:
+            sorted_latencies = sorted(latencies)
+            return sorted_latencies[min(int(self._hedge_percentile * len(sorted_latencies)), len(sorted_latencies) - 1)]
+        return self._hedge_after
+
     @property
     def model_name(self) -> str:
         """The model name."""
@@ -114,3 +341,97 @@ def _default_fallback_condition_factory(exceptions: tuple[type[Exception], ...])
         return isinstance(exception, exceptions)
 
     return fallback_condition
+
+
+@dataclass
+class CircuitBreaker:
+    """Tracks the health of one of the models in a [`FallbackModel`][pydantic_ai.models.fallback.FallbackModel].
+
+    The breaker starts closed, letting requests through. Once `failure_threshold` consecutive requests fail, it opens
+    and the model is skipped. After `cooldown` seconds it becomes half-open and lets a single request through: if it
+    succeeds the breaker closes again, otherwise it opens for another `cooldown`.
+
+    Only failures matching the `FallbackModel`'s `fallback_on` condition count.
+    """
+
+    model: Model
+    """The model whose health is tracked."""
+    failure_threshold: int | None
+    """Number of consecutive failures which open the breaker, `None` to never open it."""
+    cooldown: float
+    """How long in seconds the breaker stays open before letting a request through."""
+    on_state_change: Callable[[CircuitBreaker, CircuitState, CircuitState], None] | None = field(
+        default=None, repr=False
+    )
+    """Function called with the breaker, its old state and its new state when the state changes."""
+    state: CircuitState = 'closed'
+    """The current state of the breaker."""
+    consecutive_failures: int = 0
+    """Number of requests which have failed since the last successful request."""
+    error_rate: float = 0.0
+    """Exponential moving average of the fraction of requests which failed."""
+    latency: float | None = None
+    """Exponential moving average of the latency of successful requests in seconds, `None` if there hasn't been one."""
+    _opened_at: float = field(default=0.0, repr=False)
+    _trial_in_progress: bool = field(default=False, repr=False)
+
+    def available(self) -> bool:
+        """Whether a request can be sent to the model now."""
+        if self.state == 'closed':
+            return True
+        elif self.state == 'open':
+            return time.monotonic() - self._opened_at >= self.cooldown
+        else:
+            return not self._trial_in_progress
+
+    def expected_latency(self) -> float:
+        """Estimate the time until a successful response, from the model's latency and error rate."""
+        if self.latency is None:
+            return float('inf')
+        return self.latency / max(1 - self.error_rate, 0.01)
+
+    @contextmanager
+    def track(self, fallback_on: Callable[[Exception], bool]) -> Iterator[None]:
+        """Record the outcome of a request to the model made inside the context."""
+        if self.state == 'open' and self.available():
+            self._set_state('half-open')
+        trial = self.state == 'half-open'
+        if trial:
+            self._trial_in_progress = True
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            if fallback_on(exc):
+                self._record_failure()
+            raise
+        else:
+            self._record_success(time.perf_counter() - start)
+        finally:
+            if trial:
+                self._trial_in_progress = False
+
+    def _record_success(self, latency: float) -> None:
+        self.consecutive_failures = 0
+        self.error_rate *= 1 - _HEALTH_SMOOTHING
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += _HEALTH_SMOOTHING * (latency - self.latency)
+        if self.state != 'closed':
+            self._set_state('closed')
+
+    def _record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self.error_rate += _HEALTH_SMOOTHING * (1 - self.error_rate)
+        if self.state == 'half-open' or (
+            self.failure_threshold is not None and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            if self.state != 'open':
+                self._set_state('open')
+
+    def _set_state(self, state: CircuitState) -> None:
+        old_state, self.state = self.state, state
+        if self.on_state_change is not None:
+            self.on_state_change(self, old_state, state)
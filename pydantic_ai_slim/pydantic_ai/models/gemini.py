@@ -35,12 +35,17 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    DownloadedMedia,
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
+    ToolMappingCache,
     cached_async_http_client,
+    cached_media_downloads,
     check_allow_model_requests,
     get_user_agent,
+    user_prompt_urls,
 )
 
 LatestGeminiModelNames = Literal[
@@ -88,6 +93,8 @@ class GeminiModel(Model):
     _auth: AuthProtocol | None = field(repr=False)
     _url: str | None = field(repr=False)
     _system: str | None = field(default='google-gla', repr=False)
+    _message_cache: MessageMappingCache[tuple[list[_GeminiTextPart], _GeminiContent | None]] = field(repr=False)
+    _tool_cache: ToolMappingCache[_GeminiFunction] = field(repr=False)
 
     def __init__(
         self,
@@ -114,9 +121,11 @@ class GeminiModel(Model):
                 api_key = env_api_key
             else:
                 raise UserError('API key must be provided or set in the GEMINI_API_KEY environment variable')
-        self.http_client = http_client or cached_async_http_client()
+        self.http_client = http_client or cached_async_http_client(provider='google-gla')
         self._auth = ApiKeyAuth(api_key)
         self._url = url_template.format(model=model_name)
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     @property
     def auth(self) -> AuthProtocol:
@@ -165,9 +174,11 @@ class GeminiModel(Model):
         return self._system
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> _GeminiTools | None:
-        tools = [_function_from_abstract_tool(t) for t in model_request_parameters.function_tools]
+        tools = [self._tool_cache.map(t, _function_from_abstract_tool) for t in model_request_parameters.function_tools]
         if model_request_parameters.result_tools:
-            tools += [_function_from_abstract_tool(t) for t in model_request_parameters.result_tools]
+            tools += [
+                self._tool_cache.map(t, _function_from_abstract_tool) for t in model_request_parameters.result_tools
+            ]
         return _GeminiTools(function_declarations=tools) if tools else None
 
     def _get_tool_config(
@@ -237,7 +248,9 @@ class GeminiModel(Model):
             if (status_code := r.status_code) != 200:
                 await r.aread()
                 if status_code >= 400:
-                    raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=r.text)
+                    raise ModelHTTPError(
+                        status_code=status_code, model_name=self.model_name, body=r.text, headers=dict(r.headers)
+                    )
                 raise UnexpectedModelBehavior(f'Unexpected response from gemini {status_code}', r.text)
             yield r
 
@@ -255,63 +268,79 @@ class GeminiModel(Model):
     async def _process_streamed_response(self, http_response: HTTPResponse) -> StreamedResponse:
         """Process a streamed response, and prepare a streaming response to return."""
         aiter_bytes = http_response.aiter_bytes()
-        start_response: _GeminiResponse | None = None
-        content = bytearray()
+        parser = _GeminiStreamParser()
+        responses: list[_GeminiResponse] = []
 
         async for chunk in aiter_bytes:
-            content.extend(chunk)
-            responses = _gemini_streamed_response_ta.validate_json(
-                _ensure_decodeable(content),
-                experimental_allow_partial='trailing-strings',
-            )
-            if responses:
-                last = responses[-1]
-                if last['candidates'] and last['candidates'][0].get('content', {}).get('parts'):
-                    start_response = last
-                    break
-
-        if start_response is None:
+            new_responses = parser.feed(chunk)
+            responses.extend(new_responses)
+            if any(r['candidates'] and r['candidates'][0].get('content', {}).get('parts') for r in new_responses):
+                break
+        else:
             raise UnexpectedModelBehavior('Streamed response ended without content or tool calls')
 
-        return GeminiStreamedResponse(_model_name=self._model_name, _content=content, _stream=aiter_bytes)
+        return GeminiStreamedResponse(
+            _model_name=self._model_name, _responses=responses, _parser=parser, _stream=aiter_bytes
+        )
 
-    @classmethod
     async def _message_to_gemini_content(
-        cls, messages: list[ModelMessage]
+        self, messages: list[ModelMessage]
     ) -> tuple[list[_GeminiTextPart], list[_GeminiContent]]:
         sys_prompt_parts: list[_GeminiTextPart] = []
         contents: list[_GeminiContent] = []
-        for m in messages:
-            if isinstance(m, ModelRequest):
-                message_parts: list[_GeminiPartUnion] = []
-
-                for part in m.parts:
-                    if isinstance(part, SystemPromptPart):
-                        sys_prompt_parts.append(_GeminiTextPart(text=part.content))
-                    elif isinstance(part, UserPromptPart):
-                        message_parts.extend(await cls._map_user_prompt(part))
-                    elif isinstance(part, ToolReturnPart):
-                        message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            message_parts.append(_GeminiTextPart(text=part.model_response()))
-                        else:
-                            response = {'call_error': part.model_response()}
-                            message_parts.append(_response_part_from_response(part.tool_name, response))
+        # reuse the mapping of any messages already sent in a previous request
+        mapped_messages = [self._message_cache.get(m) for m in messages]
+        # files in all the messages to map whose mime type can't be inferred from the URL are downloaded concurrently
+        # up front, rather than one prompt at a time
+        unmapped = [m for m, mapped in zip(messages, mapped_messages) if mapped is None]
+        downloads = await cached_media_downloads().get_many(
+            [item.url for item in user_prompt_urls(unmapped) if _unknown_mime(item)]
+        )
+        for m, mapped in zip(messages, mapped_messages):
+            if mapped is None:
+                mapped = self._message_cache.set(m, await self._map_message(m, downloads))
+            message_sys_prompt_parts, content = mapped
+            sys_prompt_parts.extend(message_sys_prompt_parts)
+            if content is not None:
+                contents.append(content)
+
+        return sys_prompt_parts, contents
+
+    @classmethod
+    async def _map_message(
+        cls, m: ModelMessage, downloads: dict[str, DownloadedMedia]
+    ) -> tuple[list[_GeminiTextPart], _GeminiContent | None]:
+        sys_prompt_parts: list[_GeminiTextPart] = []
+        if isinstance(m, ModelRequest):
+            message_parts: list[_GeminiPartUnion] = []
+
+            for part in m.parts:
+                if isinstance(part, SystemPromptPart):
+                    sys_prompt_parts.append(_GeminiTextPart(text=part.content))
+                elif isinstance(part, UserPromptPart):
+                    message_parts.extend(await cls._map_user_prompt(part, downloads))
+                elif isinstance(part, ToolReturnPart):
+                    message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        message_parts.append(_GeminiTextPart(text=part.model_response()))
                     else:
-                        assert_never(part)
+                        response = {'call_error': part.model_response()}
+                        message_parts.append(_response_part_from_response(part.tool_name, response))
+                else:
+                    assert_never(part)
 
-                if message_parts:
-                    contents.append(_GeminiContent(role='user', parts=message_parts))
-            elif isinstance(m, ModelResponse):
-                contents.append(_content_model_response(m))
+            if message_parts:
+                return sys_prompt_parts, _GeminiContent(role='user', parts=message_parts)
             else:
-                assert_never(m)
-
-        return sys_prompt_parts, contents
+                return sys_prompt_parts, None
+        elif isinstance(m, ModelResponse):
+            return sys_prompt_parts, _content_model_response(m)
+        else:
+            assert_never(m)
 
     @staticmethod
-    async def _map_user_prompt(part: UserPromptPart) -> list[_GeminiPartUnion]:
+    async def _map_user_prompt(part: UserPromptPart, downloads: dict[str, DownloadedMedia]) -> list[_GeminiPartUnion]:
         if isinstance(part.content, str):
             return [{'text': part.content}]
         else:
@@ -320,24 +349,19 @@ class GeminiModel(Model):
                 if isinstance(item, str):
                     content.append({'text': item})
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
                     content.append(
-                        _GeminiInlineDataPart(inline_data={'data': base64_encoded, 'mime_type': item.media_type})
+                        _GeminiInlineDataPart(inline_data={'data': item.base64, 'mime_type': item.media_type})
                     )
                 elif isinstance(item, (AudioUrl, ImageUrl)):
-                    try:
+                    if (download := downloads.get(item.url)) is None:
                         content.append(
                             _GeminiFileDataPart(file_data={'file_uri': item.url, 'mime_type': item.media_type})
                         )
-                    except ValueError:
-                        # Download the file if can't find the mime type.
-                        client = cached_async_http_client()
-                        response = await client.get(item.url, follow_redirects=True)
-                        response.raise_for_status()
-                        base64_encoded = base64.b64encode(response.content).decode('utf-8')
+                    else:
+                        base64_encoded = base64.b64encode(download.data).decode('utf-8')
                         content.append(
                             _GeminiInlineDataPart(
-                                inline_data={'data': base64_encoded, 'mime_type': response.headers['Content-Type']}
+                                inline_data={'data': base64_encoded, 'mime_type': download.media_type}
                             )
                         )
                 else:
@@ -345,6 +369,15 @@ class GeminiModel(Model):
         return content
 
 
+def _unknown_mime(item: AudioUrl | ImageUrl) -> bool:
+    try:
+        item.media_type
+    except ValueError:
+        return True
+    else:
+        return False
+
+
 class AuthProtocol(Protocol):
     """Abstract definition for Gemini authentication."""
 
@@ -367,7 +400,8 @@ class GeminiStreamedResponse(StreamedResponse):
     """Implementation of `StreamedResponse` for the Gemini model."""
 
     _model_name: GeminiModelName
-    _content: bytearray
+    _responses: list[_GeminiResponse]
+    _parser: _GeminiStreamParser
     _stream: AsyncIterator[bytes]
     _timestamp: datetime = field(default_factory=_utils.now_utc, init=False)
 
@@ -403,33 +437,17 @@ class GeminiStreamedResponse(StreamedResponse):
         # This method exists to ensure we only yield completed items, so we don't need to worry about
         # partial gemini responses, which would make everything more complicated
 
-        gemini_responses: list[_GeminiResponse] = []
-        current_gemini_response_index = 0
-        # Right now, there are some circumstances where we will have information that could be yielded sooner than it is
-        # But changing that would make things a lot more complicated.
-        async for chunk in self._stream:
-            self._content.extend(chunk)
-
-            gemini_responses = _gemini_streamed_response_ta.validate_json(
-                _ensure_decodeable(self._content),
-                experimental_allow_partial='trailing-strings',
-            )
+        # first yield any responses which were already parsed while waiting for the start of the response
+        for r in self._responses:
+            self._usage += _metadata_as_usage(r)
+            yield r
+        self._responses = []
 
-            # The idea: yield only up to the latest response, which might still be partial.
-            # Note that if the latest response is complete, we could yield it immediately, but there's not a good
-            # allow_partial API to determine if the last item in the list is complete.
-            responses_to_yield = gemini_responses[:-1]
-            for r in responses_to_yield[current_gemini_response_index:]:
-                current_gemini_response_index += 1
+        async for chunk in self._stream:
+            for r in self._parser.feed(chunk):
                 self._usage += _metadata_as_usage(r)
                 yield r
 
-        # Now yield the final response, which should be complete
-        if gemini_responses:
-            r = gemini_responses[-1]
-            self._usage += _metadata_as_usage(r)
-            yield r
-
     @property
     def model_name(self) -> GeminiModelName:
         """Get the model name of the response."""
@@ -845,17 +863,76 @@ class _GeminiJsonSchema:
             self._simplify(items_schema, refs_stack)
 
 
-def _ensure_decodeable(content: bytearray) -> bytearray:
-    """Trim any invalid unicode point bytes off the end of a bytearray.
+_STRUCTURAL_BYTES = re.compile(rb'["\[\]{}]')
+_STRING_SPECIAL_BYTES = re.compile(rb'["\\]')
 
-    This is necessary before attempting to parse streaming JSON bytes.
 
-    This is a temporary workaround until https://github.com/pydantic/pydantic-core/issues/1633 is resolved
+class _GeminiStreamParser:
+    """Incrementally parses the JSON array returned by `streamGenerateContent` into `_GeminiResponse`s.
+
+    Only the bytes received since the last call to `feed` are scanned, and each response is validated once, as soon
+    as its closing brace arrives, so the cost of each chunk is proportional to the size of the chunk rather than to
+    the size of the whole response so far.
+
+    Since UTF-8 continuation bytes never look like JSON punctuation, scanning bytes is safe even when a chunk ends in
+    the middle of a multi-byte character.
     """
-    while True:
-        try:
-            content.decode()
-        except UnicodeDecodeError:
-            content = content[:-1]  # this will definitely succeed before we run out of bytes
-        else:
-            return content
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: bytes) -> list[_GeminiResponse]:
+        """Add a chunk of the streamed body, and return the responses completed by it."""
+        buffer = self._buffer
+        buffer.extend(chunk)
+        responses: list[_GeminiResponse] = []
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL_BYTES.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                index = match.start()
+                if buffer[index] == ord('\\'):
+                    if index + 1 == len(buffer):
+                        # the escaped character hasn't arrived yet, scan the backslash again next time
+                        pos = index
+                        break
+                    pos = index + 2
+                else:
+                    self._in_string = False
+                    pos = index + 1
+            else:
+                match = _STRUCTURAL_BYTES.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                index = match.start()
+                pos = index + 1
+                char = buffer[index]
+                if char == ord('"'):
+                    self._in_string = True
+                elif char in b'[{':
+                    self._depth += 1
+                    # depth 1 is the top level array, so depth 2 is the start of a response
+                    if self._depth == 2:
+                        self._item_start = index
+                else:
+                    self._depth -= 1
+                    if self._depth == 1:
+                        assert self._item_start is not None, 'a response should have started'
+                        responses.append(_gemini_response_ta.validate_json(buffer[self._item_start : pos]))
+                        self._item_start = None
+
+        # drop bytes which are no longer needed, so the buffer only ever holds the current response
+        keep_from = pos if self._item_start is None else self._item_start
+        del buffer[:keep_from]
+        self._pos = pos - keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return responses
@@ -1,11 +1,9 @@
 from __future__ import annotations as _annotations
 
-import base64
 from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from itertools import chain
 from typing import Literal, Union, cast, overload
 
 from httpx import AsyncClient as AsyncHTTPClient
@@ -31,9 +29,11 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
+    ToolMappingCache,
     cached_async_http_client,
     check_allow_model_requests,
 )
@@ -92,6 +92,8 @@ class GroqModel(Model):
 
     _model_name: GroqModelName = field(repr=False)
     _system: str | None = field(default='groq', repr=False)
+    _message_cache: MessageMappingCache[list[chat.ChatCompletionMessageParam]] = field(repr=False)
+    _tool_cache: ToolMappingCache[chat.ChatCompletionToolParam] = field(repr=False)
 
     def __init__(
         self,
@@ -121,7 +123,9 @@ class GroqModel(Model):
         elif http_client is not None:
             self.client = AsyncGroq(api_key=api_key, http_client=http_client)
         else:
-            self.client = AsyncGroq(api_key=api_key, http_client=cached_async_http_client())
+            self.client = AsyncGroq(api_key=api_key, http_client=cached_async_http_client(provider='groq'))
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     async def request(
         self,
@@ -195,7 +199,7 @@ class GroqModel(Model):
         else:
             tool_choice = 'auto'
 
-        groq_messages = list(chain(*(self._map_message(m) for m in messages)))
+        groq_messages = self._map_messages(messages)
 
         try:
             return await self.client.chat.completions.create(
@@ -217,7 +221,9 @@ class GroqModel(Model):
             )
         except APIStatusError as e:
             if (status_code := e.status_code) >= 400:
-                raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
+                raise ModelHTTPError(
+                    status_code=status_code, model_name=self.model_name, body=e.body, headers=dict(e.response.headers)
+                ) from e
             raise
 
     def _process_response(self, response: chat.ChatCompletion) -> ModelResponse:
@@ -246,11 +252,21 @@ class GroqModel(Model):
         )
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> list[chat.ChatCompletionToolParam]:
-        tools = [self._map_tool_definition(r) for r in model_request_parameters.function_tools]
+        tools = [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.function_tools]
         if model_request_parameters.result_tools:
-            tools += [self._map_tool_definition(r) for r in model_request_parameters.result_tools]
+            tools += [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.result_tools]
         return tools
 
+    def _map_messages(self, messages: list[ModelMessage]) -> list[chat.ChatCompletionMessageParam]:
+        """Map messages, reusing the mapping of any messages already sent in a previous request."""
+        groq_messages: list[chat.ChatCompletionMessageParam] = []
+        for m in messages:
+            mapped = self._message_cache.get(m)
+            if mapped is None:
+                mapped = self._message_cache.set(m, list(self._map_message(m)))
+            groq_messages.extend(mapped)
+        return groq_messages
+
     def _map_message(self, message: ModelMessage) -> Iterable[chat.ChatCompletionMessageParam]:
         """Just maps a `pydantic_ai.Message` to a `groq.types.ChatCompletionMessageParam`."""
         if isinstance(message, ModelRequest):
@@ -332,9 +348,8 @@ class GroqModel(Model):
                     image_url = ImageURL(url=item.url)
                     content.append(chat.ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
                     if item.is_image:
-                        image_url = ImageURL(url=f'data:{item.media_type};base64,{base64_encoded}')
+                        image_url = ImageURL(url=item.data_uri)
                         content.append(chat.ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
                     else:
                         raise RuntimeError('Only images are supported for binary content in Groq.')
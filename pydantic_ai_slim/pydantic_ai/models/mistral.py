@@ -1,12 +1,11 @@
 from __future__ import annotations as _annotations
 
-import base64
 import os
 from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from itertools import chain
+from functools import lru_cache
 from typing import Any, Callable, Literal, Union, cast
 
 import pydantic_core
@@ -34,9 +33,11 @@ from ..result import Usage
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
+    ToolMappingCache,
     cached_async_http_client,
     check_allow_model_requests,
 )
@@ -110,6 +111,8 @@ class MistralModel(Model):
 
     _model_name: MistralModelName = field(repr=False)
     _system: str | None = field(default='mistral', repr=False)
+    _message_cache: MessageMappingCache[list[MistralMessages]] = field(repr=False)
+    _tool_cache: ToolMappingCache[MistralTool] = field(repr=False)
 
     def __init__(
         self,
@@ -138,7 +141,11 @@ class MistralModel(Model):
             self.client = client
         else:
             api_key = os.getenv('MISTRAL_API_KEY') if api_key is None else api_key
-            self.client = Mistral(api_key=api_key, async_client=http_client or cached_async_http_client())
+            self.client = Mistral(
+                api_key=api_key, async_client=http_client or cached_async_http_client(provider='mistral')
+            )
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     async def request(
         self,
@@ -188,7 +195,7 @@ class MistralModel(Model):
         try:
             response = await self.client.chat.complete_async(
                 model=str(self._model_name),
-                messages=list(chain(*(self._map_message(m) for m in messages))),
+                messages=self._map_messages(messages),
                 n=1,
                 tools=self._map_function_and_result_tools_definition(model_request_parameters) or UNSET,
                 tool_choice=self._get_tool_choice(model_request_parameters),
@@ -201,7 +208,10 @@ class MistralModel(Model):
             )
         except SDKError as e:
             if (status_code := e.status_code) >= 400:
-                raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
+                headers = dict(e.raw_response.headers) if e.raw_response is not None else None
+                raise ModelHTTPError(
+                    status_code=status_code, model_name=self.model_name, body=e.body, headers=headers
+                ) from e
             raise
 
         assert response, 'A unexpected empty response from Mistral.'
@@ -215,7 +225,7 @@ class MistralModel(Model):
     ) -> MistralEventStreamAsync[MistralCompletionEvent]:
         """Create a streaming completion request to the Mistral model."""
         response: MistralEventStreamAsync[MistralCompletionEvent] | None
-        mistral_messages = list(chain(*(self._map_message(m) for m in messages)))
+        mistral_messages = self._map_messages(messages)
 
         if (
             model_request_parameters.result_tools
@@ -285,14 +295,15 @@ class MistralModel(Model):
         all_tools: list[ToolDefinition] = (
             model_request_parameters.function_tools + model_request_parameters.result_tools
         )
-        tools = [
-            MistralTool(
-                function=MistralFunction(name=r.name, parameters=r.parameters_json_schema, description=r.description)
-            )
-            for r in all_tools
-        ]
+        tools = [self._tool_cache.map(r, self._map_tool_definition) for r in all_tools]
         return tools if tools else None
 
+    @staticmethod
+    def _map_tool_definition(f: ToolDefinition) -> MistralTool:
+        return MistralTool(
+            function=MistralFunction(name=f.name, parameters=f.parameters_json_schema, description=f.description)
+        )
+
     def _process_response(self, response: MistralChatCompletionResponse) -> ModelResponse:
         """Process a non-streamed response, and prepare a message to return."""
         assert response.choices, 'Unexpected empty response choice.'
@@ -452,6 +463,16 @@ class MistralModel(Model):
             else:
                 assert_never(part)
 
+    def _map_messages(self, messages: list[ModelMessage]) -> list[MistralMessages]:
+        """Map messages, reusing the mapping of any messages already sent in a previous request."""
+        mistral_messages: list[MistralMessages] = []
+        for m in messages:
+            mapped = self._message_cache.get(m)
+            if mapped is None:
+                mapped = self._message_cache.set(m, list(self._map_message(m)))
+            mistral_messages.extend(mapped)
+        return mistral_messages
+
     @classmethod
     def _map_message(cls, message: ModelMessage) -> Iterable[MistralMessages]:
         """Just maps a `pydantic_ai.Message` to a `MistralMessage`."""
@@ -485,9 +506,8 @@ class MistralModel(Model):
                 elif isinstance(item, ImageUrl):
                     content.append(MistralImageURLChunk(image_url=MistralImageURL(url=item.url)))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
                     if item.is_image:
-                        image_url = MistralImageURL(url=f'data:{item.media_type};base64,{base64_encoded}')
+                        image_url = MistralImageURL(url=item.data_uri)
                         content.append(MistralImageURLChunk(image_url=image_url, type='image_url'))
                     else:
                         raise RuntimeError('Only image binary content is supported for Mistral.')
@@ -508,9 +528,13 @@ class MistralStreamedResponse(StreamedResponse):
     _timestamp: datetime
     _result_tools: dict[str, ToolDefinition]
 
-    _delta_content: str = field(default='', init=False)
-
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        result_tool_checks = [
+            (name, _required_fields_check(tool.parameters_json_schema)) for name, tool in self._result_tools.items()
+        ]
+        result_tool_name: str | None = None
+        text_chunks: list[str] = []
+
         chunk: MistralCompletionEvent
         async for chunk in self._response:
             self._usage += _map_usage(chunk.data)
@@ -525,16 +549,25 @@ class MistralStreamedResponse(StreamedResponse):
             text = _map_content(content)
             if text:
                 # Attempt to produce a result tool call from the received text
-                if self._result_tools:
-                    self._delta_content += text
-                    maybe_tool_call_part = self._try_get_result_tool_from_text(self._delta_content, self._result_tools)
-                    if maybe_tool_call_part:
-                        yield self._parts_manager.handle_tool_call_part(
-                            vendor_part_id='result',
-                            tool_name=maybe_tool_call_part.tool_name,
-                            args=maybe_tool_call_part.args_as_dict(),
-                            tool_call_id=maybe_tool_call_part.tool_call_id,
+                if result_tool_checks:
+                    text_chunks.append(text)
+                    if result_tool_name is not None:
+                        # once the result tool is known, the rest of the text is forwarded as JSON deltas, without
+                        # parsing it again
+                        maybe_event = self._parts_manager.handle_tool_call_delta(
+                            vendor_part_id='result', tool_name=None, args=text, tool_call_id=None
+                        )
+                        if maybe_event is not None:
+                            yield maybe_event
+                    else:
+                        delta_content = ''.join(text_chunks)
+                        result_tool_name = self._try_get_result_tool_from_text(
+                            delta_content, result_tool_checks, require_content=True
                         )
+                        if result_tool_name is not None:
+                            yield self._parts_manager.handle_tool_call_part(
+                                vendor_part_id='result', tool_name=result_tool_name, args=delta_content
+                            )
                 else:
                     yield self._parts_manager.handle_text_delta(vendor_part_id='content', content=text)
 
@@ -545,6 +578,16 @@ class MistralStreamedResponse(StreamedResponse):
                     vendor_part_id=index, tool_name=dtc.function.name, args=dtc.function.arguments, tool_call_id=dtc.id
                 )
 
+        if text_chunks and (result_tool_name is None or len(result_tool_checks) > 1):
+            # the complete response may match a result tool when no partial response did, and with several result
+            # tools, the one picked from a partial response may not be the one the complete response matches
+            delta_content = ''.join(text_chunks)
+            final_tool_name = self._try_get_result_tool_from_text(delta_content, result_tool_checks)
+            if final_tool_name is not None and final_tool_name != result_tool_name:
+                yield self._parts_manager.handle_tool_call_part(
+                    vendor_part_id='result', tool_name=final_tool_name, args=delta_content
+                )
+
     @property
     def model_name(self) -> MistralModelName:
         """Get the model name of the response."""
@@ -556,51 +599,78 @@ class MistralStreamedResponse(StreamedResponse):
         return self._timestamp
 
     @staticmethod
-    def _try_get_result_tool_from_text(text: str, result_tools: dict[str, ToolDefinition]) -> ToolCallPart | None:
-        output_json: dict[str, Any] | None = pydantic_core.from_json(text, allow_partial='trailing-strings')
-        if output_json:
-            for result_tool in result_tools.values():
+    def _try_get_result_tool_from_text(
+        text: str,
+        result_tool_checks: list[tuple[str, Callable[[dict[str, Any]], bool]]],
+        *,
+        require_content: bool = False,
+    ) -> str | None:
+        output_json: Any = pydantic_core.from_json(text, allow_partial='trailing-strings')
+        if not isinstance(output_json, dict):
+            return None
+        output_json = cast(dict[str, Any], output_json)
+        # partial responses are only used once they have some content, as with dict arguments in `ToolCallPart`
+        if output_json and (any(output_json.values()) or not require_content):
+            for name, required_fields_check in result_tool_checks:
                 # NOTE: Additional verification to prevent JSON validation to crash in `_result.py`
                 # Ensures required parameters in the JSON schema are respected, especially for stream-based return types.
                 # Example with BaseModel and required fields.
-                if not MistralStreamedResponse._validate_required_json_schema(
-                    output_json, result_tool.parameters_json_schema
-                ):
-                    continue
+                if required_fields_check(output_json):
+                    return name
 
-                # The following part_id will be thrown away
-                return ToolCallPart(tool_name=result_tool.name, args=output_json)
 
-    @staticmethod
-    def _validate_required_json_schema(json_dict: dict[str, Any], json_schema: dict[str, Any]) -> bool:
-        """Validate that all required parameters in the JSON schema are present in the JSON dictionary."""
-        required_params = json_schema.get('required', [])
-        properties = json_schema.get('properties', {})
-
-        for param in required_params:
-            if param not in json_dict:
-                return False
-
-            param_schema = properties.get(param, {})
-            param_type = param_schema.get('type')
-            param_items_type = param_schema.get('items', {}).get('type')
-
-            if param_type == 'array' and param_items_type:
-                if not isinstance(json_dict[param], list):
-                    return False
-                for item in json_dict[param]:
-                    if not isinstance(item, VALID_JSON_TYPE_MAPPING[param_items_type]):
-                        return False
-            elif param_type and not isinstance(json_dict[param], VALID_JSON_TYPE_MAPPING[param_type]):
-                return False
-
-            if isinstance(json_dict[param], dict) and 'properties' in param_schema:
-                nested_schema = param_schema
-                if not MistralStreamedResponse._validate_required_json_schema(json_dict[param], nested_schema):
-                    return False
+def _required_fields_check(json_schema: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+    """Get a function checking that all required parameters in the JSON schema are present in a JSON dictionary.
+
+    The check is built once per schema and cached, rather than walking the schema for every streamed chunk.
+    """
+    return _cached_required_fields_check(pydantic_core.to_json(json_schema))
+
+
+@lru_cache(maxsize=128)
+def _cached_required_fields_check(json_schema: bytes) -> Callable[[dict[str, Any]], bool]:
+    return _build_required_fields_check(pydantic_core.from_json(json_schema))
+
 
+def _build_required_fields_check(json_schema: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+    properties = json_schema.get('properties', {})
+    param_checks = [_build_param_check(param, properties.get(param, {})) for param in json_schema.get('required', [])]
+
+    def check(json_dict: dict[str, Any]) -> bool:
+        return all(param_check(json_dict) for param_check in param_checks)
+
+    return check
+
+
+def _build_param_check(param: str, param_schema: dict[str, Any]) -> Callable[[dict[str, Any]], bool]:
+    param_type = param_schema.get('type')
+    param_items_type = param_schema.get('items', {}).get('type')
+
+    item_type: Any = None
+    if param_type == 'array' and param_items_type:
+        value_type: Any = list
+        item_type = VALID_JSON_TYPE_MAPPING[param_items_type]
+    elif param_type:
+        value_type = VALID_JSON_TYPE_MAPPING[param_type]
+    else:
+        value_type = object
+
+    nested_check = _build_required_fields_check(param_schema) if 'properties' in param_schema else None
+
+    def check(json_dict: dict[str, Any]) -> bool:
+        if param not in json_dict:
+            return False
+        value = json_dict[param]
+        if not isinstance(value, value_type):
+            return False
+        if item_type is not None and not all(isinstance(item, item_type) for item in value):
+            return False
+        if nested_check is not None and isinstance(value, dict) and not nested_check(cast(dict[str, Any], value)):
+            return False
         return True
 
+    return check
+
 
 VALID_JSON_TYPE_MAPPING: dict[str, Any] = {
     'string': str,
@@ -32,11 +32,16 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    DownloadedMedia,
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
+    ToolMappingCache,
     cached_async_http_client,
+    cached_media_downloads,
     check_allow_model_requests,
+    user_prompt_urls,
 )
 
 try:
@@ -97,6 +102,8 @@ class OpenAIModel(Model):
 
     _model_name: OpenAIModelName = field(repr=False)
     _system: str | None = field(repr=False)
+    _message_cache: MessageMappingCache[list[chat.ChatCompletionMessageParam]] = field(repr=False)
+    _tool_cache: ToolMappingCache[chat.ChatCompletionToolParam] = field(repr=False)
 
     def __init__(
         self,
@@ -142,9 +149,13 @@ class OpenAIModel(Model):
         elif http_client is not None:
             self.client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
         else:
-            self.client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=cached_async_http_client())
+            self.client = AsyncOpenAI(
+                base_url=base_url, api_key=api_key, http_client=cached_async_http_client(provider='openai')
+            )
         self.system_prompt_role = system_prompt_role
         self._system = system
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
 
     async def request(
         self,
@@ -219,10 +230,7 @@ class OpenAIModel(Model):
         else:
             tool_choice = 'auto'
 
-        openai_messages: list[chat.ChatCompletionMessageParam] = []
-        for m in messages:
-            async for msg in self._map_message(m):
-                openai_messages.append(msg)
+        openai_messages = await self._map_messages(messages)
 
         try:
             return await self.client.chat.completions.create(
@@ -246,7 +254,9 @@ class OpenAIModel(Model):
             )
         except APIStatusError as e:
             if (status_code := e.status_code) >= 400:
-                raise ModelHTTPError(status_code=status_code, model_name=self.model_name, body=e.body) from e
+                raise ModelHTTPError(
+                    status_code=status_code, model_name=self.model_name, body=e.body, headers=dict(e.response.headers)
+                ) from e
             raise
 
     def _process_response(self, response: chat.ChatCompletion) -> ModelResponse:
@@ -275,15 +285,32 @@ class OpenAIModel(Model):
         )
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> list[chat.ChatCompletionToolParam]:
-        tools = [self._map_tool_definition(r) for r in model_request_parameters.function_tools]
+        tools = [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.function_tools]
         if model_request_parameters.result_tools:
-            tools += [self._map_tool_definition(r) for r in model_request_parameters.result_tools]
+            tools += [self._tool_cache.map(r, self._map_tool_definition) for r in model_request_parameters.result_tools]
         return tools
 
-    async def _map_message(self, message: ModelMessage) -> AsyncIterable[chat.ChatCompletionMessageParam]:
+    async def _map_messages(self, messages: list[ModelMessage]) -> list[chat.ChatCompletionMessageParam]:
+        """Map messages, reusing the mapping of any messages already sent in a previous request."""
+        openai_messages: list[chat.ChatCompletionMessageParam] = []
+        mapped_messages = [self._message_cache.get(m) for m in messages]
+        # audio URLs in all the messages to map are downloaded concurrently up front, rather than one prompt at a time
+        unmapped = [m for m, mapped in zip(messages, mapped_messages) if mapped is None]
+        downloads = await cached_media_downloads().get_many(
+            [item.url for item in user_prompt_urls(unmapped) if isinstance(item, AudioUrl)], follow_redirects=False
+        )
+        for m, mapped in zip(messages, mapped_messages):
+            if mapped is None:
+                mapped = self._message_cache.set(m, [msg async for msg in self._map_message(m, downloads)])
+            openai_messages.extend(mapped)
+        return openai_messages
+
+    async def _map_message(
+        self, message: ModelMessage, downloads: dict[str, DownloadedMedia]
+    ) -> AsyncIterable[chat.ChatCompletionMessageParam]:
         """Just maps a `pydantic_ai.Message` to a `openai.types.ChatCompletionMessageParam`."""
         if isinstance(message, ModelRequest):
-            async for item in self._map_user_message(message):
+            async for item in self._map_user_message(message, downloads):
                 yield item
         elif isinstance(message, ModelResponse):
             texts: list[str] = []
@@ -325,7 +352,9 @@ class OpenAIModel(Model):
             },
         }
 
-    async def _map_user_message(self, message: ModelRequest) -> AsyncIterable[chat.ChatCompletionMessageParam]:
+    async def _map_user_message(
+        self, message: ModelRequest, downloads: dict[str, DownloadedMedia]
+    ) -> AsyncIterable[chat.ChatCompletionMessageParam]:
         for part in message.parts:
             if isinstance(part, SystemPromptPart):
                 if self.system_prompt_role == 'developer':
@@ -335,7 +364,7 @@ class OpenAIModel(Model):
                 else:
                     yield chat.ChatCompletionSystemMessageParam(role='system', content=part.content)
             elif isinstance(part, UserPromptPart):
-                yield await self._map_user_prompt(part)
+                yield await self._map_user_prompt(part, downloads)
             elif isinstance(part, ToolReturnPart):
                 yield chat.ChatCompletionToolMessageParam(
                     role='tool',
@@ -355,7 +384,9 @@ class OpenAIModel(Model):
                 assert_never(part)
 
     @staticmethod
-    async def _map_user_prompt(part: UserPromptPart) -> chat.ChatCompletionUserMessageParam:
+    async def _map_user_prompt(
+        part: UserPromptPart, downloads: dict[str, DownloadedMedia]
+    ) -> chat.ChatCompletionUserMessageParam:
         content: str | list[ChatCompletionContentPartParam]
         if isinstance(part.content, str):
             content = part.content
@@ -368,21 +399,18 @@ class OpenAIModel(Model):
                     image_url = ImageURL(url=item.url)
                     content.append(ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
                     if item.is_image:
-                        image_url = ImageURL(url=f'data:{item.media_type};base64,{base64_encoded}')
+                        image_url = ImageURL(url=item.data_uri)
                         content.append(ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
                     elif item.is_audio:
-                        audio = InputAudio(data=base64_encoded, format=item.audio_format)
+                        audio = InputAudio(data=item.base64, format=item.audio_format)
                         content.append(ChatCompletionContentPartInputAudioParam(input_audio=audio, type='input_audio'))
                     else:  # pragma: no cover
                         raise RuntimeError(f'Unsupported binary content type: {item.media_type}')
                 elif isinstance(item, AudioUrl):  # pragma: no cover
-                    client = cached_async_http_client()
-                    response = await client.get(item.url)
-                    response.raise_for_status()
-                    base64_encoded = base64.b64encode(response.content).decode('utf-8')
-                    audio = InputAudio(data=base64_encoded, format=response.headers.get('content-type'))
+                    download = downloads[item.url]
+                    base64_encoded = base64.b64encode(download.data).decode('utf-8')
+                    audio = InputAudio(data=base64_encoded, format=download.media_type)  # type: ignore
                     content.append(ChatCompletionContentPartInputAudioParam(input_audio=audio, type='input_audio'))
                 else:
                     assert_never(item)
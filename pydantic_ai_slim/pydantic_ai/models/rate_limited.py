@@ -0,0 +1,221 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+from opentelemetry.trace import get_current_span
+
+from ..messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    RetryPromptPart,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from ..settings import ModelSettings
+from ..usage import Usage
+from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from .wrapper import WrapperModel
+
+QUEUE_DELAY_ATTRIBUTE = 'pydantic_ai.rate_limit.queue_delay'
+"""Name of the span attribute recording how long a request waited for the rate limits, in seconds."""
+
+
+@dataclass(init=False)
+class RateLimitedModel(WrapperModel):
+    """Model which limits the rate of requests and tokens sent to the wrapped model.
+
+    Limits are enforced client side with token buckets, so requests wait rather than being rejected by the provider
+    with a 429. The token cost of a request is estimated before it's sent, then corrected from the actual usage once
+    the response is received.
+
+    The limits are held by the model instance, so share one instance between agents and runs to share the limits.
+    When wrapped in an [`InstrumentedModel`][pydantic_ai.models.instrumented.InstrumentedModel], e.g. with
+    `Agent(instrument=True)`, the time each request waited is recorded as the
+    `pydantic_ai.rate_limit.queue_delay` attribute of the request span.
+
+    Apart from `__init__`, all methods are private or match those of the base class.
+    """
+
+    _request_bucket: _TokenBucket | None = field(repr=False)
+    _token_bucket: _TokenBucket | None = field(repr=False)
+    _estimate_tokens: Callable[[list[ModelMessage]], int] = field(repr=False)
+
+    def __init__(
+        self,
+        wrapped: Model | KnownModelName,
+        *,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        estimate_tokens: Callable[[list[ModelMessage]], int] | None = None,
+    ):
+        """Initialize a rate limited model.
+
+        Args:
+            wrapped: The name or instance of the model to limit requests to.
+            requests_per_minute: Maximum number of requests per minute, or `None` for no limit.
+            tokens_per_minute: Maximum number of tokens (request plus response tokens) per minute, or `None` for no
+                limit.
+            estimate_tokens: Function to estimate the number of tokens a request will use from its messages, used to
+                reserve tokens before the request is sent. Defaults to a rough estimate from the length of the text
+                in the messages.
+        """
+        super().__init__(wrapped)
+        self._request_bucket = _TokenBucket(requests_per_minute) if requests_per_minute is not None else None
+        self._token_bucket = _TokenBucket(tokens_per_minute) if tokens_per_minute is not None else None
+        self._estimate_tokens = estimate_tokens or estimate_request_tokens
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[ModelResponse, Usage]:
+        reserved_tokens = await self._wait(messages)
+        usage: Usage | None = None
+        try:
+            response, usage = await super().request(messages, model_settings, model_request_parameters)
+            return response, usage
+        finally:
+            self._reconcile(reserved_tokens, usage)
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        reserved_tokens = await self._wait(messages)
+        usage: Usage | None = None
+        try:
+            async with super().request_stream(messages, model_settings, model_request_parameters) as response_stream:
+                try:
+                    yield response_stream
+                finally:
+                    usage = response_stream.usage()
+        finally:
+            self._reconcile(reserved_tokens, usage)
+
+    async def _wait(self, messages: list[ModelMessage]) -> float:
+        """Reserve a request and the estimated tokens, waiting until they're available.
+
+        Returns:
+            The number of tokens reserved, which is less than the estimate if that's more than the bucket holds.
+        """
+        delay = 0.0
+        reserved_tokens = 0.0
+        if self._request_bucket:
+            _, request_delay = self._request_bucket.reserve(1)
+            delay = max(delay, request_delay)
+        if self._token_bucket:
+            reserved_tokens, token_delay = self._token_bucket.reserve(self._estimate_tokens(messages))
+            delay = max(delay, token_delay)
+
+        span = get_current_span()
+        if span.is_recording():
+            span.set_attribute(QUEUE_DELAY_ATTRIBUTE, delay)
+
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # the request was never sent, so give back what was reserved for it
+                if self._request_bucket:
+                    self._request_bucket.refund(1)
+                if self._token_bucket:
+                    self._token_bucket.refund(reserved_tokens)
+                raise
+        return reserved_tokens
+
+    def _reconcile(self, reserved_tokens: float, usage: Usage | None) -> None:
+        """Correct the tokens reserved for a request using its actual usage, `None` if the request failed."""
+        if self._token_bucket is None:
+            return
+        if usage is None:
+            # a failed request has no usage to go on, and providers don't count failed requests towards token limits
+            actual_tokens = 0
+        elif usage.total_tokens is not None:
+            actual_tokens = usage.total_tokens
+        elif usage.request_tokens is not None or usage.response_tokens is not None:
+            actual_tokens = (usage.request_tokens or 0) + (usage.response_tokens or 0)
+        else:
+            return
+        self._token_bucket.refund(reserved_tokens - actual_tokens)
+
+
+@dataclass
+class _TokenBucket:
+    """Token bucket holding up to `per_minute` units, refilled continuously at `per_minute` units per minute.
+
+    Reservations are taken from the bucket immediately, letting the level go negative, and the caller waits until
+    the bucket would have refilled to cover them. This serves waiters in the order they arrived without a lock.
+    """
+
+    per_minute: int
+    _level: float = field(init=False)
+    _updated: float = field(init=False)
+
+    def __post_init__(self):
+        self._level = self.per_minute
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float) -> tuple[float, float]:
+        """Take `amount` units from the bucket.
+
+        Returns:
+            The number of units taken, and how long to wait in seconds before using them.
+        """
+        self._refill()
+        # a single reservation larger than the bucket could otherwise never be satisfied
+        reserved = min(amount, self.per_minute)
+        self._level -= reserved
+        return reserved, max(-self._level * 60 / self.per_minute, 0.0)
+
+    def refund(self, amount: float) -> None:
+        """Put `amount` units back in the bucket, a negative amount takes more units."""
+        self._refill()
+        self._level = min(self._level + amount, self.per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self._level + (now - self._updated) * self.per_minute / 60, self.per_minute)
+        self._updated = now
+
+
+def estimate_request_tokens(messages: list[ModelMessage]) -> int:
+    """Very rough estimate of the number of tokens used by a request, assuming about 4 characters per token.
+
+    Media content isn't counted, [`RateLimitedModel`][pydantic_ai.models.rate_limited.RateLimitedModel] corrects
+    the estimate from the actual usage once the response is received.
+    """
+    characters = 0
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, SystemPromptPart):
+                    characters += len(part.content)
+                elif isinstance(part, UserPromptPart):
+                    if isinstance(part.content, str):
+                        characters += len(part.content)
+                    else:
+                        characters += sum(len(item) for item in part.content if isinstance(item, str))
+                elif isinstance(part, ToolReturnPart):
+                    characters += len(part.model_response_str())
+                elif isinstance(part, RetryPromptPart):
+                    characters += len(part.model_response())
+        else:
+            for part in message.parts:
+                if isinstance(part, TextPart):
+                    characters += len(part.content)
+                elif isinstance(part, ToolCallPart):
+                    characters += len(part.tool_name) + len(part.args_as_json_str())
+    return characters // 4 + 1
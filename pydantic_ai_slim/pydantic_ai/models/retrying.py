@@ -0,0 +1,166 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+from .. import _utils
+from ..exceptions import ModelHTTPError
+from ..messages import ModelMessage, ModelResponse
+from ..settings import ModelSettings
+from ..usage import Usage
+from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from .wrapper import WrapperModel, peek_stream
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+"""HTTP status codes retried by default: timeouts, conflicts, rate limits, server errors and overloading."""
+
+
+@dataclass(init=False)
+class RetryingModel(WrapperModel):
+    """Model which retries failed requests to the wrapped model, with exponential backoff.
+
+    The delay before each retry is picked at random between zero and an exponentially growing limit ("full jitter"),
+    so clients which failed at the same time don't all retry at the same time. If the error has a `retry-after-ms`
+    or `retry-after` header, that delay is used instead.
+
+    Streamed requests are only retried if they fail before the first event is received, since events received
+    before the failure may already have been used.
+
+    Apart from `__init__`, all methods are private or match those of the base class.
+    """
+
+    max_retries: int
+    """Maximum number of times a request is retried."""
+    initial_delay: float
+    """Upper limit of the delay before the first retry, in seconds, doubled for each retry after that."""
+    max_delay: float
+    """Upper limit of the delay before any retry, in seconds, unless a longer delay is requested by the server."""
+    max_retry_time: float | None
+    """Maximum time in seconds from the first attempt at a request until the last retry starts."""
+    _retry_on: Callable[[Exception], bool] = field(repr=False)
+
+    def __init__(
+        self,
+        wrapped: Model | KnownModelName,
+        *,
+        max_retries: int = 3,
+        initial_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_retry_time: float | None = 60.0,
+        retry_on: Callable[[Exception], bool] | None = None,
+    ):
+        """Initialize a retrying model.
+
+        Args:
+            wrapped: The name or instance of the model to retry requests to.
+            max_retries: Maximum number of times a request is retried.
+            initial_delay: Upper limit of the delay before the first retry, in seconds, doubled for each retry.
+            max_delay: Upper limit of the delay before any retry, in seconds, unless a longer delay is requested by
+                the server with a `retry-after` header.
+            max_retry_time: Maximum time in seconds from the first attempt at a request until the last retry
+                starts, `None` for no limit. A retry which would start later isn't made.
+            retry_on: Function deciding whether an error should be retried, by default a
+                [`ModelHTTPError`][pydantic_ai.exceptions.ModelHTTPError] with a status code in
+                [`RETRYABLE_STATUS_CODES`][pydantic_ai.models.retrying.RETRYABLE_STATUS_CODES] is retried.
+        """
+        super().__init__(wrapped)
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.max_retry_time = max_retry_time
+        self._retry_on = retry_on or _default_retry_on
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[ModelResponse, Usage]:
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await super().request(messages, model_settings, model_request_parameters)
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt, start)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            async with AsyncExitStack() as stack:
+                try:
+                    response_stream = await stack.enter_async_context(
+                        super().request_stream(messages, model_settings, model_request_parameters)
+                    )
+                    response_stream = await peek_stream(response_stream)
+                except Exception as exc:
+                    delay = self._retry_delay(exc, attempt, start)
+                    if delay is None:
+                        raise
+                else:
+                    yield response_stream
+                    return
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _retry_delay(self, exc: Exception, attempt: int, start: float) -> float | None:
+        """Get how long to wait before retrying after `exc`, or `None` if the request shouldn't be retried."""
+        if attempt >= self.max_retries or not self._retry_on(exc):
+            return None
+        delay = _retry_after(exc)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.initial_delay * 2**attempt))
+        if self.max_retry_time is not None and time.monotonic() - start + delay > self.max_retry_time:
+            return None
+        return delay
+
+
+def _default_retry_on(exc: Exception) -> bool:
+    return isinstance(exc, ModelHTTPError) and exc.status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Get the delay requested by the server in the `retry-after-ms` or `retry-after` header of an error."""
+    if not isinstance(exc, ModelHTTPError) or not exc.headers:
+        return None
+    headers = {name.lower(): value for name, value in exc.headers.items()}
+
+    if retry_after_ms := headers.get('retry-after-ms'):
+        try:
+            return max(float(retry_after_ms) / 1000, 0)
+        except ValueError:
+            pass
+
+    if retry_after := headers.get('retry-after'):
+        try:
+            return max(float(retry_after), 0)
+        except ValueError:
+            pass
+        # the header may also be an HTTP date
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - _utils.now_utc()).total_seconds(), 0)
+
+    return None
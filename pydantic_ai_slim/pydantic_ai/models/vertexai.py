@@ -1,5 +1,6 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -14,7 +15,7 @@ from .._utils import run_in_executor
 from ..exceptions import UserError
 from ..messages import ModelMessage, ModelResponse
 from ..settings import ModelSettings
-from . import ModelRequestParameters, StreamedResponse, cached_async_http_client
+from . import MessageMappingCache, ModelRequestParameters, StreamedResponse, ToolMappingCache, cached_async_http_client
 from .gemini import GeminiModel, GeminiModelName
 
 try:
@@ -67,6 +68,7 @@ class VertexAIModel(GeminiModel):
 
     _model_name: GeminiModelName = field(repr=False)
     _system: str | None = field(default='google-vertex', repr=False)
+    _init_task: asyncio.Task[None] | None = field(default=None, repr=False)
 
     # TODO __init__ can be removed once we drop 3.9 and we can set kw_only correctly on the dataclass
     def __init__(
@@ -103,20 +105,39 @@ class VertexAIModel(GeminiModel):
         self.project_id = project_id
         self.region = region
         self.model_publisher = model_publisher
-        self.http_client = http_client or cached_async_http_client()
+        self.http_client = http_client or cached_async_http_client(provider='google-vertex')
         self.url_template = url_template
 
         self._auth = None
         self._url = None
+        self._message_cache = MessageMappingCache()
+        self._tool_cache = ToolMappingCache()
+        self._init_task = None
 
     async def ainit(self) -> None:
         """Initialize the model, setting the URL and auth.
 
+        Concurrent calls share a single initialization, so credentials are only loaded once.
+
         This will raise an error if authentication fails.
         """
         if self._url is not None and self._auth is not None:
             return
 
+        task = self._init_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._init_task = asyncio.create_task(self._init())
+        # shield the shared task so one caller being cancelled doesn't cancel initialization for everyone else
+        await asyncio.shield(task)
+
+    async def _init(self) -> None:
+        try:
+            await self._init_url_and_auth()
+        finally:
+            # once the attributes are set the task isn't needed, and after a failure the next call should retry
+            self._init_task = None
+
+    async def _init_url_and_auth(self) -> None:
         if self.service_account_file is not None:
             creds: BaseCredentials | ServiceAccountCredentials = _creds_from_file(self.service_account_file)
             assert creds.project_id is None or isinstance(creds.project_id, str)
@@ -188,26 +209,51 @@ async def _async_google_auth() -> tuple[BaseCredentials, str | None]:
 
 # default expiry is 3600 seconds
 MAX_TOKEN_AGE = timedelta(seconds=3000)
+# tokens older than this are refreshed in the background, while requests keep using the current token
+TOKEN_REFRESH_AGE = timedelta(seconds=2700)
 
 
 @dataclass
 class BearerTokenAuth:
-    """Authentication using a bearer token generated by google-auth."""
+    """Authentication using a bearer token generated by google-auth.
+
+    Only one refresh runs at a time, concurrent callers needing a new token all wait for it. Once a token is older
+    than `TOKEN_REFRESH_AGE` it's refreshed in the background, so requests only wait for a refresh when there is no
+    token yet, or the token has expired.
+    """
 
     credentials: BaseCredentials | ServiceAccountCredentials
     token_created: datetime | None = field(default=None, init=False)
+    _refresh_task: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
 
     async def headers(self) -> dict[str, str]:
         if self.credentials.token is None or self._token_expired():
-            await run_in_executor(self._refresh_token)
-            self.token_created = datetime.now()
+            await asyncio.shield(self._start_refresh())
+        elif self._token_age() > TOKEN_REFRESH_AGE:
+            self._start_refresh()
         return {'Authorization': f'Bearer {self.credentials.token}'}
 
+    def _start_refresh(self) -> asyncio.Task[None]:
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._refresh_task = asyncio.create_task(self._refresh())
+            # background refreshes may fail without anyone awaiting them, the next call to `headers` will try again
+            task.add_done_callback(_retrieve_exception)
+        return task
+
+    async def _refresh(self) -> None:
+        await run_in_executor(self._refresh_token)
+        self.token_created = datetime.now()
+
+    def _token_age(self) -> timedelta:
+        assert self.token_created is not None, 'token_created should be set'
+        return datetime.now() - self.token_created
+
     def _token_expired(self) -> bool:
         if self.token_created is None:
             return True
         else:
-            return (datetime.now() - self.token_created) > MAX_TOKEN_AGE
+            return self._token_age() > MAX_TOKEN_AGE
 
     def _refresh_token(self) -> str:
         self.credentials.refresh(Request())
@@ -215,6 +261,11 @@ class BearerTokenAuth:
         return self.credentials.token
 
 
+def _retrieve_exception(task: asyncio.Task[None]) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
 VertexAiRegion = Literal[
     'us-central1',
     'us-east1',
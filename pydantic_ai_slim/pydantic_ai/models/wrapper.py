@@ -3,9 +3,10 @@ from __future__ import annotations
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
-from ..messages import ModelMessage, ModelResponse
+from ..messages import ModelMessage, ModelResponse, ModelResponseStreamEvent
 from ..settings import ModelSettings
 from ..usage import Usage
 from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse, infer_model
@@ -43,3 +44,46 @@ class WrapperModel(Model):
 
     def __getattr__(self, item: str):
         return getattr(self.wrapped, item)
+
+
+async def peek_stream(response: StreamedResponse) -> StreamedResponse:
+    """Wait for the first event of a streamed response.
+
+    This lets wrapper models act on errors raised before the first event, or on the time until it arrives.
+
+    Returns:
+        A streamed response which yields the same events as `response`, including the first one.
+    """
+    try:
+        first_event = await response.__aiter__().__anext__()
+    except StopAsyncIteration:
+        first_event = None
+    return _PeekedStreamedResponse(response, first_event)
+
+
+@dataclass
+class _PeekedStreamedResponse(StreamedResponse):
+    """Streamed response whose first event has already been taken from the stream it wraps."""
+
+    _wrapped: StreamedResponse
+    _first_event: ModelResponseStreamEvent | None
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        if self._first_event is not None:
+            yield self._first_event
+        async for event in self._wrapped:
+            yield event
+
+    def get(self) -> ModelResponse:
+        return self._wrapped.get()
+
+    def usage(self) -> Usage:
+        return self._wrapped.usage()
+
+    @property
+    def model_name(self) -> str:
+        return self._wrapped.model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._wrapped.timestamp
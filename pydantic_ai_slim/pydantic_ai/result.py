@@ -4,16 +4,17 @@ from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
 from copy import copy
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Generic, Union, cast
+from typing import Any, Generic, Literal, Union, cast
 
-from typing_extensions import TypeVar, assert_type
+import pydantic_core
+from typing_extensions import NotRequired, TypedDict, TypeVar, assert_type
 
 from . import _result, _utils, exceptions, messages as _messages, models
 from .messages import AgentStreamEvent, FinalResultEvent
 from .tools import AgentDepsT, RunContext
 from .usage import Usage, UsageLimits
 
-__all__ = 'ResultDataT', 'ResultDataT_inv', 'ResultValidatorFunc'
+__all__ = 'ResultDataT', 'ResultDataT_inv', 'ResultValidatorFunc', 'ResultPatchOperation'
 
 
 T = TypeVar('T')
@@ -49,6 +50,21 @@ Usage `ResultValidatorFunc[AgentDepsT, T]`.
 """
 
 
+class ResultPatchOperation(TypedDict):
+    """An operation describing a change to a streamed result, in the style of [JSON Patch](https://datatracker.ietf.org/doc/html/rfc6902).
+
+    Operations apply to the result as JSON-compatible data, i.e. after
+    [`to_jsonable_python`][pydantic_core.to_jsonable_python].
+    """
+
+    op: Literal['add', 'remove', 'replace']
+    """The kind of change, `add` to a list index or an object key, `remove` it, or `replace` its value."""
+    path: str
+    """A [JSON Pointer](https://datatracker.ietf.org/doc/html/rfc6901) to the changed location, `''` for the whole result."""
+    value: NotRequired[Any]
+    """The new value, absent for `remove` operations."""
+
+
 @dataclass
 class AgentStream(Generic[AgentDepsT, ResultDataT]):
     _raw_stream_response: models.StreamedResponse
@@ -64,16 +80,42 @@ class AgentStream(Generic[AgentDepsT, ResultDataT]):
     def __post_init__(self):
         self._initial_run_ctx_usage = copy(self._run_ctx.usage)
 
-    async def stream_output(self, *, debounce_by: float | None = 0.1) -> AsyncIterator[ResultDataT]:
-        """Asynchronously stream the (validated) agent outputs."""
+    async def stream_output(
+        self, *, debounce_by: float | None = 0.1, skip_unchanged: bool = False
+    ) -> AsyncIterator[ResultDataT]:
+        """Asynchronously stream the (validated) agent outputs.
+
+        Args:
+            debounce_by: by how much (if at all) to debounce/group the response chunks by. `None` means no debouncing.
+            skip_unchanged: if `True`, partial outputs are only validated and yielded when the content they are
+                validated from (the result tool arguments, or the text) has changed since the last one.
+        """
+        last_content: list[str | dict[str, Any]] | None = None
         async for response in self.stream_responses(debounce_by=debounce_by):
             if self._final_result_event is not None:
+                if skip_unchanged:
+                    content = _result_content(response, self._final_result_event.tool_name)
+                    if content == last_content:
+                        continue
+                    last_content = content
                 yield await self._validate_response(response, self._final_result_event.tool_name, allow_partial=True)
         if self._final_result_event is not None:
             yield await self._validate_response(
                 self._raw_stream_response.get(), self._final_result_event.tool_name, allow_partial=False
             )
 
+    async def stream_output_patches(
+        self, *, debounce_by: float | None = 0.1
+    ) -> AsyncIterator[list[ResultPatchOperation]]:
+        """Asynchronously stream the changes to the agent output, rather than the whole output each time.
+
+        Each item is the list of [`ResultPatchOperation`][pydantic_ai.result.ResultPatchOperation]s turning the
+        previous output into the current one, the first item replaces the whole (empty) output. Partial outputs are
+        only validated when their content has changed, and nothing is yielded when the output hasn't changed.
+        """
+        async for patch in _result_patches(self.stream_output(debounce_by=debounce_by, skip_unchanged=True)):
+            yield patch
+
     async def stream_responses(self, *, debounce_by: float | None = 0.1) -> AsyncIterator[_messages.ModelResponse]:
         """Asynchronously stream the (unvalidated) model responses for the agent."""
         # if the message currently has any parts with content, yield before streaming
@@ -264,7 +306,9 @@ class StreamedRunResult(Generic[AgentDepsT, ResultDataT]):
             self.new_messages(result_tool_return_content=result_tool_return_content)
         )
 
-    async def stream(self, *, debounce_by: float | None = 0.1) -> AsyncIterator[ResultDataT]:
+    async def stream(
+        self, *, debounce_by: float | None = 0.1, skip_unchanged: bool = False
+    ) -> AsyncIterator[ResultDataT]:
         """Stream the response as an async iterable.
 
         The pydantic validator for structured data will be called in
@@ -275,14 +319,34 @@ class StreamedRunResult(Generic[AgentDepsT, ResultDataT]):
             debounce_by: by how much (if at all) to debounce/group the response chunks by. `None` means no debouncing.
                 Debouncing is particularly important for long structured responses to reduce the overhead of
                 performing validation as each token is received.
+            skip_unchanged: if `True`, partial results are only validated and yielded when the content they are
+                validated from (the result tool arguments, or the text) has changed since the last one.
 
         Returns:
             An async iterable of the response data.
         """
-        async for structured_message, is_last in self.stream_structured(debounce_by=debounce_by):
+        async for structured_message, is_last in self.stream_structured(
+            debounce_by=debounce_by, skip_unchanged=skip_unchanged
+        ):
             result = await self.validate_structured_result(structured_message, allow_partial=not is_last)
             yield result
 
+    async def stream_patches(self, *, debounce_by: float | None = 0.1) -> AsyncIterator[list[ResultPatchOperation]]:
+        """Stream the changes to the response data, rather than the whole data each time.
+
+        Each item is the list of [`ResultPatchOperation`][pydantic_ai.result.ResultPatchOperation]s turning the
+        previous result into the current one, the first item replaces the whole (empty) result. Partial results are
+        only validated when their content has changed, and nothing is yielded when the result hasn't changed.
+
+        Args:
+            debounce_by: by how much (if at all) to debounce/group the response chunks by. `None` means no debouncing.
+
+        Returns:
+            An async iterable of lists of patch operations.
+        """
+        async for patch in _result_patches(self.stream(debounce_by=debounce_by, skip_unchanged=True)):
+            yield patch
+
     async def stream_text(self, *, delta: bool = False, debounce_by: float | None = 0.1) -> AsyncIterator[str]:
         """Stream the text result as an async iterable.
 
@@ -309,7 +373,7 @@ class StreamedRunResult(Generic[AgentDepsT, ResultDataT]):
         await self._marked_completed(self._stream_response.get())
 
     async def stream_structured(
-        self, *, debounce_by: float | None = 0.1
+        self, *, debounce_by: float | None = 0.1, skip_unchanged: bool = False
     ) -> AsyncIterator[tuple[_messages.ModelResponse, bool]]:
         """Stream the response as an async iterable of Structured LLM Messages.
 
@@ -317,18 +381,30 @@ class StreamedRunResult(Generic[AgentDepsT, ResultDataT]):
             debounce_by: by how much (if at all) to debounce/group the response chunks by. `None` means no debouncing.
                 Debouncing is particularly important for long structured responses to reduce the overhead of
                 performing validation as each token is received.
+            skip_unchanged: if `True`, messages before the last are only yielded when the content a result is
+                validated from (the result tool arguments, or the text) has changed since the last message yielded.
 
         Returns:
             An async iterable of the structured response message and whether that is the last message.
         """
+        result_tool_name = self._result_tool_name if self._result_schema is not None else None
+        last_content: list[str | dict[str, Any]] | None = None
+
         # if the message currently has any parts with content, yield before streaming
         msg = self._stream_response.get()
         for part in msg.parts:
             if part.has_content():
+                if skip_unchanged:
+                    last_content = _result_content(msg, result_tool_name)
                 yield msg, False
                 break
 
         async for msg in self._stream_response_structured(debounce_by=debounce_by):
+            if skip_unchanged:
+                content = _result_content(msg, result_tool_name)
+                if content == last_content:
+                    continue
+                last_content = content
             yield msg, False
 
         msg = self._stream_response.get()
@@ -470,6 +546,68 @@ class FinalResult(Generic[ResultDataT]):
     """ID of the tool call that produced the final result; `None` if the result came from unstructured text content."""
 
 
+def _result_content(message: _messages.ModelResponse, result_tool_name: str | None) -> list[str | dict[str, Any]]:
+    """Get the content of a response that the result is validated from, to check whether it has changed."""
+    if result_tool_name is None:
+        return [part.content for part in message.parts if isinstance(part, _messages.TextPart)]
+    else:
+        return [
+            part.args
+            for part in message.parts
+            if isinstance(part, _messages.ToolCallPart) and part.tool_name == result_tool_name
+        ]
+
+
+async def _result_patches(results: AsyncIterator[Any]) -> AsyncIterator[list[ResultPatchOperation]]:
+    previous: Any = None
+    first = True
+    async for result in results:
+        current = pydantic_core.to_jsonable_python(result, serialize_unknown=True)
+        patch: list[ResultPatchOperation] = []
+        if first:
+            patch.append({'op': 'replace', 'path': '', 'value': current})
+            first = False
+        else:
+            _json_patch(previous, current, '', patch)
+        if patch:
+            yield patch
+        previous = current
+
+
+def _json_patch(old: Any, new: Any, path: str, patch: list[ResultPatchOperation]) -> None:
+    """Append the operations turning `old` into `new` to `patch`, both must be JSON-compatible data.
+
+    Streamed results mostly grow at the end, so unchanged values are skipped with an equality check before recursing.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        old_dict = cast(dict[str, Any], old)
+        new_dict = cast(dict[str, Any], new)
+        for key in old_dict.keys() - new_dict.keys():
+            patch.append({'op': 'remove', 'path': f'{path}/{_escape_pointer(key)}'})
+        for key, value in new_dict.items():
+            if key not in old_dict:
+                patch.append({'op': 'add', 'path': f'{path}/{_escape_pointer(key)}', 'value': value})
+            elif old_dict[key] != value:
+                _json_patch(old_dict[key], value, f'{path}/{_escape_pointer(key)}', patch)
+    elif isinstance(old, list) and isinstance(new, list):
+        old_list = cast(list[Any], old)
+        new_list = cast(list[Any], new)
+        for index, (old_item, new_item) in enumerate(zip(old_list, new_list)):
+            if old_item != new_item:
+                _json_patch(old_item, new_item, f'{path}/{index}', patch)
+        # remove from the end, so earlier indexes in the patch stay valid
+        for index in range(len(old_list) - 1, len(new_list) - 1, -1):
+            patch.append({'op': 'remove', 'path': f'{path}/{index}'})
+        for index in range(len(old_list), len(new_list)):
+            patch.append({'op': 'add', 'path': f'{path}/{index}', 'value': new_list[index]})
+    elif old != new:
+        patch.append({'op': 'replace', 'path': path, 'value': new})
+
+
+def _escape_pointer(key: str) -> str:
+    return key.replace('~', '~0').replace('/', '~1')
+
+
 def _get_usage_checking_stream_response(
     stream_response: AsyncIterable[_messages.ModelResponseStreamEvent],
     limits: UsageLimits | None,
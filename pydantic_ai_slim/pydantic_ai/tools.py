@@ -161,10 +161,6 @@ class Tool(Generic[AgentDepsT]):
     _validator: SchemaValidator = field(init=False, repr=False)
     _parameters_json_schema: ObjectJsonSchema = field(init=False)
 
-    # TODO: Move this state off the Tool class, which is otherwise stateless.
-    #   This should be tracked inside a specific agent run, not the tool.
-    current_retry: int = field(default=0, init=False)
-
     def __init__(
         self,
         function: ToolFuncEither[AgentDepsT],
@@ -267,14 +263,18 @@ class Tool(Generic[AgentDepsT]):
     async def run(
         self, message: _messages.ToolCallPart, run_context: RunContext[AgentDepsT]
     ) -> _messages.ToolReturnPart | _messages.RetryPromptPart:
-        """Run the tool function asynchronously."""
+        """Run the tool function asynchronously.
+
+        `run_context.retry` should be the number of times this tool has been retried so far in the current run,
+        retries are counted by the caller so the tool can be shared between concurrent runs.
+        """
         try:
             if isinstance(message.args, str):
                 args_dict = self._validator.validate_json(message.args)
             else:
                 args_dict = self._validator.validate_python(message.args)
         except ValidationError as e:
-            return self._on_error(e, message)
+            return self._on_error(e, message, run_context)
 
         args, kwargs = self._call_args(args_dict, message, run_context)
         try:
@@ -285,9 +285,8 @@ class Tool(Generic[AgentDepsT]):
                 function = cast(Callable[[Any], str], self.function)
                 response_content = await _utils.run_in_executor(function, *args, **kwargs)
         except ModelRetry as e:
-            return self._on_error(e, message)
+            return self._on_error(e, message, run_context)
 
-        self.current_retry = 0
         return _messages.ToolReturnPart(
             tool_name=message.tool_name,
             content=response_content,
@@ -305,7 +304,6 @@ class Tool(Generic[AgentDepsT]):
 
         ctx = dataclasses.replace(
             run_context,
-            retry=self.current_retry,
             tool_name=message.tool_name,
             tool_call_id=message.tool_call_id,
         )
@@ -318,10 +316,12 @@ class Tool(Generic[AgentDepsT]):
         return args, args_dict
 
     def _on_error(
-        self, exc: ValidationError | ModelRetry, call_message: _messages.ToolCallPart
+        self,
+        exc: ValidationError | ModelRetry,
+        call_message: _messages.ToolCallPart,
+        run_context: RunContext[AgentDepsT],
     ) -> _messages.RetryPromptPart:
-        self.current_retry += 1
-        if self.max_retries is None or self.current_retry > self.max_retries:
+        if self.max_retries is None or run_context.retry + 1 > self.max_retries:
             raise UnexpectedModelBehavior(f'Tool exceeded max retries count of {self.max_retries}') from exc
         else:
             if isinstance(exc, ValidationError):
@@ -1,6 +1,7 @@
 from __future__ import annotations as _annotations
 
 import copy
+import dataclasses
 from collections.abc import Sequence
 from contextvars import ContextVar
 from dataclasses import dataclass, field
@@ -14,7 +15,15 @@ from typing_extensions import TypeVar
 from . import _utils
 from .nodes import BaseNode, End, RunEndT
 
-__all__ = 'StateT', 'NodeStep', 'EndStep', 'HistoryStep', 'deep_copy_state', 'nodes_schema_var'
+__all__ = (
+    'StateT',
+    'NodeStep',
+    'EndStep',
+    'HistoryStep',
+    'deep_copy_state',
+    'structural_copy_state',
+    'nodes_schema_var',
+)
 
 
 StateT = TypeVar('StateT', default=None)
@@ -29,6 +38,44 @@ def deep_copy_state(state: StateT) -> StateT:
         return copy.deepcopy(state)
 
 
+def structural_copy_state(state: StateT) -> StateT:
+    """Snapshot the state in a graph run by copying its structure while sharing the items held in containers.
+
+    Dataclass and Pydantic model attributes of the state are copied recursively, while `list`, `dict` and `set`
+    values are copied shallowly, so the snapshot gets its own container but shares the items inside it with the
+    live state. Any other attribute values are shared as-is.
+
+    This makes snapshotting an append-only history, like a list of messages, cost one pointer per item rather than
+    a full copy of every item on each step. The trade-off is that items held in containers must not be mutated in
+    place once added, otherwise the change will be visible in earlier snapshots too.
+    """
+    if state is None:
+        return state
+    else:
+        return _structural_copy(state)
+
+
+def _structural_copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return list(value)  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
+    elif isinstance(value, dict):
+        return dict(value)  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
+    elif isinstance(value, set):
+        return set(value)  # pyright: ignore[reportUnknownArgumentType,reportUnknownVariableType]
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        new_value = copy.copy(value)
+        for f in dataclasses.fields(value):
+            object.__setattr__(new_value, f.name, _structural_copy(getattr(value, f.name)))
+        return new_value
+    elif isinstance(value, pydantic.BaseModel):
+        new_value = value.model_copy()
+        for name, field_value in value.__dict__.items():
+            object.__setattr__(new_value, name, _structural_copy(field_value))
+        return new_value
+    else:
+        return value
+
+
 @dataclass
 class NodeStep(Generic[StateT, RunEndT]):
     """History step describing the execution of a node in a graph."""
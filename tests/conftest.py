@@ -21,7 +21,7 @@ from vcr import VCR
 
 import pydantic_ai.models
 from pydantic_ai.messages import BinaryContent
-from pydantic_ai.models import cached_async_http_client
+from pydantic_ai.models import close_cached_async_http_clients
 
 __all__ = 'IsDatetime', 'IsFloat', 'IsNow', 'IsStr', 'TestEnv', 'ClientWithHandler', 'try_import'
 
@@ -209,7 +209,7 @@ def vcr_config():
 @pytest.fixture(autouse=True)
 async def close_cached_httpx_client() -> AsyncIterator[None]:
     yield
-    await cached_async_http_client().aclose()
+    await close_cached_async_http_clients()
 
 
 @pytest.fixture(scope='session')
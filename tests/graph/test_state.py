@@ -1,13 +1,15 @@
 # pyright: reportPrivateUsage=false
 from __future__ import annotations as _annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timezone
 
 import pytest
 from inline_snapshot import snapshot
+from pydantic import BaseModel
 
 from pydantic_graph import BaseNode, End, EndStep, Graph, GraphRunContext, NodeStep
+from pydantic_graph.state import structural_copy_state
 
 from ..conftest import IsFloat, IsNow
 
@@ -56,3 +58,61 @@ async def test_run_graph():
         ]
     )
     assert state == MyState(x=2, y='y')
+
+
+async def test_structural_copy_state():
+    @dataclass
+    class Counter:
+        count: int = 0
+        details: dict[str, int] = field(default_factory=dict[str, int])
+
+    @dataclass
+    class MyState:
+        items: list[list[int]]
+        counter: Counter
+
+    @dataclass
+    class Append(BaseNode[MyState, None, int]):
+        async def run(self, ctx: GraphRunContext[MyState]) -> Append | End[int]:
+            ctx.state.items.append([len(ctx.state.items)])
+            ctx.state.counter.count += 1
+            ctx.state.counter.details['appended'] = ctx.state.counter.count
+            if len(ctx.state.items) < 3:
+                return Append()
+            return End(len(ctx.state.items))
+
+    graph = Graph(nodes=[Append], snapshot_state=structural_copy_state)
+    state = MyState([], Counter())
+    result = await graph.run(Append(), state=state)
+    assert result.output == 3
+
+    node_steps = [step for step in result.history if isinstance(step, NodeStep)]
+    assert [step.state for step in node_steps] == snapshot(
+        [
+            MyState(items=[[0]], counter=Counter(count=1, details={'appended': 1})),
+            MyState(items=[[0], [1]], counter=Counter(count=2, details={'appended': 2})),
+            MyState(items=[[0], [1], [2]], counter=Counter(count=3, details={'appended': 3})),
+        ]
+    )
+    # containers are copied, but the items inside them are shared between snapshots and the live state
+    first_state, second_state, _ = (step.state for step in node_steps)
+    assert first_state.items is not second_state.items
+    assert first_state.items[0] is second_state.items[0] is state.items[0]
+    assert first_state.counter is not state.counter
+    assert first_state.counter.details is not state.counter.details
+
+
+def test_structural_copy_state_pydantic_model():
+    class Inner(BaseModel):
+        values: list[int]
+
+    class MyState(BaseModel):
+        inner: Inner
+        tags: set[str]
+
+    state = MyState(inner=Inner(values=[1]), tags={'a'})
+    state_copy = structural_copy_state(state)
+    state.inner.values.append(2)
+    state.tags.add('b')
+    assert state_copy == MyState(inner=Inner(values=[1]), tags={'a'})
+    assert structural_copy_state(None) is None
@@ -442,6 +442,89 @@ async def test_anthropic_specific_metadata(allow_model_requests: None) -> None:
     assert get_mock_chat_completion_kwargs(mock_client)[0]['metadata']['user_id'] == '123'
 
 
+async def test_prompt_caching(allow_model_requests: None) -> None:
+    responses = [
+        completion_message(
+            [ToolUseBlock(id='1', input={'loc_name': 'London'}, name='get_location', type='tool_use')],
+            usage=AnthropicUsage(input_tokens=2, output_tokens=1, cache_creation_input_tokens=100),
+        ),
+        completion_message(
+            [TextBlock(text='final response', type='text')],
+            usage=AnthropicUsage(
+                input_tokens=3, output_tokens=5, cache_creation_input_tokens=10, cache_read_input_tokens=100
+            ),
+        ),
+    ]
+
+    mock_client = MockAnthropic.create_mock(responses)
+    m = AnthropicModel('claude-3-5-haiku-latest', anthropic_client=mock_client)
+    agent = Agent(
+        m,
+        system_prompt='this is the system prompt',
+        model_settings=AnthropicModelSettings(
+            anthropic_cache_system_prompt=True, anthropic_cache_tools=True, anthropic_cache_messages=True
+        ),
+    )
+
+    @agent.tool_plain
+    async def get_location(loc_name: str) -> str:
+        return json.dumps({'lat': 51, 'lng': 0})
+
+    result = await agent.run('hello')
+    assert result.data == 'final response'
+    assert result.usage() == snapshot(
+        Usage(
+            requests=2,
+            request_tokens=5,
+            response_tokens=6,
+            total_tokens=11,
+            details={'cache_creation_input_tokens': 110, 'cache_read_input_tokens': 100},
+        )
+    )
+
+    kwargs = get_mock_chat_completion_kwargs(mock_client)
+    assert kwargs[0]['system'] == snapshot(
+        [{'type': 'text', 'text': 'this is the system prompt', 'cache_control': {'type': 'ephemeral'}}]
+    )
+    assert kwargs[0]['tools'][-1]['cache_control'] == {'type': 'ephemeral'}
+    assert kwargs[0]['messages'][0]['content'][-1]['cache_control'] == {'type': 'ephemeral'}
+    # the breakpoint moves to the last message, the mapping of the first message reused from the first request is
+    # left unchanged
+    assert kwargs[1]['messages'] == snapshot(
+        [
+            {'role': 'user', 'content': [{'text': 'hello', 'type': 'text'}]},
+            {
+                'role': 'assistant',
+                'content': [{'id': '1', 'type': 'tool_use', 'name': 'get_location', 'input': {'loc_name': 'London'}}],
+            },
+            {
+                'role': 'user',
+                'content': [
+                    {
+                        'tool_use_id': '1',
+                        'type': 'tool_result',
+                        'content': '{"lat": 51, "lng": 0}',
+                        'is_error': False,
+                        'cache_control': {'type': 'ephemeral'},
+                    }
+                ],
+            },
+        ]
+    )
+
+
+async def test_prompt_caching_disabled(allow_model_requests: None) -> None:
+    c = completion_message([TextBlock(text='world', type='text')], AnthropicUsage(input_tokens=5, output_tokens=10))
+    mock_client = MockAnthropic.create_mock(c)
+    m = AnthropicModel('claude-3-5-haiku-latest', anthropic_client=mock_client)
+    agent = Agent(m, system_prompt='this is the system prompt')
+
+    await agent.run('hello')
+    kwargs = get_mock_chat_completion_kwargs(mock_client)[0]
+    assert kwargs['system'] == 'this is the system prompt'
+    assert kwargs['messages'] == snapshot([{'role': 'user', 'content': [{'text': 'hello', 'type': 'text'}]}])
+
+
 async def test_stream_structured(allow_model_requests: None):
     """Test streaming structured responses with Anthropic's API.
 
@@ -551,6 +634,90 @@ async def test_stream_structured(allow_model_requests: None):
         assert tool_called
 
 
+def tool_use_stream(tool_name: str, json_chunks: list[str]) -> list[RawMessageStreamEvent]:
+    return [
+        RawMessageStartEvent(
+            type='message_start',
+            message=AnthropicMessage(
+                id='msg_123',
+                model='claude-3-5-haiku-latest',
+                role='assistant',
+                type='message',
+                content=[],
+                stop_reason=None,
+                usage=AnthropicUsage(input_tokens=20, output_tokens=0),
+            ),
+        ),
+        RawContentBlockStartEvent(
+            type='content_block_start',
+            index=0,
+            content_block=ToolUseBlock(type='tool_use', id='tool_1', name=tool_name, input={}),
+        ),
+        *(
+            RawContentBlockDeltaEvent(
+                type='content_block_delta',
+                index=0,
+                delta=InputJSONDelta(type='input_json_delta', partial_json=chunk),
+            )
+            for chunk in json_chunks
+        ),
+        RawContentBlockStopEvent(type='content_block_stop', index=0),
+        RawMessageStopEvent(type='message_stop'),
+    ]
+
+
+async def test_stream_json_deltas(allow_model_requests: None):
+    stream = tool_use_stream('final_result', ['', '{"response": ["a', 'pple", "ban', 'ana"', ', "cherry"]}'])
+    mock_client = MockAnthropic.create_stream_mock(stream)
+    m = AnthropicModel('claude-3-5-haiku-latest', anthropic_client=mock_client)
+    agent = Agent(m, result_type=list[str])
+
+    async with agent.run_stream('') as result:
+        chunks = [c async for c in result.stream(debounce_by=None)]
+
+    # raw JSON deltas are forwarded as they arrive, so partial results are available before the JSON is complete
+    assert chunks == snapshot(
+        [
+            ['a'],
+            ['apple', 'ban'],
+            ['apple', 'banana'],
+            ['apple', 'banana', 'cherry'],
+            ['apple', 'banana', 'cherry'],
+        ]
+    )
+    assert result.all_messages()[1] == snapshot(
+        ModelResponse(
+            parts=[
+                ToolCallPart(
+                    tool_name='final_result',
+                    args='{"response": ["apple", "banana", "cherry"]}',
+                    tool_call_id='tool_1',
+                )
+            ],
+            model_name='claude-3-5-haiku-latest',
+            timestamp=IsNow(tz=timezone.utc),
+        )
+    )
+
+
+async def test_stream_tool_call_without_args(allow_model_requests: None):
+    done_stream = tool_use_stream('final_result', ['{"response": ["done"]}'])
+    mock_client = MockAnthropic.create_stream_mock([tool_use_stream('get_time', []), done_stream])
+    m = AnthropicModel('claude-3-5-haiku-latest', anthropic_client=mock_client)
+    agent = Agent(m, result_type=list[str])
+
+    @agent.tool_plain
+    async def get_time() -> str:
+        return 'noon'
+
+    async with agent.run_stream('') as result:
+        assert await result.get_data() == ['done']
+
+    assert result.all_messages()[1].parts == snapshot(
+        [ToolCallPart(tool_name='get_time', args='{}', tool_call_id='tool_1')]
+    )
+
+
 @pytest.mark.vcr()
 async def test_image_url_input(allow_model_requests: None, anthropic_api_key: str):
     m = AnthropicModel('claude-3-5-haiku-latest', api_key=anthropic_api_key)
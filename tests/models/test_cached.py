@@ -0,0 +1,243 @@
+from __future__ import annotations as _annotations
+
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, UserError
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import ModelRequestParameters, cached
+from pydantic_ai.models.cached import (
+    CacheBackend,
+    CachedModel,
+    CacheStats,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import Usage
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_time(monkeypatch: pytest.MonkeyPatch) -> FakeTime:
+    fake_time = FakeTime()
+    monkeypatch.setattr(cached, 'time', SimpleNamespace(time=fake_time.time, perf_counter=time.perf_counter))
+    return fake_time
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'disk'])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> CacheBackend:
+    if request.param == 'memory':
+        return MemoryCacheBackend()
+    elif request.param == 'sqlite':
+        return SQLiteCacheBackend(tmp_path / 'cache.sqlite')
+    else:
+        return DiskCacheBackend(tmp_path / 'cache')
+
+
+def make_model() -> tuple[FunctionModel, list[str]]:
+    calls: list[str] = []
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append('request')
+        if len(messages) == 1 and info.function_tools:
+            return ModelResponse(parts=[ToolCallPart('get_weather', {'city': 'London'}, tool_call_id='call_1')])
+        return ModelResponse(parts=[TextPart('sunny')])
+
+    async def stream_respond(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        calls.append('stream')
+        yield 'sunny '
+        yield 'all day'
+
+    return FunctionModel(respond, stream_function=stream_respond), calls
+
+
+def make_agent(model: CachedModel) -> Agent:
+    agent = Agent(model)
+
+    @agent.tool_plain
+    def get_weather(city: str) -> str:
+        return f'weather in {city}'
+
+    return agent
+
+
+async def test_request(backend: CacheBackend) -> None:
+    function_model, calls = make_model()
+    model = CachedModel(function_model, backend)
+    agent = make_agent(model)
+
+    result = await agent.run('weather?')
+    assert result.data == snapshot('sunny')
+    assert calls == snapshot(['request', 'request'])
+
+    cached_result = await agent.run('weather?')
+    assert cached_result.data == snapshot('sunny')
+    assert calls == snapshot(['request', 'request'])
+    assert cached_result.usage() == result.usage()
+    responses = [m for m in result.all_messages() if isinstance(m, ModelResponse)]
+    assert [m for m in cached_result.all_messages() if isinstance(m, ModelResponse)] == responses
+
+    await agent.run('other weather?')
+    assert calls == snapshot(['request', 'request', 'request', 'request'])
+    assert model.stats == CacheStats(hits=2, misses=4, saved_latency=model.stats.saved_latency)
+    assert model.stats.hit_rate == 2 / 6
+
+
+async def test_model_settings_in_key() -> None:
+    function_model, calls = make_model()
+    agent = make_agent(CachedModel(function_model))
+    await agent.run('weather?', model_settings={'temperature': 0})
+    await agent.run('weather?', model_settings={'temperature': 1})
+    await agent.run('weather?', model_settings={'temperature': 0})
+    assert len(calls) == snapshot(4)
+
+
+async def test_httpx_timeout_in_key() -> None:
+    function_model, calls = make_model()
+    agent = make_agent(CachedModel(function_model))
+    await agent.run('weather?', model_settings={'timeout': httpx.Timeout(10)})
+    await agent.run('weather?', model_settings={'timeout': httpx.Timeout(10, connect=1)})
+    await agent.run('weather?', model_settings={'timeout': httpx.Timeout(10)})
+    assert len(calls) == snapshot(4)
+
+
+async def test_unserializable_setting_in_key() -> None:
+    function_model, calls = make_model()
+    agent = make_agent(CachedModel(function_model))
+    with pytest.raises(UserError, match='Unable to build a cache key for the request: .*`object` values are not'):
+        await agent.run('weather?', model_settings={'timeout': object()})  # pyright: ignore[reportArgumentType]
+    assert calls == []
+
+
+async def test_undecodable_entry(backend: CacheBackend, caplog: pytest.LogCaptureFixture) -> None:
+    function_model, _ = make_model()
+    model = CachedModel(function_model, backend)
+    agent = Agent(model)
+    await agent.run('weather?')
+    params = ModelRequestParameters(function_tools=[], allow_text_result=True, result_tools=[])
+    key = model.cache_key([ModelRequest(parts=[UserPromptPart('weather?')])], None, params)
+    assert await backend.get(key) is not None
+    await backend.set(key, b'{"response": "not a response"}', None)
+
+    result = await agent.run('weather?')
+    assert result.data == snapshot('sunny')
+    assert 'could not be decoded' in caplog.text
+    assert model.stats == CacheStats(hits=0, misses=2)
+    # the entry was overwritten with the wrapped model's response
+    await agent.run('weather?')
+    assert model.stats.hits == 1
+
+
+def test_cache_key_timestamps() -> None:
+    model = CachedModel(FunctionModel(lambda messages, info: ModelResponse(parts=[])))
+    params = ModelRequestParameters(function_tools=[], allow_text_result=True, result_tools=[])
+
+    def messages(timestamp: datetime, tool_result: dict[str, str]) -> list[ModelMessage]:
+        return [
+            ModelRequest(parts=[UserPromptPart('now?', timestamp=timestamp)]),
+            ModelResponse(parts=[ToolCallPart('get_time', {'timestamp': 'now'})], timestamp=timestamp),
+            ModelRequest(parts=[ToolReturnPart('get_time', tool_result, timestamp=timestamp)]),
+        ]
+
+    early, late = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 1, 2, tzinfo=timezone.utc)
+    key = model.cache_key(messages(early, {'timestamp': '12:00'}), None, params)
+    # message and part timestamps don't change the key, but timestamps in tool results do
+    assert model.cache_key(messages(late, {'timestamp': '12:00'}), None, params) == key
+    assert model.cache_key(messages(early, {'timestamp': '13:00'}), None, params) != key
+
+
+async def test_ttl(backend: CacheBackend, fake_time: FakeTime) -> None:
+    function_model, calls = make_model()
+    agent = Agent(CachedModel(function_model, backend, ttl=60))
+    await agent.run('hello')
+    fake_time.now += 59
+    await agent.run('hello')
+    assert calls == snapshot(['request'])
+    fake_time.now += 2
+    await agent.run('hello')
+    assert calls == snapshot(['request', 'request'])
+
+
+async def test_stream(backend: CacheBackend) -> None:
+    function_model, calls = make_model()
+    model = CachedModel(function_model, backend)
+    agent = Agent(model)
+
+    async with agent.run_stream('hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['sunny ', 'sunny all day'])
+    async with agent.run_stream('hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['sunny all day'])
+        assert result.usage() == snapshot(
+            Usage(requests=1, request_tokens=50, response_tokens=3, total_tokens=53, details=None)
+        )
+    assert calls == snapshot(['stream'])
+    assert model.stats.hits == 1
+
+    # streamed and non-streamed requests share the cache
+    assert (await agent.run('hello')).data == snapshot('sunny all day')
+    assert calls == snapshot(['stream'])
+
+
+async def test_stream_incomplete_not_cached() -> None:
+    function_model, calls = make_model()
+    model = CachedModel(function_model)
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('hello')])]
+    parameters = ModelRequestParameters(function_tools=[], allow_text_result=True, result_tools=[])
+
+    async with model.request_stream(messages, None, parameters) as response_stream:
+        async for _ in response_stream:
+            break
+    async with model.request_stream(messages, None, parameters) as response_stream:
+        async for _ in response_stream:
+            pass
+    async with model.request_stream(messages, None, parameters) as response_stream:
+        async for _ in response_stream:
+            pass
+        assert response_stream.get().parts == snapshot([TextPart(content='sunny all day')])
+    assert calls == snapshot(['stream', 'stream'])
+
+
+async def test_memory_backend_lru() -> None:
+    backend = MemoryCacheBackend(max_size=2)
+    await backend.set('a', b'1', None)
+    await backend.set('b', b'2', None)
+    assert await backend.get('a') == b'1'
+    await backend.set('c', b'3', None)
+    assert await backend.get('b') is None
+    assert await backend.get('a') == b'1'
+    assert await backend.get('c') == b'3'
+
+
+async def test_persistent_backends(tmp_path: Path) -> None:
+    for make_backend in (lambda: SQLiteCacheBackend(tmp_path / 'cache.sqlite'), lambda: DiskCacheBackend(tmp_path)):
+        function_model, calls = make_model()
+        await Agent(CachedModel(function_model, make_backend())).run('hello')
+        # a new backend instance reads what the first one stored
+        await Agent(CachedModel(function_model, make_backend())).run('hello')
+        assert calls == snapshot(['request'])
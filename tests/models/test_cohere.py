@@ -8,8 +8,9 @@ from typing import Any, Union, cast
 
 import pytest
 from inline_snapshot import snapshot
+from typing_extensions import TypedDict
 
-from pydantic_ai import Agent, ModelHTTPError, ModelRetry
+from pydantic_ai import Agent, ModelHTTPError, ModelRetry, UnexpectedModelBehavior
 from pydantic_ai.messages import (
     ImageUrl,
     ModelRequest,
@@ -24,16 +25,39 @@ from pydantic_ai.messages import (
 from pydantic_ai.usage import Usage
 
 from ..conftest import IsNow, raise_if_exception, try_import
+from .mock_async_stream import MockAsyncStream
 
 with try_import() as imports_successful:
     import cohere
     from cohere import (
         AssistantMessageResponse,
         AsyncClientV2,
+        ChatContentDeltaEventDelta,
+        ChatContentDeltaEventDeltaMessage,
+        ChatContentDeltaEventDeltaMessageContent,
+        ChatMessageEndEventDelta,
         ChatResponse,
+        ChatToolCallDeltaEventDelta,
+        ChatToolCallDeltaEventDeltaMessage,
+        ChatToolCallDeltaEventDeltaMessageToolCalls,
+        ChatToolCallDeltaEventDeltaMessageToolCallsFunction,
+        ChatToolCallStartEventDelta,
+        ChatToolCallStartEventDeltaMessage,
+        ChatToolPlanDeltaEventDelta,
+        ChatToolPlanDeltaEventDeltaMessage,
+        ContentDeltaStreamedChatResponseV2,
+        ContentEndStreamedChatResponseV2,
+        MessageEndStreamedChatResponseV2,
+        MessageStartStreamedChatResponseV2,
+        StreamedChatResponseV2,
         TextAssistantMessageResponseContentItem,
+        ToolCallDeltaStreamedChatResponseV2,
+        ToolCallEndStreamedChatResponseV2,
+        ToolCallStartStreamedChatResponseV2,
         ToolCallV2,
         ToolCallV2Function,
+        ToolPlanDeltaStreamedChatResponseV2,
+        UsageTokens,
     )
     from cohere.core.api_error import ApiError
 
@@ -41,6 +65,7 @@ with try_import() as imports_successful:
 
     # note: we use Union here for compatibility with Python 3.9
     MockChatResponse = Union[ChatResponse, Exception]
+    MockStreamEvent = Union[StreamedChatResponseV2, Exception]
 
 pytestmark = [
     pytest.mark.skipif(not imports_successful(), reason='cohere not installed'),
@@ -57,12 +82,17 @@ def test_init():
 @dataclass
 class MockAsyncClientV2:
     completions: MockChatResponse | Sequence[MockChatResponse] | None = None
+    stream: Sequence[MockStreamEvent] | None = None
     index = 0
 
     @classmethod
     def create_mock(cls, completions: MockChatResponse | Sequence[MockChatResponse]) -> AsyncClientV2:
         return cast(AsyncClientV2, cls(completions=completions))
 
+    @classmethod
+    def create_mock_stream(cls, stream: Sequence[MockStreamEvent]) -> AsyncClientV2:
+        return cast(AsyncClientV2, cls(stream=stream))
+
     async def chat(  # pragma: no cover
         self, *_args: Any, **_kwargs: Any
     ) -> ChatResponse:
@@ -76,6 +106,10 @@ class MockAsyncClientV2:
         self.index += 1
         return response
 
+    def chat_stream(self, *_args: Any, **_kwargs: Any) -> MockAsyncStream[MockStreamEvent]:
+        assert self.stream is not None, 'you can only use `chat_stream` if `stream` is provided'
+        return MockAsyncStream(iter(self.stream))
+
 
 def completion_message(message: AssistantMessageResponse, *, usage: cohere.Usage | None = None) -> ChatResponse:
     return ChatResponse(
@@ -351,3 +385,153 @@ def test_model_status_error(allow_model_requests: None) -> None:
     with pytest.raises(ModelHTTPError) as exc_info:
         agent.run_sync('hello')
     assert str(exc_info.value) == snapshot("status_code: 500, model_name: command-r, body: {'error': 'test error'}")
+
+
+def text_event(text: str) -> ContentDeltaStreamedChatResponseV2:
+    return ContentDeltaStreamedChatResponseV2(
+        index=0,
+        delta=ChatContentDeltaEventDelta(
+            message=ChatContentDeltaEventDeltaMessage(content=ChatContentDeltaEventDeltaMessageContent(text=text))
+        ),
+    )
+
+
+def tool_call_start_event(index: int, tool_name: str, tool_call_id: str) -> ToolCallStartStreamedChatResponseV2:
+    return ToolCallStartStreamedChatResponseV2(
+        index=index,
+        delta=ChatToolCallStartEventDelta(
+            message=ChatToolCallStartEventDeltaMessage(
+                tool_calls=ToolCallV2(
+                    id=tool_call_id, type='function', function=ToolCallV2Function(name=tool_name, arguments='')
+                )
+            )
+        ),
+    )
+
+
+def tool_call_delta_event(index: int, arguments: str) -> ToolCallDeltaStreamedChatResponseV2:
+    return ToolCallDeltaStreamedChatResponseV2(
+        index=index,
+        delta=ChatToolCallDeltaEventDelta(
+            message=ChatToolCallDeltaEventDeltaMessage(
+                tool_calls=ChatToolCallDeltaEventDeltaMessageToolCalls(
+                    function=ChatToolCallDeltaEventDeltaMessageToolCallsFunction(arguments=arguments)
+                )
+            )
+        ),
+    )
+
+
+def message_end_event(input_tokens: int, output_tokens: int) -> MessageEndStreamedChatResponseV2:
+    return MessageEndStreamedChatResponseV2(
+        delta=ChatMessageEndEventDelta(
+            finish_reason='COMPLETE',
+            usage=cohere.Usage(tokens=UsageTokens(input_tokens=input_tokens, output_tokens=output_tokens)),
+        )
+    )
+
+
+async def test_stream_text(allow_model_requests: None):
+    stream = [
+        MessageStartStreamedChatResponseV2(id='123'),
+        text_event('hello '),
+        text_event('world'),
+        ContentEndStreamedChatResponseV2(index=0),
+        message_end_event(5, 2),
+    ]
+    mock_client = MockAsyncClientV2.create_mock_stream(stream)
+    m = CohereModel('command-r7b-12-2024', cohere_client=mock_client)
+    agent = Agent(m)
+
+    async with agent.run_stream('') as result:
+        assert not result.is_complete
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['hello ', 'hello world'])
+        assert result.is_complete
+    assert result.usage() == snapshot(Usage(requests=1, request_tokens=5, response_tokens=2, total_tokens=7))
+
+
+class MyTypedDict(TypedDict, total=False):
+    first: str
+    second: str
+
+
+async def test_stream_structured(allow_model_requests: None):
+    stream = [
+        MessageStartStreamedChatResponseV2(id='123'),
+        ToolPlanDeltaStreamedChatResponseV2(
+            delta=ChatToolPlanDeltaEventDelta(message=ChatToolPlanDeltaEventDeltaMessage(tool_plan='I will answer'))
+        ),
+        tool_call_start_event(0, 'final_result', '1'),
+        tool_call_delta_event(0, '{"first": "One'),
+        tool_call_delta_event(0, '", "second": "Two"'),
+        tool_call_delta_event(0, '}'),
+        ToolCallEndStreamedChatResponseV2(index=0),
+        message_end_event(5, 10),
+    ]
+    mock_client = MockAsyncClientV2.create_mock_stream(stream)
+    m = CohereModel('command-r7b-12-2024', cohere_client=mock_client)
+    agent = Agent(m, result_type=MyTypedDict)
+
+    async with agent.run_stream('') as result:
+        assert not result.is_complete
+        assert [dict(c) async for c in result.stream(debounce_by=None)] == snapshot(
+            [
+                {'first': 'One'},
+                {'first': 'One', 'second': 'Two'},
+                {'first': 'One', 'second': 'Two'},
+                {'first': 'One', 'second': 'Two'},
+            ]
+        )
+        assert result.is_complete
+
+    assert result.usage() == snapshot(Usage(requests=1, request_tokens=5, response_tokens=10, total_tokens=15))
+    assert result.all_messages() == snapshot(
+        [
+            ModelRequest(
+                parts=[
+                    UserPromptPart(
+                        content='',
+                        timestamp=IsNow(tz=timezone.utc),
+                    )
+                ]
+            ),
+            ModelResponse(
+                parts=[
+                    ToolCallPart(tool_name='final_result', args='{"first": "One", "second": "Two"}', tool_call_id='1')
+                ],
+                model_name='command-r7b-12-2024',
+                timestamp=IsNow(tz=timezone.utc),
+            ),
+            ModelRequest(
+                parts=[
+                    ToolReturnPart(
+                        tool_name='final_result',
+                        content='Final result processed.',
+                        tool_call_id='1',
+                        timestamp=IsNow(tz=timezone.utc),
+                    )
+                ]
+            ),
+        ]
+    )
+
+
+async def test_stream_empty(allow_model_requests: None):
+    mock_client = MockAsyncClientV2.create_mock_stream([])
+    m = CohereModel('command-r7b-12-2024', cohere_client=mock_client)
+    agent = Agent(m)
+
+    with pytest.raises(UnexpectedModelBehavior, match='Streamed response ended without content or tool calls'):
+        async with agent.run_stream(''):
+            pass
+
+
+async def test_stream_status_error(allow_model_requests: None):
+    mock_client = MockAsyncClientV2.create_mock_stream([ApiError(status_code=500, body={'error': 'test error'})])
+    m = CohereModel('command-r', cohere_client=mock_client)
+    agent = Agent(m)
+
+    with pytest.raises(ModelHTTPError) as exc_info:
+        async with agent.run_stream('hello'):
+            pass
+    assert str(exc_info.value) == snapshot("status_code: 500, model_name: command-r, body: {'error': 'test error'}")
@@ -1,12 +1,16 @@
+import asyncio
 import sys
+import time
 from collections.abc import AsyncIterator
 from datetime import timezone
+from types import SimpleNamespace
 
 import pytest
 from inline_snapshot import snapshot
 
-from pydantic_ai import Agent, ModelHTTPError
+from pydantic_ai import Agent, ModelHTTPError, UserError
 from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models import fallback
 from pydantic_ai.models.fallback import FallbackModel
 from pydantic_ai.models.function import AgentInfo, FunctionModel
 
@@ -205,3 +209,238 @@ async def test_fallback_condition_tuple() -> None:
 
     response = await agent.run('hello')
     assert response.data == 'success'
+
+
+def slow_model(calls: list[str], delay: float, text: str = 'slow') -> FunctionModel:
+    async def response(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> ModelResponse:
+        calls.append(f'{text} start')
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls.append(f'{text} cancelled')
+            raise
+        return ModelResponse(parts=[TextPart(text)])
+
+    async def stream_response(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> AsyncIterator[str]:
+        calls.append(f'{text} start')
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls.append(f'{text} cancelled')
+            raise
+        yield f'{text} '
+        yield 'stream'
+
+    return FunctionModel(response, stream_function=stream_response)
+
+
+async def test_hedge_slow_default() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(slow_model(calls, 10, 'slow'), slow_model(calls, 0, 'fast'), hedge_after=0.01)
+    agent = Agent(model=fallback_model)
+    result = await agent.run('hello')
+    assert result.data == snapshot('fast')
+    assert calls == snapshot(['slow start', 'fast start', 'slow cancelled'])
+
+
+async def test_hedge_fast_default() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(slow_model(calls, 0, 'fast'), slow_model(calls, 0, 'other'), hedge_after=1)
+    agent = Agent(model=fallback_model)
+    result = await agent.run('hello')
+    assert result.data == snapshot('fast')
+    assert calls == snapshot(['fast start'])
+
+
+async def test_hedge_failure_falls_back() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(failure_model, slow_model(calls, 0, 'fast'), hedge_after=10)
+    agent = Agent(model=fallback_model)
+    result = await agent.run('hello')
+    assert result.data == snapshot('fast')
+
+
+async def test_hedge_all_failed() -> None:
+    fallback_model = FallbackModel(failure_model, failure_model, hedge_after=10)
+    agent = Agent(model=fallback_model)
+    with pytest.raises(ExceptionGroup) as exc_info:
+        await agent.run('hello')
+    assert 'All models from FallbackModel failed' in exc_info.value.args[0]
+    assert len(exc_info.value.exceptions) == 2
+
+
+async def test_hedge_not_fallback_exception() -> None:
+    calls: list[str] = []
+    potato_model = FunctionModel(potato_exception_response)
+    fallback_model = FallbackModel(slow_model(calls, 10, 'slow'), potato_model, hedge_after=0.01)
+    agent = Agent(model=fallback_model)
+    with pytest.raises(PotatoException):
+        await agent.run('hello')
+    assert calls == snapshot(['slow start', 'slow cancelled'])
+
+
+async def test_hedge_streaming() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(slow_model(calls, 10, 'slow'), slow_model(calls, 0, 'fast'), hedge_after=0.01)
+    agent = Agent(model=fallback_model)
+    async with agent.run_stream('hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['fast ', 'fast stream'])
+    assert calls == snapshot(['slow start', 'fast start', 'slow cancelled'])
+
+
+async def test_hedge_streaming_failed() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(failure_model_stream, slow_model(calls, 0, 'fast'), hedge_after=10)
+    agent = Agent(model=fallback_model)
+    async with agent.run_stream('hello') as result:
+        assert await result.get_data() == snapshot('fast stream')
+
+
+async def test_hedge_percentile() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(slow_model(calls, 0, 'fast'), slow_model(calls, 0, 'other'), hedge_percentile=0.9)
+    request_latencies = fallback_model._request_latencies  # pyright: ignore[reportPrivateUsage]
+    stream_latencies = fallback_model._stream_latencies  # pyright: ignore[reportPrivateUsage]
+    assert fallback_model._hedge_delay(request_latencies) is None  # pyright: ignore[reportPrivateUsage]
+    agent = Agent(model=fallback_model)
+    for _ in range(10):
+        await agent.run('hello')
+    hedge_delay = fallback_model._hedge_delay(request_latencies)  # pyright: ignore[reportPrivateUsage]
+    assert hedge_delay is not None and hedge_delay < 0.1
+    assert fallback_model._hedge_delay(stream_latencies) is None  # pyright: ignore[reportPrivateUsage]
+    assert calls == ['fast start'] * 10
+
+
+async def test_hedge_percentile_streaming() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(slow_model(calls, 0, 'fast'), slow_model(calls, 0, 'other'), hedge_percentile=0.9)
+    agent = Agent(model=fallback_model)
+    for _ in range(10):
+        async with agent.run_stream('hello') as result:
+            assert await result.get_data() == 'fast stream'
+    assert len(fallback_model._stream_latencies) == 10  # pyright: ignore[reportPrivateUsage]
+    assert len(fallback_model._request_latencies) == 0  # pyright: ignore[reportPrivateUsage]
+    assert calls == ['fast start'] * 10
+
+
+async def test_hedge_percentile_records_first_model() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(failure_model, slow_model(calls, 0, 'fast'), hedge_percentile=0.9)
+    agent = Agent(model=fallback_model)
+    await agent.run('hello')
+    assert len(fallback_model._request_latencies) == 0  # pyright: ignore[reportPrivateUsage]
+
+    fallback_model = FallbackModel(slow_model(calls, 0.2, 'slow'), slow_model(calls, 0, 'fast'), hedge_after=0.05)
+    fallback_model._hedge_percentile = 0.9  # pyright: ignore[reportPrivateUsage]
+    agent = Agent(model=fallback_model)
+    result = await agent.run('hello')
+    assert result.data == 'fast'
+    # the first model lost the race, so the time it had taken when it was cancelled is recorded
+    [latency] = fallback_model._request_latencies  # pyright: ignore[reportPrivateUsage]
+    assert 0.05 <= latency < 0.2
+
+
+def test_hedge_percentile_invalid() -> None:
+    with pytest.raises(UserError, match='`hedge_percentile` must be between 0 and 1'):
+        FallbackModel(success_model, hedge_percentile=95)
+
+
+def test_circuit_breaker(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr(fallback, 'time', SimpleNamespace(monotonic=lambda: now, perf_counter=time.perf_counter))
+    transitions: list[tuple[str, str, str]] = []
+
+    failures = 0
+
+    def flaky_response(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> ModelResponse:
+        nonlocal failures
+        failures += 1
+        raise ModelHTTPError(status_code=500, model_name='flaky', body=None)
+
+    flaky_model = FunctionModel(flaky_response)
+    fallback_model = FallbackModel(
+        flaky_model,
+        success_model,
+        circuit_breaker_threshold=2,
+        circuit_breaker_cooldown=30,
+        on_circuit_state_change=lambda breaker, old, new: transitions.append((breaker.model.model_name, old, new)),
+    )
+    agent = Agent(model=fallback_model)
+
+    for _ in range(4):
+        assert agent.run_sync('hello').data == 'success'
+    # the flaky model is skipped once its breaker opens
+    assert failures == 2
+    breaker = fallback_model.circuit_breakers[0]
+    assert breaker.state == 'open'
+    assert breaker.consecutive_failures == 2
+
+    # after the cooldown a single trial request is let through, which fails and reopens the breaker
+    now += 30
+    assert agent.run_sync('hello').data == 'success'
+    assert failures == 3
+    assert breaker.state == 'open'
+    assert agent.run_sync('hello').data == 'success'
+    assert failures == 3
+
+    # once the model has recovered, the trial request closes the breaker
+    now += 30
+    fallback_model.circuit_breakers[0].model = fallback_model.models[0] = success_model
+    assert agent.run_sync('hello').data == 'success'
+    assert breaker.state == 'closed'
+    assert transitions == snapshot(
+        [
+            ('function:flaky_response:', 'closed', 'open'),
+            ('function:flaky_response:', 'open', 'half-open'),
+            ('function:flaky_response:', 'half-open', 'open'),
+            ('function:success_response:', 'open', 'half-open'),
+            ('function:success_response:', 'half-open', 'closed'),
+        ]
+    )
+
+
+def test_circuit_breaker_all_open() -> None:
+    fallback_model = FallbackModel(failure_model, failure_model, circuit_breaker_threshold=1)
+    agent = Agent(model=fallback_model)
+    for _ in range(2):
+        with pytest.raises(ExceptionGroup) as exc_info:
+            agent.run_sync('hello')
+        # with every breaker open, all models are tried rather than none
+        assert len(exc_info.value.exceptions) == 2
+    assert [breaker.state for breaker in fallback_model.circuit_breakers] == ['open', 'open']
+
+
+def test_circuit_breaker_ignores_other_exceptions() -> None:
+    potato_model = FunctionModel(potato_exception_response)
+    fallback_model = FallbackModel(potato_model, success_model, circuit_breaker_threshold=1)
+    with pytest.raises(PotatoException):
+        Agent(model=fallback_model).run_sync('hello')
+    assert fallback_model.circuit_breakers[0].state == 'closed'
+
+
+async def test_order_by_health() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(
+        failure_model, slow_model(calls, 0.02, 'slow'), slow_model(calls, 0, 'fast'), order_by_health=True
+    )
+    agent = Agent(model=fallback_model)
+    # the slow model is tried first, until the fast model has been used
+    assert (await agent.run('hello')).data == 'slow'
+    breakers = fallback_model.circuit_breakers
+    breakers[2].latency = 0.0
+    assert (await agent.run('hello')).data == 'fast'
+    assert (await agent.run('hello')).data == 'fast'
+    assert calls == snapshot(['slow start', 'fast start', 'fast start'])
+    assert breakers[0].error_rate == snapshot(0.1)
+    assert breakers[1].expected_latency() > breakers[2].expected_latency()
+
+
+async def test_circuit_breaker_hedged_cancel() -> None:
+    calls: list[str] = []
+    fallback_model = FallbackModel(
+        slow_model(calls, 10, 'slow'), slow_model(calls, 0, 'fast'), hedge_after=0.01, circuit_breaker_threshold=1
+    )
+    await Agent(model=fallback_model).run('hello')
+    # a request cancelled because another model responded first isn't a failure
+    assert [breaker.state for breaker in fallback_model.circuit_breakers] == ['closed', 'closed']
+    assert fallback_model.circuit_breakers[0].error_rate == 0
@@ -18,6 +18,7 @@ from pydantic_ai.exceptions import ModelHTTPError
 from pydantic_ai.messages import (
     BinaryContent,
     ImageUrl,
+    ModelMessage,
     ModelRequest,
     ModelResponse,
     RetryPromptPart,
@@ -27,7 +28,7 @@ from pydantic_ai.messages import (
     ToolReturnPart,
     UserPromptPart,
 )
-from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models import DownloadedMedia, MediaDownloadCache, ModelRequestParameters
 from pydantic_ai.models.gemini import (
     ApiKeyAuth,
     GeminiModel,
@@ -41,6 +42,7 @@ from pydantic_ai.models.gemini import (
     _GeminiFunctionCallingConfig,
     _GeminiResponse,
     _GeminiSafetyRating,
+    _GeminiStreamParser,
     _GeminiToolConfig,
     _GeminiTools,
     _GeminiUsageMetaData,
@@ -693,6 +695,29 @@ async def test_stream_invalid_unicode_text(get_gemini_client: GetGeminiClient):
     assert result.usage() == snapshot(Usage(requests=1, request_tokens=2, response_tokens=4, total_tokens=6))
 
 
+def test_stream_parser_byte_by_byte():
+    responses = [
+        gemini_response(_content_model_response(ModelResponse(parts=[TextPart('brackets [{ and quotes "}]\\')]))),
+        gemini_response(_content_model_response(ModelResponse(parts=[TextPart('€ unicode ✓')]))),
+        gemini_response(_content_model_response(ModelResponse(parts=[ToolCallPart('foo', {'x': ['a', {'b': '}'}]})]))),
+    ]
+    json_data = _gemini_streamed_response_ta.dump_json(responses, by_alias=True, indent=2)
+
+    parser = _GeminiStreamParser()
+    parsed: list[_GeminiResponse] = []
+    completed_at: list[int] = []
+    for i in range(len(json_data)):
+        new_responses = parser.feed(json_data[i : i + 1])
+        parsed.extend(new_responses)
+        completed_at.extend(i for _ in new_responses)
+
+    assert parsed == _gemini_streamed_response_ta.validate_json(json_data)
+    # each response is emitted as soon as its closing brace arrives, not at the end of the stream
+    assert completed_at[0] < completed_at[1] < completed_at[2] < len(json_data) - 1
+    # the parser only holds on to the bytes of the response which is currently incomplete
+    assert parser._buffer == bytearray()
+
+
 async def test_stream_text_no_data(get_gemini_client: GetGeminiClient):
     responses = [_GeminiResponse(candidates=[], usage_metadata=example_usage())]
     json_data = _gemini_streamed_response_ta.dump_json(responses, by_alias=True)
@@ -1010,3 +1035,43 @@ async def test_image_url_input(allow_model_requests: None, gemini_api_key: str)
 
     result = await agent.run(['What is the name of this fruit?', image_url])
     assert result.data == snapshot('This is not a fruit, it is an organ console.')
+
+
+async def test_image_urls_downloaded_together(monkeypatch: pytest.MonkeyPatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=request.url.path.encode(), headers={'Content-Type': 'image/png'})
+
+    cache = MediaDownloadCache(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    get_many_calls: list[list[str]] = []
+    get_many = cache.get_many
+
+    async def recording_get_many(urls: Sequence[str]) -> dict[str, DownloadedMedia]:
+        get_many_calls.append(list(urls))
+        return await get_many(urls)
+
+    monkeypatch.setattr(cache, 'get_many', recording_get_many)
+    monkeypatch.setattr('pydantic_ai.models.gemini.cached_media_downloads', lambda: cache)
+
+    m = GeminiModel('gemini-1.5-flash', api_key='via-arg')
+    messages: list[ModelMessage] = [
+        ModelRequest(parts=[UserPromptPart(['first', ImageUrl('https://example.com/a')])]),
+        ModelResponse(parts=[TextPart('ok')]),
+        ModelRequest(
+            parts=[UserPromptPart(['second', ImageUrl('https://example.com/b'), ImageUrl('https://example.com/c.png')])]
+        ),
+    ]
+    _, contents = await m._message_to_gemini_content(messages)
+    # the files of every message are downloaded with one call, except those whose mime type is known from the URL
+    assert get_many_calls == [['https://example.com/a', 'https://example.com/b']]
+    assert contents[2]['parts'] == snapshot(
+        [
+            {'text': 'second'},
+            {'inline_data': {'data': 'L2I=', 'mime_type': 'image/png'}},
+            {'file_data': {'file_uri': 'https://example.com/c.png', 'mime_type': 'image/png'}},
+        ]
+    )
+
+    # messages which were already mapped aren't downloaded again
+    messages.append(ModelRequest(parts=[UserPromptPart('third')]))
+    await m._message_to_gemini_content(messages)
+    assert get_many_calls[-1] == []
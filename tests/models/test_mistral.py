@@ -20,13 +20,18 @@ from pydantic_ai.messages import (
     ImageUrl,
     ModelRequest,
     ModelResponse,
+    PartDeltaEvent,
+    PartStartEvent,
     RetryPromptPart,
     SystemPromptPart,
     TextPart,
     ToolCallPart,
+    ToolCallPartDelta,
     ToolReturnPart,
     UserPromptPart,
 )
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.tools import ToolDefinition
 
 from ..conftest import IsNow, raise_if_exception, try_import
 from .mock_async_stream import MockAsyncStream
@@ -54,7 +59,7 @@ with try_import() as imports_successful:
 
     from pydantic_ai.models.mistral import (
         MistralModel,
-        MistralStreamedResponse,
+        _required_fields_check,  # pyright: ignore[reportPrivateUsage]
     )
 
     # note: we use Union here so that casting works with Python 3.9
@@ -996,6 +1001,50 @@ async def test_stream_result_type_basemodel_with_required_params(allow_model_req
         assert result.usage().response_tokens == len(stream)
 
 
+async def test_stream_result_tool_deltas(allow_model_requests: None):
+    stream = [
+        text_chunk('{"first": "One"'),
+        text_chunk(', "second": "T'),
+        text_chunk('wo"}'),
+        chunk([]),
+    ]
+    mock_client = MockMistralAI.create_stream_mock(stream)
+    model = MistralModel('mistral-large-latest', client=mock_client)
+
+    both_tool = ToolDefinition(
+        'both_result',
+        'Both values',
+        {
+            'type': 'object',
+            'required': ['first', 'second'],
+            'properties': {'first': {'type': 'string'}, 'second': {'type': 'string'}},
+        },
+    )
+    first_tool = ToolDefinition(
+        'first_result',
+        'First value',
+        {'type': 'object', 'required': ['first'], 'properties': {'first': {'type': 'string'}}},
+    )
+    params = ModelRequestParameters(function_tools=[], allow_text_result=False, result_tools=[both_tool, first_tool])
+    async with model.request_stream([ModelRequest(parts=[UserPromptPart('')])], None, params) as response:
+        events = [event async for event in response]
+
+    # once a result tool matches, later text is emitted as JSON deltas, and the tool is checked again at the end
+    assert events == snapshot(
+        [
+            PartStartEvent(index=0, part=ToolCallPart(tool_name='first_result', args='{"first": "One"')),
+            PartDeltaEvent(index=0, delta=ToolCallPartDelta(args_delta=', "second": "T')),
+            PartDeltaEvent(index=0, delta=ToolCallPartDelta(args_delta='wo"}')),
+            PartStartEvent(
+                index=0, part=ToolCallPart(tool_name='both_result', args='{"first": "One", "second": "Two"}')
+            ),
+        ]
+    )
+    assert response.get().parts == snapshot(
+        [ToolCallPart(tool_name='both_result', args='{"first": "One", "second": "Two"}')]
+    )
+
+
 #####################
 ## Completion Function call
 #####################
@@ -1735,7 +1784,7 @@ def test_generate_user_output_format_multiple():
     ],
 )
 def test_validate_required_json_schema(desc: str, schema: dict[str, Any], data: dict[str, Any], expected: bool) -> None:
-    result = MistralStreamedResponse._validate_required_json_schema(data, schema)  # pyright: ignore[reportPrivateUsage]
+    result = _required_fields_check(schema)(data)
     assert result == expected, f'{desc} — expected {expected}, got {result}'
 
 
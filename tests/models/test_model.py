@@ -1,12 +1,33 @@
+import asyncio
+import gc
+from collections.abc import Iterator
 from importlib import import_module
+from typing import Any
 
+import httpx
 import pytest
 
 from pydantic_ai import UserError
-from pydantic_ai.models import infer_model
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models import (
+    DownloadedMedia,
+    HTTPClientSettings,
+    HTTPPoolStats,
+    MediaDownloadCache,
+    MessageMappingCache,
+    ToolMappingCache,
+    cached_async_http_client,
+    close_cached_async_http_clients,
+    configure_http_clients,
+    http_client_pool_stats,
+    infer_model,
+)
+from pydantic_ai.tools import ToolDefinition
 
 from ..conftest import TestEnv
 
+pytestmark = pytest.mark.anyio
+
 TEST_CASES = [
     ('OPENAI_API_KEY', 'openai:gpt-3.5-turbo', 'gpt-3.5-turbo', 'openai', 'openai', 'OpenAIModel'),
     ('OPENAI_API_KEY', 'gpt-3.5-turbo', 'gpt-3.5-turbo', 'openai', 'openai', 'OpenAIModel'),
@@ -104,3 +125,274 @@ def test_infer_model(
 def test_infer_str_unknown():
     with pytest.raises(UserError, match='Unknown model: foobar'):
         infer_model('foobar')  # pyright: ignore[reportArgumentType]
+
+
+def test_message_mapping_cache():
+    cache = MessageMappingCache[str]()
+    request = ModelRequest(parts=[UserPromptPart('hello')])
+    text_part = TextPart('world')
+    response = ModelResponse(parts=[text_part])
+
+    assert cache.get(request) is None
+    assert cache.set(request, 'mapped request') == 'mapped request'
+    assert cache.set(response, 'mapped response') == 'mapped response'
+    assert cache.get(request) == 'mapped request'
+    assert cache.get(response) == 'mapped response'
+
+    # an equal but different message isn't a hit
+    assert cache.get(ModelRequest(parts=[UserPromptPart('hello')])) is None
+
+    # editing a part attribute, or replacing a part, means the message must be mapped again
+    text_part.content = 'edited'
+    assert cache.get(response) is None
+    cache.set(response, 'mapped edited response')
+    assert cache.get(response) == 'mapped edited response'
+    response.parts[0] = TextPart('replaced')
+    assert cache.get(response) is None
+    request.parts.append(UserPromptPart('again'))
+    assert cache.get(request) is None
+
+    # entries are dropped once their message is garbage collected
+    del request, response
+    gc.collect()
+    assert cache._entries == {}  # pyright: ignore[reportPrivateUsage]
+
+
+def test_tool_mapping_cache():
+    cache = ToolMappingCache[dict[str, Any]](max_size=2)
+    mapped: list[str] = []
+
+    def map_tool(tool_def: ToolDefinition) -> dict[str, Any]:
+        mapped.append(tool_def.name)
+        return {'name': tool_def.name, 'parameters': tool_def.parameters_json_schema}
+
+    def tool(name: str, description: str = 'a tool') -> ToolDefinition:
+        return ToolDefinition(name, description, {'type': 'object', 'properties': {'x': {'type': 'integer'}}})
+
+    # tool definitions are rebuilt for each request, so equal definitions share an entry
+    first = cache.map(tool('a'), map_tool)
+    assert cache.map(tool('a'), map_tool) is first
+    assert mapped == ['a']
+
+    # any change to the definition means it's mapped again
+    cache.map(tool('a', 'changed'), map_tool)
+    assert mapped == ['a', 'a']
+
+    # the least recently used entry is evicted beyond `max_size`
+    cache.map(tool('a'), map_tool)
+    cache.map(tool('b'), map_tool)
+    assert mapped == ['a', 'a', 'b']
+    cache.map(tool('a'), map_tool)
+    cache.map(tool('a', 'changed'), map_tool)
+    assert mapped == ['a', 'a', 'b', 'a']
+
+
+async def test_media_download_cache():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        path = request.url.path
+        if path == '/fresh.png':
+            return httpx.Response(
+                200, content=b'fresh', headers={'Content-Type': 'image/png', 'Cache-Control': 'max-age=60'}
+            )
+        elif path == '/etag.png':
+            if request.headers.get('If-None-Match') == '"v1"':
+                return httpx.Response(304, headers={'Cache-Control': 'no-cache'})
+            return httpx.Response(200, content=b'etag', headers={'ETag': '"v1"', 'Cache-Control': 'no-cache'})
+        elif path == '/no-store.png':
+            return httpx.Response(200, content=b'no-store', headers={'Cache-Control': 'no-store'})
+        else:
+            return httpx.Response(404)
+
+    cache = MediaDownloadCache(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    downloads = await cache.get_many(
+        ['https://example.com/fresh.png', 'https://example.com/etag.png', 'https://example.com/fresh.png']
+    )
+    assert downloads == {
+        'https://example.com/fresh.png': DownloadedMedia(data=b'fresh', media_type='image/png'),
+        'https://example.com/etag.png': DownloadedMedia(data=b'etag', media_type='application/octet-stream'),
+    }
+    assert (cache.hits, cache.misses, cache.revalidations) == (0, 2, 0)
+
+    # fresh entries are served from the cache, stale entries with an ETag are revalidated
+    assert (await cache.get('https://example.com/fresh.png')).data == b'fresh'
+    assert (await cache.get('https://example.com/etag.png')).data == b'etag'
+    assert requests[-1].headers['If-None-Match'] == '"v1"'
+    assert (cache.hits, cache.misses, cache.revalidations) == (2, 2, 1)
+    assert len(requests) == 3
+
+    # no-store responses aren't cached
+    await cache.get('https://example.com/no-store.png')
+    await cache.get('https://example.com/no-store.png')
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get('https://example.com/missing.png')
+
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.revalidations) == (0, 0, 0)
+    await cache.get('https://example.com/fresh.png')
+    assert cache.misses == 1
+
+
+async def test_media_download_cache_freshness():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        path = request.url.path
+        headers = {'Date': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+        if path == '/expires':
+            headers['Expires'] = 'Wed, 01 Jan 2025 00:01:00 GMT'
+        elif path == '/expired':
+            headers['Expires'] = '0'
+        elif path == '/last-modified':
+            if request.headers.get('If-Modified-Since') == 'Tue, 31 Dec 2024 00:00:00 GMT':
+                return httpx.Response(304)
+            headers['Last-Modified'] = 'Tue, 31 Dec 2024 00:00:00 GMT'
+        return httpx.Response(200, content=path.encode(), headers=headers)
+
+    cache = MediaDownloadCache(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    for path in ['/expires', '/expired', '/no-headers', '/last-modified']:
+        await cache.get(f'https://example.com{path}')
+        await cache.get(f'https://example.com{path}')
+    # `Expires` and `Last-Modified` make a response fresh, an invalid `Expires` or no caching headers don't
+    assert [r.url.path for r in requests] == [
+        '/expires',
+        '/expired',
+        '/expired',
+        '/no-headers',
+        '/no-headers',
+        '/last-modified',
+    ]
+
+    # once stale, a `Last-Modified` response is revalidated
+    cache = MediaDownloadCache(default_ttl=0, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    await cache.get('https://example.com/last-modified')
+    await cache.get('https://example.com/last-modified')
+    assert cache.revalidations == 1
+    assert requests[-1].headers['If-Modified-Since'] == 'Tue, 31 Dec 2024 00:00:00 GMT'
+
+
+async def test_media_download_cache_concurrent():
+    release = asyncio.Event()
+    requests = 0
+
+    class SlowTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            await release.wait()
+            return httpx.Response(200, content=b'data')
+
+    cache = MediaDownloadCache(http_client=httpx.AsyncClient(transport=SlowTransport()))
+    first = asyncio.create_task(cache.get('https://example.com/a'))
+    second = asyncio.create_task(cache.get('https://example.com/a'))
+    await asyncio.sleep(0.01)
+    # a caller being cancelled doesn't cancel the download for the other
+    first.cancel()
+    release.set()
+    assert (await second).data == b'data'
+    assert requests == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache._downloads == {}  # pyright: ignore[reportPrivateUsage]
+
+
+async def test_media_download_cache_evicts_least_recently_used():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=request.url.path.encode(), headers={'Cache-Control': 'max-age=60'})
+
+    cache = MediaDownloadCache(max_bytes=6, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    await cache.get('https://example.com/a')
+    await cache.get('https://example.com/b')
+    await cache.get('https://example.com/c')
+    await cache.get('https://example.com/a')
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # adding `d` evicts `b`, the least recently used
+    await cache.get('https://example.com/d')
+    await cache.get('https://example.com/a')
+    await cache.get('https://example.com/b')
+    assert (cache.hits, cache.misses) == (2, 5)
+
+    # files larger than the cache aren't stored
+    await cache.get('https://example.com/too-large')
+    await cache.get('https://example.com/too-large')
+    assert (cache.hits, cache.misses) == (2, 7)
+
+
+@pytest.fixture
+def reset_http_client_settings() -> Iterator[None]:
+    yield
+    configure_http_clients(HTTPClientSettings())
+
+
+@pytest.mark.usefixtures('reset_http_client_settings')
+async def test_cached_async_http_client_per_provider():
+    shared_client = cached_async_http_client(provider='openai')
+    assert shared_client is cached_async_http_client(provider='anthropic')
+
+    configure_http_clients(HTTPClientSettings(per_provider=True))
+    # clients created before reconfiguring stay open for the models using them
+    assert not shared_client.is_closed
+    openai_client = cached_async_http_client(provider='openai')
+    assert openai_client is cached_async_http_client(provider='openai')
+    assert openai_client is not cached_async_http_client(provider='anthropic')
+    assert openai_client is not cached_async_http_client(timeout=10, provider='openai')
+
+    await close_cached_async_http_clients()
+    assert openai_client.is_closed
+    assert shared_client.is_closed
+    assert cached_async_http_client(provider='openai') is not openai_client
+
+
+def test_configure_http2_requires_h2():
+    try:
+        import h2  # noqa: F401  # pyright: ignore[reportMissingImports,reportUnusedImport]
+    except ImportError:
+        with pytest.raises(UserError, match='HTTP/2 requires the `h2` package'):
+            configure_http_clients(HTTPClientSettings(http2=True))
+    else:  # pragma: no cover
+        pytest.skip('h2 is installed')
+
+
+@pytest.mark.usefixtures('reset_http_client_settings')
+async def test_http_client_pool_stats():
+    release = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # serve requests on the connection until the client closes it
+        while not reader.at_eof():
+            try:
+                await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            await release.wait()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok')
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        configure_http_clients(HTTPClientSettings(max_connections=1, per_provider=True))
+        client = cached_async_http_client(provider='local')
+        tasks = [asyncio.create_task(client.get(f'http://127.0.0.1:{port}/')) for _ in range(3)]
+        while http_client_pool_stats().get('local') != HTTPPoolStats(
+            waiting_requests=2, active_connections=1, idle_connections=0, max_connections=1
+        ):
+            await asyncio.sleep(0.01)
+
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        assert [r.text for r in responses] == ['ok', 'ok', 'ok']
+        assert http_client_pool_stats() == {
+            'local': HTTPPoolStats(waiting_requests=0, active_connections=0, idle_connections=1, max_connections=1)
+        }
+    finally:
+        server.close()
+        await close_cached_async_http_clients()
+        assert http_client_pool_stats() == {}
@@ -200,6 +200,25 @@ async def test_request_simple_success(allow_model_requests: None):
     ]
 
 
+async def test_request_reuses_mapped_messages(allow_model_requests: None):
+    c = completion_message(ChatCompletionMessage(content='world', role='assistant'))
+    mock_client = MockOpenAI.create_mock(c)
+    agent = Agent(OpenAIModel('gpt-4o', openai_client=mock_client))
+
+    result = await agent.run('hello')
+    history = result.all_messages()
+    await agent.run('hello again', message_history=history)
+    first_kwargs, second_kwargs = get_mock_chat_completion_kwargs(mock_client)
+    assert second_kwargs['messages'][0] is first_kwargs['messages'][0]
+
+    # editing the history means the edited message is mapped again
+    history[0] = ModelRequest(parts=[UserPromptPart('edited')])
+    await agent.run('hello again', message_history=history)
+    third_kwargs = get_mock_chat_completion_kwargs(mock_client)[2]
+    assert third_kwargs['messages'][0] == {'content': 'edited', 'role': 'user'}
+    assert third_kwargs['messages'][1] is second_kwargs['messages'][1]
+
+
 async def test_request_simple_usage(allow_model_requests: None):
     c = completion_message(
         ChatCompletionMessage(content='world', role='assistant'),
@@ -0,0 +1,155 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, UserPromptPart
+from pydantic_ai.models import rate_limited
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.rate_limited import RateLimitedModel, estimate_request_tokens
+
+from ..conftest import try_import
+
+with try_import() as imports_successful:
+    from logfire.testing import CaptureLogfire
+
+    from pydantic_ai.models.instrumented import InstrumentedModel
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+    sleeps: list[float] = field(default_factory=list[float])
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limited, 'time', SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(
+        rate_limited, 'asyncio', SimpleNamespace(sleep=clock.sleep, CancelledError=asyncio.CancelledError)
+    )
+    return clock
+
+
+def success_response(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> ModelResponse:
+    return ModelResponse(parts=[TextPart('success')])
+
+
+async def success_response_stream(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> AsyncIterator[str]:
+    yield 'hello '
+    yield 'world'
+
+
+def test_init() -> None:
+    model = RateLimitedModel(FunctionModel(success_response), requests_per_minute=10)
+    assert model.model_name == snapshot('function:success_response:')
+    assert model.system is None
+
+
+async def test_requests_per_minute(clock: FakeClock) -> None:
+    agent = Agent(RateLimitedModel(FunctionModel(success_response), requests_per_minute=2))
+    for _ in range(3):
+        result = await agent.run('hello')
+        assert result.data == snapshot('success')
+    assert clock.sleeps == snapshot([30.0])
+
+    clock.now += 60
+    await agent.run('hello')
+    assert clock.sleeps == snapshot([30.0])
+
+
+async def test_requests_per_minute_concurrent(clock: FakeClock) -> None:
+    agent = Agent(RateLimitedModel(FunctionModel(success_response), requests_per_minute=60))
+    await asyncio.gather(*[agent.run('hello') for _ in range(62)])
+    assert clock.sleeps == snapshot([1.0, 2.0])
+
+
+async def test_tokens_per_minute(clock: FakeClock) -> None:
+    model = RateLimitedModel(FunctionModel(success_response), tokens_per_minute=100, estimate_tokens=lambda _: 30)
+    agent = Agent(model)
+    result = await agent.run('hello')
+    assert result.usage().total_tokens == snapshot(52)
+    # the estimate of 30 tokens is corrected to the actual usage
+    assert model._token_bucket._level == snapshot(48.0)  # pyright: ignore[reportPrivateUsage,reportOptionalMemberAccess]
+
+    await agent.run('hello')
+    assert clock.sleeps == snapshot([])
+    await agent.run('hello')
+    assert clock.sleeps == snapshot([20.4])
+
+
+async def test_tokens_per_minute_stream(clock: FakeClock) -> None:
+    model = RateLimitedModel(
+        FunctionModel(stream_function=success_response_stream), tokens_per_minute=100, estimate_tokens=lambda _: 30
+    )
+    agent = Agent(model)
+    async with agent.run_stream('hello') as result:
+        assert await result.get_data() == snapshot('hello world')
+    assert result.usage().total_tokens == snapshot(52)
+    assert model._token_bucket._level == snapshot(48.0)  # pyright: ignore[reportPrivateUsage,reportOptionalMemberAccess]
+
+
+async def test_estimate_larger_than_bucket(clock: FakeClock) -> None:
+    model = RateLimitedModel(FunctionModel(success_response), tokens_per_minute=100, estimate_tokens=lambda _: 500)
+    agent = Agent(model)
+    await agent.run('hello')
+    # only the 100 tokens the bucket holds were reserved, so the correction is from those, not the estimate
+    assert model._token_bucket._level == snapshot(48.0)  # pyright: ignore[reportPrivateUsage,reportOptionalMemberAccess]
+
+
+async def test_failed_request_refund(clock: FakeClock) -> None:
+    def failure_response(_model_messages: list[ModelMessage], _agent_info: AgentInfo) -> ModelResponse:
+        raise ModelHTTPError(status_code=429, model_name='test')
+
+    model = RateLimitedModel(FunctionModel(failure_response), tokens_per_minute=100, estimate_tokens=lambda _: 30)
+    with pytest.raises(ModelHTTPError):
+        await Agent(model).run('hello')
+    # the failed request used no tokens, so all of those reserved for it are given back
+    assert model._token_bucket._level == snapshot(100.0)  # pyright: ignore[reportPrivateUsage,reportOptionalMemberAccess]
+
+
+async def test_cancelled_refund() -> None:
+    model = RateLimitedModel(FunctionModel(success_response), requests_per_minute=1)
+    agent = Agent(model)
+    await agent.run('hello')
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(agent.run('hello'), timeout=0.01)
+    # the cancelled request doesn't count towards the limit
+    level = model._request_bucket._level  # pyright: ignore[reportPrivateUsage,reportOptionalMemberAccess]
+    assert 0 <= level < 0.01
+
+
+@pytest.mark.skipif(not imports_successful(), reason='logfire not installed')
+async def test_queue_delay_attribute(clock: FakeClock, capfire: CaptureLogfire) -> None:
+    agent = Agent(InstrumentedModel(RateLimitedModel(FunctionModel(success_response), requests_per_minute=1)))
+    await agent.run('hello')
+    await agent.run('hello')
+    delays = [
+        span['attributes'][rate_limited.QUEUE_DELAY_ATTRIBUTE]
+        for span in capfire.exporter.exported_spans_as_dict()
+        if span['name'].startswith('chat ')
+    ]
+    assert delays == snapshot([0.0, 60.0])
+
+
+def test_estimate_request_tokens() -> None:
+    messages: list[ModelMessage] = [
+        ModelRequest(parts=[UserPromptPart('What is the capital of France?')]),
+        ModelResponse(parts=[TextPart('Let me check.'), ToolCallPart('get_capital', {'country': 'France'})]),
+    ]
+    assert estimate_request_tokens(messages) == snapshot(19)
@@ -0,0 +1,228 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models import retrying
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.retrying import RetryingModel
+
+from ..conftest import try_import
+
+with try_import() as imports_successful:
+    from openai import AsyncOpenAI
+
+    from pydantic_ai.models.openai import OpenAIModel
+
+pytestmark = pytest.mark.anyio
+
+
+@dataclass
+class FlakyServer:
+    """Stand-in for an OpenAI compatible API, which fails with each of `failures` before succeeding."""
+
+    failures: list[httpx.Response]
+    stream: bool = False
+    requests: int = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.failures:
+            return self.failures.pop(0)
+        if self.stream:
+            chunks = [
+                {
+                    'id': '1',
+                    'object': 'chat.completion.chunk',
+                    'created': 0,
+                    'model': 'gpt-4o',
+                    'choices': [{'index': 0, 'delta': {'content': text}, 'finish_reason': None}],
+                }
+                for text in ('hello ', 'world')
+            ]
+            body = ''.join(f'data: {json.dumps(chunk)}\n\n' for chunk in chunks) + 'data: [DONE]\n\n'
+            return httpx.Response(200, content=body, headers={'content-type': 'text/event-stream'})
+        return httpx.Response(
+            200,
+            json={
+                'id': '1',
+                'object': 'chat.completion',
+                'created': 0,
+                'model': 'gpt-4o',
+                'choices': [
+                    {
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': 'hello world'},
+                        'finish_reason': 'stop',
+                    }
+                ],
+            },
+        )
+
+    def model(self) -> OpenAIModel:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        # disable the client's own retries, so only RetryingModel retries
+        client = AsyncOpenAI(api_key='test', base_url='http://test/v1', http_client=http_client, max_retries=0)
+        return OpenAIModel('gpt-4o', openai_client=client)
+
+
+@dataclass
+class FakeTime:
+    now: float = 0.0
+    sleeps: list[float] = field(default_factory=list[float])
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def fake_time(monkeypatch: pytest.MonkeyPatch) -> FakeTime:
+    fake_time = FakeTime()
+    monkeypatch.setattr(retrying, 'time', SimpleNamespace(monotonic=fake_time.monotonic))
+    monkeypatch.setattr(retrying, 'asyncio', SimpleNamespace(sleep=fake_time.sleep))
+    return fake_time
+
+
+def error_response(status_code: int, headers: dict[str, str] | None = None) -> httpx.Response:
+    return httpx.Response(status_code, json={'error': {'message': 'try again'}}, headers=headers)
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_retry_until_success(
+    fake_time: FakeTime, allow_model_requests: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def upper_bound(a: float, b: float) -> float:
+        return b
+
+    # take the longest delay allowed, rather than a random one
+    monkeypatch.setattr(retrying, 'random', SimpleNamespace(uniform=upper_bound))
+    server = FlakyServer([error_response(500), error_response(503), error_response(502)])
+    agent = Agent(RetryingModel(server.model(), initial_delay=1))
+    result = await agent.run('hello')
+    assert result.data == snapshot('hello world')
+    assert server.requests == 4
+    assert fake_time.sleeps == snapshot([1.0, 2.0, 4.0])
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_retry_after(fake_time: FakeTime, allow_model_requests: None) -> None:
+    retry_at = format_datetime(datetime.now(tz=timezone.utc) + timedelta(seconds=120), usegmt=True)
+    server = FlakyServer(
+        [
+            error_response(429, {'Retry-After': '7'}),
+            error_response(429, {'retry-after-ms': '1500'}),
+            error_response(429, {'Retry-After': retry_at}),
+        ]
+    )
+    agent = Agent(RetryingModel(server.model(), max_retry_time=None))
+    result = await agent.run('hello')
+    assert result.data == snapshot('hello world')
+    assert fake_time.sleeps[:2] == snapshot([7.0, 1.5])
+    assert 115 < fake_time.sleeps[2] <= 120
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_max_retries(fake_time: FakeTime, allow_model_requests: None) -> None:
+    server = FlakyServer([error_response(500) for _ in range(5)])
+    agent = Agent(RetryingModel(server.model(), max_retries=2))
+    with pytest.raises(ModelHTTPError) as exc_info:
+        await agent.run('hello')
+    assert exc_info.value.status_code == 500
+    assert server.requests == 3
+    assert len(fake_time.sleeps) == 2
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_max_retry_time(fake_time: FakeTime, allow_model_requests: None) -> None:
+    server = FlakyServer([error_response(429, {'retry-after': '20'}) for _ in range(5)])
+    agent = Agent(RetryingModel(server.model(), max_retry_time=45))
+    with pytest.raises(ModelHTTPError):
+        await agent.run('hello')
+    # a third retry would start 60 seconds after the first attempt
+    assert fake_time.sleeps == snapshot([20.0, 20.0])
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_not_retryable(fake_time: FakeTime, allow_model_requests: None) -> None:
+    server = FlakyServer([error_response(400)])
+    agent = Agent(RetryingModel(server.model()))
+    with pytest.raises(ModelHTTPError) as exc_info:
+        await agent.run('hello')
+    assert exc_info.value.status_code == 400
+    assert server.requests == 1
+    assert fake_time.sleeps == []
+
+
+@pytest.mark.skipif(not imports_successful(), reason='openai not installed')
+async def test_stream_retry(fake_time: FakeTime, allow_model_requests: None) -> None:
+    server = FlakyServer([error_response(503), error_response(429, {'retry-after': '2'})], stream=True)
+    agent = Agent(RetryingModel(server.model()))
+    async with agent.run_stream('hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == snapshot(['hello ', 'hello world'])
+    assert server.requests == 3
+    assert fake_time.sleeps[1] == 2
+
+
+async def test_stream_failure_after_first_event_not_retried(fake_time: FakeTime) -> None:
+    calls = 0
+
+    async def stream_function(_messages: list[ModelMessage], _info: AgentInfo) -> AsyncIterator[str]:
+        nonlocal calls
+        calls += 1
+        yield 'hello '
+        raise ModelHTTPError(status_code=503, model_name='test')
+
+    agent = Agent(RetryingModel(FunctionModel(stream_function=stream_function)))
+    with pytest.raises(ModelHTTPError):
+        async with agent.run_stream('hello') as result:
+            await result.get_data()
+    assert calls == 1
+    assert fake_time.sleeps == []
+
+
+async def test_stream_failure_before_first_event_retried(fake_time: FakeTime) -> None:
+    calls = 0
+
+    async def stream_function(_messages: list[ModelMessage], _info: AgentInfo) -> AsyncIterator[str]:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ModelHTTPError(status_code=503, model_name='test')
+        yield 'hello'
+
+    agent = Agent(RetryingModel(FunctionModel(stream_function=stream_function)))
+    async with agent.run_stream('hello') as result:
+        assert await result.get_data() == snapshot('hello')
+    assert calls == 2
+
+
+async def test_retry_on() -> None:
+    calls = 0
+
+    def response(_messages: list[ModelMessage], _info: AgentInfo) -> ModelResponse:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise asyncio.TimeoutError()
+        return ModelResponse(parts=[TextPart('success')])
+
+    model = RetryingModel(
+        FunctionModel(response), initial_delay=0, retry_on=lambda exc: isinstance(exc, asyncio.TimeoutError)
+    )
+    assert (await Agent(model).run('hello')).data == snapshot('success')
+    assert calls == 2
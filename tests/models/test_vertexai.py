@@ -1,6 +1,8 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -77,6 +79,37 @@ async def test_init_env(mocker: MockerFixture, allow_model_requests: None):
     assert patch.call_count == 1
 
 
+async def test_init_concurrent(mocker: MockerFixture, allow_model_requests: None):
+    patch = mocker.patch(
+        'pydantic_ai.models.vertexai.google.auth.default',
+        return_value=(NoOpCredentials(), 'my-project-id'),
+    )
+    model = VertexAIModel('gemini-1.5-flash')
+
+    await asyncio.gather(*(model.ainit() for _ in range(10)))
+
+    assert patch.call_count == 1
+    assert model.url is not None
+    assert model.auth is not None
+    assert model._init_task is None
+
+
+async def test_init_retry_after_failure(mocker: MockerFixture, allow_model_requests: None):
+    patch = mocker.patch(
+        'pydantic_ai.models.vertexai.google.auth.default',
+        side_effect=[RuntimeError('auth failed'), (NoOpCredentials(), 'my-project-id')],
+    )
+    model = VertexAIModel('gemini-1.5-flash')
+
+    with pytest.raises(RuntimeError, match='auth failed'):
+        await model.ainit()
+    assert model._auth is None
+
+    await model.ainit()
+    assert patch.call_count == 2
+    assert model.auth is not None
+
+
 async def test_init_right_project_id(tmp_path: Path, allow_model_requests: None):
     service_account_path = tmp_path / 'service_account.json'
     save_service_account(service_account_path, 'my-project-id')
@@ -146,6 +179,59 @@ async def test_bearer_token():
     assert t.token_created == IsNow()
 
 
+class SlowRefreshCredentials(Credentials):
+    refresh_count: int = 0
+
+    def refresh(self, request: Any):
+        time.sleep(0.01)
+        self.refresh_count += 1
+        self.token = f'custom-token-{self.refresh_count}'
+
+
+def slow_refresh_credentials() -> SlowRefreshCredentials:
+    # noinspection PyTypeChecker
+    return SlowRefreshCredentials(
+        signer=None,
+        service_account_email='test@example.com',
+        token_uri='https://example.com/token',
+        project_id='my-project-id',
+    )
+
+
+async def test_bearer_token_concurrent_refresh():
+    creds = slow_refresh_credentials()
+    t = BearerTokenAuth(creds)
+
+    all_headers = await asyncio.gather(*(t.headers() for _ in range(10)))
+    assert all_headers == [{'Authorization': 'Bearer custom-token-1'}] * 10
+    assert creds.refresh_count == 1
+
+    t.token_created = datetime.now() - timedelta(seconds=4000)
+    all_headers = await asyncio.gather(*(t.headers() for _ in range(10)))
+    assert all_headers == [{'Authorization': 'Bearer custom-token-2'}] * 10
+    assert creds.refresh_count == 2
+
+
+async def test_bearer_token_background_refresh():
+    creds = slow_refresh_credentials()
+    t = BearerTokenAuth(creds)
+    await t.headers()
+    assert creds.refresh_count == 1
+
+    # the token is nearly expired, so it's refreshed in the background while requests keep using the current token
+    t.token_created = datetime.now() - timedelta(seconds=2800)
+    assert not t._token_expired()
+    all_headers = await asyncio.gather(*(t.headers() for _ in range(10)))
+    assert all_headers == [{'Authorization': 'Bearer custom-token-1'}] * 10
+    assert t._refresh_task is not None
+
+    await t._refresh_task
+    assert creds.refresh_count == 2
+    assert t.token_created == IsNow()
+    assert await t.headers() == snapshot({'Authorization': 'Bearer custom-token-2'})
+    assert creds.refresh_count == 2
+
+
 def save_service_account(service_account_path: Path, project_id: str) -> None:
     service_account = {
         'type': 'service_account',
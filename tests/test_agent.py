@@ -1,8 +1,9 @@
+import asyncio
 import json
 import re
 import sys
 from datetime import timezone
-from typing import Any, Callable, Union
+from typing import Annotated, Any, Callable, Union
 
 import httpx
 import pytest
@@ -11,7 +12,16 @@ from inline_snapshot import snapshot
 from pydantic import BaseModel, field_validator
 from pydantic_core import to_json
 
-from pydantic_ai import Agent, ModelRetry, RunContext, UnexpectedModelBehavior, UserError, capture_run_messages
+from pydantic_ai import (
+    Agent,
+    ModelRetry,
+    RunContext,
+    UnexpectedModelBehavior,
+    UsageLimitExceeded,
+    UserError,
+    capture_run_messages,
+)
+from pydantic_ai.agent import BatchRunItem
 from pydantic_ai.messages import (
     ModelMessage,
     ModelRequest,
@@ -28,6 +38,7 @@ from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.test import TestModel
 from pydantic_ai.result import Usage
 from pydantic_ai.tools import ToolDefinition
+from pydantic_ai.usage import UsageLimits
 
 from .conftest import IsNow, TestEnv
 
@@ -1572,3 +1583,182 @@ def test_custom_result_type_invalid() -> None:
 
     with pytest.raises(UserError, match='Cannot set a custom run `result_type` when the agent has result validators'):
         agent.run_sync('Hello', result_type=int)
+
+
+def test_graph_reused_across_runs() -> None:
+    agent = Agent('test', result_type=Foo, name='my_agent')
+
+    graph = agent._build_graph(None)  # pyright: ignore[reportPrivateUsage]
+    assert agent.run_sync('Hello').data == snapshot(Foo(a=0, b='a'))
+    assert agent._build_graph(None) is graph  # pyright: ignore[reportPrivateUsage]
+
+    bar_graph = agent._build_graph(Bar)  # pyright: ignore[reportPrivateUsage]
+    assert bar_graph is not graph
+    assert agent.run_sync('Hello', result_type=Bar).data == snapshot(Bar(c=0, d='a'))
+    assert agent._build_graph(Bar) is bar_graph  # pyright: ignore[reportPrivateUsage]
+
+
+def test_graph_cache_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr('pydantic_ai.agent._RESULT_SCHEMA_CACHE_SIZE', 1)
+    agent = Agent('test', result_type=Foo, name='my_agent')
+
+    graph = agent._build_graph(None)  # pyright: ignore[reportPrivateUsage]
+    assert agent._build_graph(Bar) is not graph  # pyright: ignore[reportPrivateUsage]
+    assert len(agent._graphs) == 1  # pyright: ignore[reportPrivateUsage]
+    assert agent._build_graph(None) is not graph  # pyright: ignore[reportPrivateUsage]
+
+
+def test_graph_rebuilt_after_name_inferred() -> None:
+    agent = Agent('test')
+
+    assert agent.run_sync('Hello', infer_name=False).data == snapshot('success (no tool calls)')
+    assert agent.name is None
+    assert agent.run_sync('Hello').data == snapshot('success (no tool calls)')
+    assert agent.name == 'agent'
+
+    graph = agent._build_graph(None)  # pyright: ignore[reportPrivateUsage]
+    assert graph.name == 'agent'
+    assert len(agent._graphs) == 1  # pyright: ignore[reportPrivateUsage]
+
+
+def test_result_schema_reused_across_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    agent = Agent('test')
+
+    result_schema = agent._prepare_result_schema(Foo)  # pyright: ignore[reportPrivateUsage]
+    assert agent.run_sync('Hello', result_type=Foo).data == snapshot(Foo(a=0, b='a'))
+    assert agent._prepare_result_schema(Foo) is result_schema  # pyright: ignore[reportPrivateUsage]
+
+    # unhashable result types still work, they're just not cached
+    unhashable_result_type: Any = Annotated[Foo, []]
+    assert agent._prepare_result_schema(unhashable_result_type) is not None  # pyright: ignore[reportPrivateUsage]
+
+    monkeypatch.setattr('pydantic_ai.agent._RESULT_SCHEMA_CACHE_SIZE', 1)
+    assert agent._prepare_result_schema(Bar) is not None  # pyright: ignore[reportPrivateUsage]
+    assert agent._prepare_result_schema(Foo) is not result_schema  # pyright: ignore[reportPrivateUsage]
+
+
+async def test_run_many():
+    running = 0
+    max_running = 0
+
+    async def model_func(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        nonlocal running, max_running
+        part = messages[0].parts[0]
+        assert isinstance(part, UserPromptPart) and isinstance(part.content, str)
+        user_prompt = part.content
+        running += 1
+        max_running = max(max_running, running)
+        # longer prompts take longer, so runs finish out of order
+        await asyncio.sleep(len(user_prompt) * 0.02)
+        running -= 1
+        if user_prompt == 'fail':
+            raise RuntimeError('model failed')
+        return ModelResponse(parts=[TextPart(user_prompt.upper())])
+
+    agent = Agent(FunctionModel(model_func))
+    prompts = ['ccc', 'a', 'fail', 'dddd', 'e']
+    async with agent.run_many(iter(prompts), concurrency=2) as batch_run:
+        items = [item async for item in batch_run]
+
+    assert max_running == 2
+    assert [(item.index, item.user_prompt) for item in items] == snapshot(
+        [(1, 'a'), (0, 'ccc'), (2, 'fail'), (4, 'e'), (3, 'dddd')]
+    )
+    assert [item.result.data if item.result else repr(item.error) for item in items] == snapshot(
+        ['A', 'CCC', "RuntimeError('model failed')", 'E', 'DDDD']
+    )
+
+    summary = batch_run.summary()
+    assert summary.runs == 5
+    assert summary.failures == 1
+    assert summary.usage is batch_run.usage()
+    # usage from every successful run is combined
+    assert summary.usage.requests == 4
+    assert 0 < summary.latency_p50 <= summary.latency_p95 <= summary.latency_max <= summary.duration
+    assert summary.throughput == summary.runs / summary.duration
+
+
+async def test_run_many_usage_limits():
+    agent = Agent(TestModel())
+    items: list[BatchRunItem[str]] = []
+    async with agent.run_many(['a', 'b', 'c', 'd'], concurrency=1, usage_limits=UsageLimits(request_limit=2)) as batch:
+        with pytest.raises(UsageLimitExceeded, match='The next request would exceed the request_limit of 2'):
+            async for item in batch:
+                items.append(item)
+
+    # the limit applies across the batch, not to each run, and no more runs are started once it's reached
+    assert [item.user_prompt for item in items] == ['a', 'b']
+    assert batch.usage().requests == 2
+
+
+async def test_run_many_usage_limits_concurrent():
+    async def model_func(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(0.01)
+        if any(isinstance(part, ToolReturnPart) for message in messages for part in message.parts):
+            return ModelResponse(parts=[TextPart('done')])
+        return ModelResponse(parts=[ToolCallPart('work', {})])
+
+    agent = Agent(FunctionModel(model_func))
+
+    @agent.tool_plain
+    def work() -> str:
+        return 'ok'
+
+    items: list[BatchRunItem[str]] = []
+    async with agent.run_many(
+        [str(i) for i in range(10)], concurrency=5, usage_limits=UsageLimits(total_tokens_limit=150)
+    ) as batch:
+        with pytest.raises(UsageLimitExceeded):
+            async for item in batch:
+                items.append(item)
+
+    # each run alone is within the limit, but the runs in progress together exceed it
+    assert len(items) == 5
+    assert all(isinstance(item.error, UsageLimitExceeded) for item in items)
+    total_tokens = batch.usage().total_tokens
+    assert total_tokens is not None and total_tokens < 5 * 108
+
+
+async def test_run_many_no_batch_limit_by_default():
+    agent = Agent(TestModel())
+    async with agent.run_many([str(i) for i in range(60)], concurrency=4) as batch_run:
+        items = [item async for item in batch_run]
+
+    # the default per-run request limit doesn't apply to the batch, and each result has only its own usage
+    assert [item.error for item in items if item.error] == []
+    assert {item.result.usage().requests for item in items if item.result} == {1}
+    assert batch_run.usage().requests == 60
+
+
+async def test_run_many_stop_early():
+    cancelled: list[str] = []
+
+    async def model_func(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        part = messages[0].parts[0]
+        assert isinstance(part, UserPromptPart) and isinstance(part.content, str)
+        user_prompt = part.content
+        try:
+            await asyncio.sleep(0 if user_prompt == 'fast' else 10)
+        except asyncio.CancelledError:
+            cancelled.append(user_prompt)
+            raise
+        return ModelResponse(parts=[TextPart(user_prompt)])
+
+    agent = Agent(FunctionModel(model_func))
+    async with agent.run_many(['slow', 'fast', 'slower'], concurrency=2) as batch_run:
+        async for item in batch_run:
+            assert item.result is not None
+            assert item.result.data == 'fast'
+            break
+
+    # leaving the context manager cancels the runs still in progress, 'slower' was started but hadn't got as far
+    # as calling the model
+    assert cancelled == ['slow']
+    assert batch_run.summary().runs == 1
+
+
+async def test_run_many_invalid_concurrency():
+    agent = Agent(TestModel())
+    with pytest.raises(UserError, match='`concurrency` must be at least 1'):
+        async with agent.run_many(['a'], concurrency=0):
+            pass
@@ -0,0 +1,25 @@
+from pydantic_ai.messages import BinaryContent, ModelMessage, ModelMessagesTypeAdapter, ModelRequest, UserPromptPart
+
+
+def test_binary_content_encodings_cached():
+    content = BinaryContent(data=b'\x89PNG', media_type='image/png')
+    assert content.base64 == 'iVBORw=='
+    assert content.data_uri == 'data:image/png;base64,iVBORw=='
+    assert content.base64 is content.base64
+    assert content.data_uri is content.data_uri
+
+    content.media_type = 'image/jpeg'
+    assert content.data_uri == 'data:image/jpeg;base64,iVBORw=='
+
+    content.data = b'GIF89a'
+    assert content.base64 == 'R0lGODlh'
+    assert content.data_uri == 'data:image/jpeg;base64,R0lGODlh'
+
+
+def test_binary_content_encodings_not_serialized():
+    content = BinaryContent(data=b'\x89PNG', media_type='image/png')
+    assert content.data_uri
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart([content])])]
+    assert ModelMessagesTypeAdapter.dump_python(messages)[0]['parts'][0]['content'] == [
+        {'data': b'\x89PNG', 'media_type': 'image/png', 'kind': 'binary'}
+    ]
@@ -286,6 +286,49 @@ def test_handle_mixed_deltas_without_text_part_id(text_vendor_part_id: str | Non
         )
 
 
+def test_deltas_applied_lazily():
+    manager = ModelResponsePartsManager()
+
+    start_event = manager.handle_text_delta(vendor_part_id='text', content='a')
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name='tool', args='{"x":', tool_call_id=None)
+    for _ in range(3):
+        manager.handle_text_delta(vendor_part_id='text', content='b')
+        manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args=' 1', tool_call_id=None)
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args='}', tool_call_id='call_id')
+
+    parts = manager.get_parts()
+    assert parts == snapshot(
+        [
+            TextPart(content='abbb', part_kind='text'),
+            ToolCallPart(tool_name='tool', args='{"x": 1 1 1}', tool_call_id='call_id', part_kind='tool-call'),
+        ]
+    )
+    # parts are only rebuilt when a new delta arrives, and events which were already emitted aren't modified
+    assert all(a is b for a, b in zip(manager.get_parts(), parts))
+    assert start_event == snapshot(
+        PartStartEvent(index=0, part=TextPart(content='a', part_kind='text'), event_kind='part_start')
+    )
+
+    manager.handle_text_delta(vendor_part_id='text', content='c')
+    # overwriting a part discards any deltas which haven't been applied to it yet
+    manager.handle_tool_call_delta(vendor_part_id='call', tool_name=None, args=' 2', tool_call_id=None)
+    manager.handle_tool_call_part(vendor_part_id='call', tool_name='tool', args='{}')
+    assert manager.get_parts() == snapshot(
+        [
+            TextPart(content='abbbc', part_kind='text'),
+            ToolCallPart(tool_name='tool', args='{}', tool_call_id=None, part_kind='tool-call'),
+        ]
+    )
+
+
+def test_dict_args_delta_after_pending_json_args():
+    manager = ModelResponsePartsManager()
+    manager.handle_tool_call_delta(vendor_part_id=None, tool_name='tool', args='{"x":', tool_call_id=None)
+    manager.handle_tool_call_delta(vendor_part_id=None, tool_name=None, args=' 1}', tool_call_id=None)
+    with pytest.raises(UnexpectedModelBehavior, match=re.escape('Cannot apply dict deltas to non-dict tool arguments')):
+        manager.handle_tool_call_delta(vendor_part_id=None, tool_name=None, args={'y': 2}, tool_call_id=None)
+
+
 def test_cannot_convert_from_text_to_tool_call():
     manager = ModelResponsePartsManager()
     manager.handle_text_delta(vendor_part_id=1, content='hello')
@@ -26,7 +26,13 @@ from pydantic_ai.messages import (
 )
 from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.result import AgentStream, FinalResult, Usage
+from pydantic_ai.result import (
+    AgentStream,
+    FinalResult,
+    ResultPatchOperation,
+    Usage,
+    _json_patch,  # pyright: ignore[reportPrivateUsage]
+)
 from pydantic_graph import End
 
 from .conftest import IsNow
@@ -850,3 +856,99 @@ async def test_stream_iter_structured_validator() -> None:
                     async for output in stream.stream_output(debounce_by=None):
                         outputs.append(output)
     assert outputs == [ResultType(value='a (validated)'), ResultType(value='a (validated)')]
+
+
+def unchanged_args_stream_function(chunks: list[str]):
+    async def stream_function(_messages: list[ModelMessage], agent_info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        assert agent_info.result_tools is not None
+        yield {0: DeltaToolCall(name=agent_info.result_tools[0].name)}
+        for chunk in chunks:
+            yield {0: DeltaToolCall(json_args=chunk)}
+            # a delta which doesn't change the arguments
+            yield {0: DeltaToolCall(json_args='')}
+
+    return stream_function
+
+
+async def test_stream_skip_unchanged():
+    stream_function = unchanged_args_stream_function(['{"response": ["a"', ', "b', '"]}'])
+    agent = Agent(FunctionModel(stream_function=stream_function), result_type=list[str])
+
+    async with agent.run_stream('') as result:
+        assert [c async for c in result.stream(debounce_by=None)] == snapshot(
+            [['a'], ['a'], ['a', 'b'], ['a', 'b'], ['a', 'b'], ['a', 'b'], ['a', 'b']]
+        )
+
+    async with agent.run_stream('') as result:
+        assert [c async for c in result.stream(debounce_by=None, skip_unchanged=True)] == snapshot(
+            [['a'], ['a', 'b'], ['a', 'b'], ['a', 'b']]
+        )
+
+
+class Profile(BaseModel):
+    name: str
+    tags: list[str] = []
+    address: dict[str, str] = {}
+
+
+async def test_stream_patches():
+    chunks = ['{"name": "Sa', 'm", "tags": ["a", "b', '"], "address": {"a/b~c": "x', '"}}']
+    agent = Agent(FunctionModel(stream_function=unchanged_args_stream_function(chunks)), result_type=Profile)
+
+    async with agent.run_stream('') as result:
+        assert [p async for p in result.stream_patches(debounce_by=None)] == snapshot(
+            [
+                [{'op': 'replace', 'path': '', 'value': {'name': 'Sa', 'tags': [], 'address': {}}}],
+                [
+                    {'op': 'replace', 'path': '/name', 'value': 'Sam'},
+                    {'op': 'add', 'path': '/tags/0', 'value': 'a'},
+                    {'op': 'add', 'path': '/tags/1', 'value': 'b'},
+                ],
+                [{'op': 'add', 'path': '/address/a~1b~0c', 'value': 'x'}],
+            ]
+        )
+        assert result.is_complete
+
+
+def test_json_patch():
+    patch: list[ResultPatchOperation] = []
+    _json_patch(
+        {'a': 1, 'b': [1, 2, 3], 'c': True, 'd': {'e': 'x'}},
+        {'a': 2, 'b': [1], 'c': False, 'd': {'f': None}},
+        '',
+        patch,
+    )
+    assert patch == snapshot(
+        [
+            {'op': 'replace', 'path': '/a', 'value': 2},
+            {'op': 'remove', 'path': '/b/2'},
+            {'op': 'remove', 'path': '/b/1'},
+            {'op': 'replace', 'path': '/c', 'value': False},
+            {'op': 'remove', 'path': '/d/e'},
+            {'op': 'add', 'path': '/d/f', 'value': None},
+        ]
+    )
+
+
+async def test_iter_stream_output_patches():
+    m = TestModel(custom_result_text='The cat sat on the mat.')
+    agent = Agent(m)
+
+    patches: list[list[ResultPatchOperation]] = []
+    async with agent.iter('Hello') as run:
+        async for node in run:
+            if agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as stream:
+                    async for patch in stream.stream_output_patches(debounce_by=None):
+                        patches.append(patch)
+    assert patches == snapshot(
+        [
+            [{'op': 'replace', 'path': '', 'value': ''}],
+            [{'op': 'replace', 'path': '', 'value': 'The '}],
+            [{'op': 'replace', 'path': '', 'value': 'The cat '}],
+            [{'op': 'replace', 'path': '', 'value': 'The cat sat '}],
+            [{'op': 'replace', 'path': '', 'value': 'The cat sat on '}],
+            [{'op': 'replace', 'path': '', 'value': 'The cat sat on the '}],
+            [{'op': 'replace', 'path': '', 'value': 'The cat sat on the mat.'}],
+        ]
+    )
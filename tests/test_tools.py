@@ -1,3 +1,4 @@
+import asyncio
 import json
 from dataclasses import dataclass
 from typing import Annotated, Any, Callable, Literal, Union
@@ -9,7 +10,7 @@ from inline_snapshot import snapshot
 from pydantic import BaseModel, Field
 from pydantic_core import PydanticSerializationError
 
-from pydantic_ai import Agent, RunContext, Tool, UserError
+from pydantic_ai import Agent, ModelRetry, RunContext, Tool, UserError
 from pydantic_ai.messages import (
     ModelMessage,
     ModelRequest,
@@ -684,3 +685,35 @@ def test_call_tool_without_unrequired_parameters(set_event_loop: None):
         ]
     )
     assert tool_returns == snapshot([15, 17, 51, 68])
+
+
+@pytest.mark.anyio
+async def test_tool_retries_per_run():
+    async def call_tool(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) < 5:
+            return ModelResponse(parts=[ToolCallPart(tool_name='flaky_tool', args={})])
+        else:
+            return ModelResponse(parts=[TextPart('finished')])
+
+    agent = Agent(FunctionModel(call_tool), retries=1)
+    retries: list[int] = []
+    first_calls = 0
+    both_runs_called = asyncio.Event()
+
+    @agent.tool
+    async def flaky_tool(ctx: RunContext[None]) -> str:
+        nonlocal first_calls
+        retries.append(ctx.retry)
+        if ctx.retry == 0:
+            # fail in both runs at the same time
+            first_calls += 1
+            if first_calls == 2:
+                both_runs_called.set()
+            await both_runs_called.wait()
+            raise ModelRetry('try again')
+        return 'success'
+
+    # each run fails once, if retries were shared between runs the second failure would exceed the max retries
+    results = await asyncio.gather(agent.run('Hello'), agent.run('Hello'))
+    assert [r.data for r in results] == ['finished', 'finished']
+    assert retries == [0, 0, 1, 1]
@@ -40,6 +40,61 @@ async def test_group_by_temporal(interval: float | None, expected: list[list[int
         assert groups == expected
 
 
+async def test_group_by_temporal_error():
+    async def yield_then_fail() -> AsyncIterator[int]:
+        yield 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError('stream failed')
+
+    groups: list[list[int]] = []
+    with pytest.raises(RuntimeError, match='stream failed'):
+        async with group_by_temporal(yield_then_fail(), soft_max_interval=0.1) as groups_iter:
+            async for g in groups_iter:
+                groups.append(g)  # pragma: no cover
+    assert groups == []
+
+
+async def test_group_by_temporal_stop_early():
+    finished = False
+
+    async def yield_forever() -> AsyncIterator[int]:
+        nonlocal finished
+        i = 0
+        try:
+            while True:
+                yield i
+                i += 1
+                await asyncio.sleep(0.001)
+        finally:
+            finished = True
+
+    async with group_by_temporal(yield_forever(), soft_max_interval=0.01) as groups_iter:
+        async for g in groups_iter:
+            assert g[0] == 0
+            break
+    # the task reading items is cancelled when the context manager exits
+    assert finished
+
+
+async def test_group_by_temporal_backpressure():
+    produced = 0
+
+    async def yield_forever() -> AsyncIterator[int]:
+        nonlocal produced
+        while True:
+            produced += 1
+            yield produced
+            await asyncio.sleep(0)
+
+    async with group_by_temporal(yield_forever(), soft_max_interval=0.01) as groups_iter:
+        async for _ in groups_iter:
+            produced_before = produced
+            # a slow consumer holds back the iterable, rather than it being read into a buffer
+            await asyncio.sleep(0.05)
+            assert produced - produced_before <= 1
+            break
+
+
 def test_check_object_json_schema():
     object_schema = {'type': 'object', 'properties': {'a': {'type': 'string'}}}
     assert check_object_json_schema(object_schema) == object_schema